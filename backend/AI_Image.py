@@ -1,11 +1,31 @@
+import threading
+
 import torch
-from transformers import AutoImageProcessor, SiglipForImageClassification
+from transformers import AutoImageProcessor
 from PIL import Image
 
-# Load model and processor
+from siglip_backend import load_siglip
+
+# Model and processor are loaded lazily on first use
 model_name = "prithivMLmods/Mirage-Photo-Classifier"
-model = SiglipForImageClassification.from_pretrained(model_name)
-processor = AutoImageProcessor.from_pretrained(model_name)
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def _get_model():
+    """Load the classifier and its image processor once per process.
+
+    Locked so a request and the startup warm-up cannot both load the weights.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_siglip(model_name), AutoImageProcessor.from_pretrained(model_name)
+    return _model
+
 
 # Label mapping
 labels = {
@@ -13,25 +33,26 @@ labels = {
     "1": "Fake"
 }
 
+@torch.inference_mode()
 def classify_image(image_path):
     """
     Classifies a single image as Real or AI-generated (Fake)
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, or an already decoded RGB PIL image
     
     Returns:
         Dictionary with prediction scores
     """
     # Load and preprocess image
-    image = Image.open(image_path).convert("RGB")
+    model, processor = _get_model()
+    image = image_path if isinstance(image_path, Image.Image) else Image.open(image_path).convert("RGB")
     inputs = processor(images=image, return_tensors="pt")
     
     # Make prediction
-    with torch.no_grad():
-        outputs = model(**inputs)
-        logits = outputs.logits
-        probs = torch.nn.functional.softmax(logits, dim=1).squeeze().tolist()
+    outputs = model(**inputs)
+    logits = outputs.logits
+    probs = torch.nn.functional.softmax(logits, dim=1).squeeze().tolist()
     
     # Format results
     predictions = {labels[str(i)]: round(probs[i], 4) for i in range(len(probs))}
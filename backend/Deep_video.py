@@ -1,22 +1,44 @@
 import os
 import sys
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
+import shutil
+import subprocess
 import cv2
-# from moviepy import VideoFileClip
-from moviepy.editor import VideoFileClip
 
 from transformers import (
         AutoImageProcessor, 
-        SiglipForImageClassification,
         pipeline
     )
 import torch
-import librosa
+import soundfile as sf
 import numpy as np
-from PIL import Image
 import torch.nn.functional as F
 
+try:
+    from decord import VideoReader, cpu as decord_cpu
+except ImportError:
+    VideoReader = None
+
+try:
+    from imageio_ffmpeg import get_ffmpeg_exe
+except ImportError:
+    get_ffmpeg_exe = None
+
+from siglip_backend import load_siglip
+
+
+def _ffmpeg_executable():
+    """ffmpeg from PATH, else the binary bundled with imageio-ffmpeg, else None."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None and get_ffmpeg_exe is not None:
+        try:
+            ffmpeg = get_ffmpeg_exe()
+        except RuntimeError:
+            pass
+    return ffmpeg
+
 
 class CompleteDeepfakeDetector:
     """
@@ -28,7 +50,9 @@ class CompleteDeepfakeDetector:
         video_model_name="prithivMLmods/Deepfake-Detect-Siglip2",
         audio_model_name="MelodyMachine/Deepfake-audio-detection-V2",
         num_frames=20,
-        frame_interval=1.0  # Extract frames every N seconds
+        frame_interval=1.0,  # Extract frames every N seconds
+        batch_size=16,  # Frames per forward pass
+        fast_preprocess=None  # Tensor resize instead of the HF processor; None reads FAST_FRAME_PREPROCESS
     ):
         """
         Initialize the complete deepfake detector.
@@ -38,14 +62,21 @@ class CompleteDeepfakeDetector:
             audio_model_name (str): HuggingFace model for audio classification
             num_frames (int): Number of frames to extract from video
             frame_interval (float): Time interval (seconds) between frame extractions
+            batch_size (int): Max number of frames per model forward pass
+            fast_preprocess (bool): Resize/normalize frames with torch on the model
+                device instead of the HF image processor. Faster, but bicubic
+                resampling differs slightly from PIL's, so logits are not
+                bit-identical; off unless FAST_FRAME_PREPROCESS=1 (check with
+                `python Deep_video.py --check-preprocess`)
         """
         self.num_frames = num_frames
         self.frame_interval = frame_interval
+        self.batch_size = batch_size
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
         
 
     
-        self.video_model = SiglipForImageClassification.from_pretrained(video_model_name)
+        self.video_model = load_siglip(video_model_name)
         self.video_processor = AutoImageProcessor.from_pretrained(video_model_name)
         
         if torch.cuda.is_available():
@@ -56,6 +87,24 @@ class CompleteDeepfakeDetector:
         # Get label mapping
         self.id2label = self.video_model.config.id2label
 
+        # Per-class lookups resolved once so the per-frame loop only does list/set indexing
+        self._label_arr = [self.id2label[i] for i in sorted(self.id2label)]
+        self._fake_ids = frozenset(i for i, label in self.id2label.items() if 'fake' in label.lower())
+        self._has_fake_col = 0 in self.id2label
+        self._has_real_col = 1 in self.id2label
+
+        # Preprocessing constants for resizing/normalizing frames directly on the device
+        if fast_preprocess is None:
+            fast_preprocess = os.getenv("FAST_FRAME_PREPROCESS", "0") in ("1", "true", "True")
+        size = self.video_processor.size
+        fixed_size = "height" in size and "width" in size
+        self._fast_preprocess = fast_preprocess and fixed_size
+        if fixed_size:
+            self._input_size = (size["height"], size["width"])
+            self._rescale_factor = self.video_processor.rescale_factor
+            self._pixel_mean = torch.tensor(self.video_processor.image_mean, device=self.device).view(1, 3, 1, 1)
+            self._pixel_std = torch.tensor(self.video_processor.image_std, device=self.device).view(1, 3, 1, 1)
+
         try:
             self.audio_classifier = pipeline(
                 "audio-classification",
@@ -76,9 +125,13 @@ class CompleteDeepfakeDetector:
             video_path (str): Path to video file
             
         Returns:
-            list: List of PIL Image frames
+            tuple: ((N, H, W, 3) uint8 RGB array, list of timestamps)
         """
- 
+        if VideoReader is not None:
+            try:
+                return self._extract_frames_decord(video_path)
+            except Exception:
+                print("decord failed to read video, falling back to OpenCV")
         
         try:
             video = cv2.VideoCapture(video_path)
@@ -95,26 +148,16 @@ class CompleteDeepfakeDetector:
             if frame_count == 0:
                 return None
             
-            # Extract frames uniformly across the video
-            indices = np.linspace(0, frame_count - 1, min(self.num_frames, frame_count)).astype(int)
+            indices = self._sample_indices(frame_count)
             
-            frames = []
-            timestamps = []
+            frames, timestamps = self._read_frames_sequential(video, indices, fps)
+            video.release()
             
-            for idx, i in enumerate(indices):
-                video.set(cv2.CAP_PROP_POS_FRAMES, i)
-                ret, frame = video.read()
-                
-                if ret:
-                    # Convert BGR to RGB
-                    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                    pil_frame = Image.fromarray(frame_rgb)
-                    
-                    frames.append(pil_frame)
-                    timestamp = i / fps if fps > 0 else idx
-                    timestamps.append(timestamp)
+            if not frames:
+                return None
             
-            video.release()
+            # Stack and convert BGR to RGB with a single channel reindex
+            frames = np.stack(frames)[..., ::-1]
             
             print(f"Extracted {len(frames)} frames successfully")
             return frames, timestamps
@@ -123,13 +166,127 @@ class CompleteDeepfakeDetector:
             import traceback
             traceback.print_exc()
             return None, None
+
+    def _sample_indices(self, frame_count):
+        """
+        Frame indices spread uniformly across the video, shared by the decord
+        and OpenCV paths.
+        
+        Args:
+            frame_count (int): Number of frames in the video
+            
+        Returns:
+            np.ndarray: Sorted, unique int64 frame indices (at most num_frames)
+        """
+        k = min(self.num_frames, frame_count)
+        return np.unique(np.linspace(0, frame_count - 1, k).astype(np.int64))
+    
+    @staticmethod
+    def _read_frames_sequential(video, indices, fps):
+        """
+        Decode sampled frames in one linear pass: grab() every frame up to the
+        last target and retrieve() only the sampled ones, instead of seeking
+        (and re-decoding from the previous keyframe) once per sample.
+        
+        Args:
+            video (cv2.VideoCapture): Opened capture positioned at frame 0
+            indices (np.ndarray): Sorted frame indices to keep
+            fps (float): Frames per second, used for timestamps
+            
+        Returns:
+            tuple: (list of BGR frames, list of timestamps)
+        """
+        targets = set(int(i) for i in indices)
+        frames = []
+        timestamps = []
+        
+        for i in range(int(indices[-1]) + 1):
+            if not video.grab():
+                # CAP_PROP_FRAME_COUNT is only an estimate for some containers
+                break
+            if i in targets:
+                ret, frame = video.retrieve()
+                if ret:
+                    frames.append(frame)
+                    timestamps.append(i / fps if fps > 0 else len(timestamps))
+        
+        return frames, timestamps
     
+    def _extract_frames_decord(self, video_path):
+        """
+        Extract uniformly sampled frames with a single decord batch read.
+        
+        Args:
+            video_path (str): Path to video file
+            
+        Returns:
+            tuple: ((N, H, W, 3) uint8 RGB array, list of timestamps)
+        """
+        vr = VideoReader(video_path, ctx=decord_cpu(0))
+        fps = vr.get_avg_fps()
+        frame_count = len(vr)
+        duration = frame_count / fps if fps > 0 else 0
+        
+        print(f"Video Info: {frame_count} frames, {fps:.2f} FPS, {duration:.2f}s duration")
+        
+        if frame_count == 0:
+            return None
+        
+        indices = self._sample_indices(frame_count)
+        
+        # decord decodes straight to RGB, no colour conversion needed
+        frames = vr.get_batch(indices).asnumpy()
+        timestamps = (indices / fps).tolist() if fps > 0 else list(range(len(indices)))
+        
+        print(f"Extracted {len(frames)} frames successfully")
+        return frames, timestamps
+    
+    def _preprocess_frames(self, frames):
+        """
+        Resize and normalize a batch of uint8 RGB frames on the model device,
+        bypassing the PIL-based image processor.
+        
+        Args:
+            frames (np.ndarray): (N, H, W, 3) uint8 RGB frames
+            
+        Returns:
+            torch.Tensor: (N, 3, H', W') normalized pixel values
+        """
+        x = torch.from_numpy(np.ascontiguousarray(frames))
+        if self.device == 'cuda':
+            # Page-locked staging lets the host-to-device copy run asynchronously over DMA
+            x = x.pin_memory().to(self.device, non_blocking=True)
+        x = x.permute(0, 3, 1, 2).float()
+        x = F.interpolate(x, size=self._input_size, mode='bicubic', align_corners=False, antialias=True)
+        x = x.clamp_(0, 255) * self._rescale_factor
+        return (x - self._pixel_mean) / self._pixel_std
+    
+    @torch.inference_mode()
+    def preprocess_parity(self, frames):
+        """
+        Compare the tensor preprocessing path against the HF image processor.
+        
+        Args:
+            frames (np.ndarray): (N, H, W, 3) uint8 RGB frames
+            
+        Returns:
+            dict: Max absolute logit and probability differences between the two paths
+        """
+        fast = self.video_model(pixel_values=self._preprocess_frames(frames)).logits.float()
+        reference_inputs = self.video_processor(images=list(frames), return_tensors="pt")
+        reference = self.video_model(**{k: v.to(self.device) for k, v in reference_inputs.items()}).logits.float()
+        return {
+            "max_logit_diff": (fast - reference).abs().max().item(),
+            "max_prob_diff": (F.softmax(fast, dim=1) - F.softmax(reference, dim=1)).abs().max().item(),
+        }
+    
+    @torch.inference_mode()
     def detect_visual_deepfake(self, frames, timestamps):
         """
         Detect visual deepfakes using Siglip2 model on individual frames.
         
         Args:
-            frames (list): List of PIL Image frames
+            frames (np.ndarray): (N, H, W, 3) uint8 RGB frames (a list of PIL Images is also accepted)
             timestamps (list): Timestamps of each frame
             
         Returns:
@@ -137,48 +294,50 @@ class CompleteDeepfakeDetector:
         """
         
         try:
-            frame_results = []
-            fake_count = 0
-            real_count = 0
-            
-            # Process each frame individually
-            for idx, (frame, timestamp) in enumerate(zip(frames, timestamps)):
-                inputs = self.video_processor(images=frame, return_tensors="pt")
-                if torch.cuda.is_available():
-                    inputs = {k: v.to('cuda') for k, v in inputs.items()}
-
-                with torch.no_grad():
+            # Run frames through the model in batches to bound memory usage
+            batch_probs = []
+            for start in range(0, len(frames), self.batch_size):
+                batch = frames[start:start + self.batch_size]
+                if self._fast_preprocess and isinstance(batch, np.ndarray):
+                    inputs = {"pixel_values": self._preprocess_frames(batch)}
+                else:
+                    inputs = self.video_processor(images=batch, return_tensors="pt")
+                    if self.device == 'cuda':
+                        inputs = {k: v.pin_memory().to(self.device, non_blocking=True) for k, v in inputs.items()}
+                with torch.autocast(device_type=self.device, dtype=torch.float16, enabled=self.device == 'cuda'):
                     outputs = self.video_model(**inputs)
-                
-                logits = outputs.logits
-                probs = F.softmax(logits, dim=1).squeeze()
+                batch_probs.append(F.softmax(outputs.logits.float(), dim=1))
 
-                predicted_class = torch.argmax(probs).item()
-                predicted_label = self.id2label[predicted_class]
-                confidence = probs[predicted_class].item()
-                
-                frame_result = {
-                    'frame_number': idx + 1,
-                    'timestamp': f"{timestamp:.2f}s",
-                    'prediction': predicted_label,
-                    'confidence': confidence,
-                    'fake_score': probs[0].item() if 0 in self.id2label else 0,
-                    'real_score': probs[1].item() if 1 in self.id2label else 0
-                }
-                
-                frame_results.append(frame_result)
+            probs = torch.cat(batch_probs).cpu().numpy()
+            total_frames = len(probs)
 
-                if 'fake' in predicted_label.lower():
-                    fake_count += 1
-                else:
-                    real_count += 1
+            # All frame-level statistics in one pass over the (N, C) probability matrix
+            preds = probs.argmax(axis=1)
+            confidences = probs[np.arange(total_frames), preds]
+            fake_scores = probs[:, 0] if self._has_fake_col else np.zeros(total_frames, dtype=probs.dtype)
+            real_scores = probs[:, 1] if self._has_real_col else np.zeros(total_frames, dtype=probs.dtype)
 
-            total_frames = len(frames)
+            fake_count = int(np.isin(preds, list(self._fake_ids)).sum())
+            real_count = total_frames - fake_count
             fake_percentage = (fake_count / total_frames) * 100
             real_percentage = (real_count / total_frames) * 100
+            avg_fake_score = float(fake_scores.mean())
+            avg_real_score = float(real_scores.mean())
 
-            avg_fake_score = np.mean([r['fake_score'] for r in frame_results])
-            avg_real_score = np.mean([r['real_score'] for r in frame_results])
+            frame_results = [
+                {
+                    'frame_number': idx,
+                    'timestamp': f"{timestamp:.2f}s",
+                    'prediction': self._label_arr[predicted_class],
+                    'confidence': confidence,
+                    'fake_score': fake_score,
+                    'real_score': real_score
+                }
+                for idx, (timestamp, predicted_class, confidence, fake_score, real_score) in enumerate(
+                    zip(timestamps, preds.tolist(), confidences.tolist(), fake_scores.tolist(), real_scores.tolist()),
+                    start=1
+                )
+            ]
             
             overall_prediction = "FAKE" if fake_count > real_count else "REAL"
             overall_confidence = max(avg_fake_score, avg_real_score)
@@ -203,61 +362,75 @@ class CompleteDeepfakeDetector:
             traceback.print_exc()
             return None
     
-    def extract_audio(self, video_path, output_path="temp_audio.wav"):
+    def extract_audio(self, video_path, sample_rate=16000):
         """
-        Extract audio from video file.
+        Extract the audio track as mono PCM by piping it out of ffmpeg,
+        without writing an intermediate WAV file.
         
         Args:
             video_path (str): Path to video file
-            output_path (str): Path to save extracted audio
+            sample_rate (int): Target sample rate in Hz
             
         Returns:
-            str: Path to extracted audio file
+            np.ndarray: float32 samples in [-1, 1], or None if there is no audio track
         """
         
+        ffmpeg = _ffmpeg_executable()
+        if ffmpeg is None:
+            print("Warning: ffmpeg not found (install it or `pip install imageio-ffmpeg`); "
+                  "skipping audio deepfake detection")
+            return None
+        
         try:
-            video = VideoFileClip(video_path)
-            
-            if video.audio is None:
-                video.close()
-                return None
-            
-            audio = video.audio
-            audio.write_audiofile(
-                output_path,
-                codec='pcm_s16le',
-                fps=16000,
-                nbytes=2,
-                buffersize=2000,
-                logger=None
+            proc = subprocess.run(
+                [
+                    ffmpeg, "-nostdin", "-loglevel", "error",
+                    "-i", video_path,
+                    "-vn", "-ac", "1", "-ar", str(sample_rate),
+                    "-f", "s16le", "-",
+                ],
+                capture_output=True,
+                check=True,
             )
-            
-            video.close()
-            audio.close()
-            return output_path
-            
-        except Exception as e:
+        except subprocess.CalledProcessError as e:
+            stderr = e.stderr.decode("utf-8", errors="replace").strip()
+            # A video without an audio track leaves ffmpeg with no output stream
+            if "does not contain any stream" not in stderr:
+                print(f"Warning: ffmpeg audio extraction failed: {stderr or e}")
+            return None
+        except OSError as e:
+            print(f"Warning: could not run ffmpeg for audio extraction: {e}")
+            return None
+        
+        if not proc.stdout:
             return None
+        
+        return np.frombuffer(proc.stdout, dtype=np.int16).astype(np.float32) / 32768.0
     
-    def detect_audio_deepfake(self, audio_path):
+    @torch.inference_mode()
+    def detect_audio_deepfake(self, audio, sr=16000):
         """
         Detect audio deepfakes using Wav2Vec2 model.
         
         Args:
-            audio_path (str): Path to audio file
+            audio (np.ndarray or str): Mono float32 samples (as returned by
+                extract_audio) or a path to an audio file
+            sr (int): Sample rate of the samples when an array is given
             
         Returns:
             list: Detection results with labels and scores
         """
         
         try:
-            # Load audio at 16kHz
-            audio_array, sr = librosa.load(audio_path, sr=16000)
-            
-            duration = len(audio_array) / sr
+            if isinstance(audio, str):
+                audio_array, sr = sf.read(audio, dtype='float32')
+                if audio_array.ndim > 1:
+                    audio_array = audio_array.mean(axis=1)
+            else:
+                audio_array = audio
             
-            # Run classification
-            results = self.audio_classifier(audio_array)
+            # Run classification (the pipeline resamples if sr differs from the model's rate)
+            results = self.audio_classifier({"raw": audio_array, "sampling_rate": sr})
             return results
             
         except Exception as e:
@@ -269,7 +442,8 @@ class CompleteDeepfakeDetector:
         
         Args:
             video_path (str): Path to video file
-            cleanup (bool): Whether to delete temporary files
+            cleanup (bool): Unused; audio is decoded in memory so no temporary
+                files are written. Kept for backwards compatibility.
             
         Returns:
             dict: Complete analysis results
@@ -286,22 +460,22 @@ class CompleteDeepfakeDetector:
         }
 
         
-        frames_data = self.extract_frames(video_path)
-        if frames_data and frames_data[0] is not None:
-            frames, timestamps = frames_data
-            visual_results = self.detect_visual_deepfake(frames, timestamps)
-            results['visual_detection'] = visual_results
+        # Demux the audio track in ffmpeg while frames are decoded and scored,
+        # rather than opening and decoding the container back to back
+        with ThreadPoolExecutor(max_workers=1) as audio_pool:
+            audio_future = audio_pool.submit(self.extract_audio, video_path)
+            
+            frames_data = self.extract_frames(video_path)
+            if frames_data and frames_data[0] is not None:
+                frames, timestamps = frames_data
+                visual_results = self.detect_visual_deepfake(frames, timestamps)
+                results['visual_detection'] = visual_results
 
-        temp_audio = "temp_extracted_audio.wav"
-        audio_path = self.extract_audio(video_path, temp_audio)
+            audio_array = audio_future.result()
         
-        if audio_path:
-            audio_results = self.detect_audio_deepfake(audio_path)
+        if audio_array is not None:
+            audio_results = self.detect_audio_deepfake(audio_array)
             results['audio_detection'] = audio_results
-            
-            # Cleanup
-            if cleanup and os.path.exists(temp_audio):
-                os.remove(temp_audio)
 
         
         # Generate Overall Verdict
@@ -401,6 +575,15 @@ def main():
         num_frames=20  # Extract 20 frames across the video
     )
     
+    if "--check-preprocess" in sys.argv:
+        # Logit parity of the fast tensor preprocessing against the HF processor
+        for name in sorted(os.listdir("Test_data")):
+            if name.lower().endswith((".mp4", ".mov", ".avi", ".mkv")):
+                frames_data = detector.extract_frames(os.path.join("Test_data", name))
+                if frames_data and frames_data[0] is not None:
+                    print(name, detector.preprocess_parity(frames_data[0]))
+        return
+    
     results = detector.analyze_video("Test_data/IMG_4707.MP4", cleanup=True)
     
     if results is None or results['overall_verdict'] is None:
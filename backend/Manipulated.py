@@ -1,10 +1,30 @@
+import threading
+
 import torch
-from transformers import AutoImageProcessor, SiglipForImageClassification
+from transformers import AutoImageProcessor
 from PIL import Image
 
+from siglip_backend import load_siglip
+
 model_name = "prithivMLmods/Deepfake-Detect-Siglip2"
-model = SiglipForImageClassification.from_pretrained(model_name)
-processor = AutoImageProcessor.from_pretrained(model_name)
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def _get_model():
+    """Load the classifier and its image processor once per process.
+
+    Locked so a request and the startup warm-up cannot both load the weights.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = load_siglip(model_name), AutoImageProcessor.from_pretrained(model_name)
+    return _model
+
 
 # Label mapping
 labels = {
@@ -12,24 +32,25 @@ labels = {
     "1": "Real"
 }
 
+@torch.inference_mode()
 def detect_deepfake(image_path):
     """
     Detects if an image is manipulated (deepfake) or authentic (real)
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, or an already decoded RGB PIL image
     
     Returns:
         Dictionary with detection results
     """
 
-    image = Image.open(image_path).convert("RGB")
+    model, processor = _get_model()
+    image = image_path if isinstance(image_path, Image.Image) else Image.open(image_path).convert("RGB")
     inputs = processor(images=image, return_tensors="pt")
     
-    with torch.no_grad():
-        outputs = model(**inputs)
-        logits = outputs.logits
-        probs = torch.nn.functional.softmax(logits, dim=1).squeeze().tolist()
+    outputs = model(**inputs)
+    logits = outputs.logits
+    probs = torch.nn.functional.softmax(logits, dim=1).squeeze().tolist()
     
     # Get predictions
     fake_score = probs[0]
@@ -1,38 +1,66 @@
+import threading
+
 from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
 
 MODEL_NAME = "himel7/bias-detector"
-print(f"Loading model: {MODEL_NAME}...")
-tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
 
-classifier = pipeline(
-    "text-classification",
-    model=model,
-    tokenizer=tokenizer,
-    framework="pt"  
-)
+
+_bias_pipeline = None
+_bias_pipeline_lock = threading.Lock()
+
+
+def _get_bias_pipeline():
+    """Load the bias classifier once per process, on first use.
+
+    Locked so a request and the startup warm-up cannot both load the weights.
+    """
+    global _bias_pipeline
+    if _bias_pipeline is None:
+        with _bias_pipeline_lock:
+            if _bias_pipeline is None:
+                print(f"Loading model: {MODEL_NAME}...")
+                tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+                model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+
+                _bias_pipeline = pipeline(
+                    "text-classification",
+                    model=model,
+                    tokenizer=tokenizer,
+                    framework="pt"  
+                )
+    return _bias_pipeline
+
 
 LABEL_MAPPING = {
     "LABEL_0": "Neutral",
     "LABEL_1": "Biased"
 }
 
-def predict_bias(article_text: str, threshold: float = 0.7):
-    """
-    Predicts if an article is Biased or Neutral.
-    Confidence below threshold for Biased is treated as Neutral.
-    """
-    result = classifier(article_text)[0]
-    raw_label = result['label']
+def _apply_threshold(result, threshold):
+    label = LABEL_MAPPING.get(result['label'], result['label'])
     score = result['score']
 
-    label = LABEL_MAPPING.get(raw_label, raw_label)
-
     if label == "Biased" and score < threshold:
         label = "Neutral"
-    
+
     return label, score
 
 
+def predict_bias(article_text: str, threshold: float = 0.7):
+    """
+    Predicts if an article is Biased or Neutral.
+    Confidence below threshold for Biased is treated as Neutral.
+    """
+    return predict_bias_batch([article_text], threshold=threshold)[0]
 
 
+def predict_bias_batch(articles: list[str], threshold: float = 0.7, batch_size: int = 16):
+    """
+    Predicts bias for several articles with batched forward passes.
+    Inputs longer than the model's max length are truncated.
+
+    Returns:
+        list of (label, score) tuples in the same order as articles
+    """
+    results = _get_bias_pipeline()(articles, batch_size=batch_size, truncation=True)
+    return [_apply_threshold(result, threshold) for result in results]
@@ -1,26 +1,98 @@
+import hashlib
 import json
 import time
 import os
-from typing import Dict, List, Tuple, Optional
+import queue
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cache
+from typing import Callable, Dict, Iterator, List, Tuple, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Import fact-checking components
 from factcheck import FactCheck
-from factcheck.utils.multimodal import modal_normalization
 from factcheck.utils.api_config import load_api_config
+from factcheck.utils.utils import load_yaml
 
 # Load environment variables
 load_dotenv()
 
+API_CONFIG_PATH = "factcheck/config/api_config.yaml"
+
+# Media normalization results by (modal, sha256 of the file), so re-submitted
+# files skip the Gemini upload and transcription
+_NORMALIZED_CACHE = OrderedDict()
+_NORMALIZED_CACHE_LOCK = threading.Lock()
+NORMALIZED_CACHE_MAX_ENTRIES = 256
+
+
+@dataclass(frozen=True)
+class ApiKeyBundle:
+    """API keys resolved from the environment (or the YAML fallback)."""
+    api_config: Dict[str, Optional[str]]
+    gemini_keys: Tuple[str, ...]
+
+
+def _load_api_keys() -> dict:
+    """Load API keys from env or config file."""
+    api_config = {
+        "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY"),
+        "GEMINI_API_KEY_2": os.getenv("GEMINI_API_KEY_2"),
+        "GEMINI_API_KEY_3": os.getenv("GEMINI_API_KEY_3"),
+        "GEMINI_API_KEY_4": os.getenv("GEMINI_API_KEY_4"),
+        "GEMINI_API_KEY_5": os.getenv("GEMINI_API_KEY_5"),
+        "GEMINI_API_KEY_MEDIA": os.getenv("GEMINI_API_KEY_MEDIA"),
+        "SERPER_API_KEY": os.getenv("SERPER_API_KEY"),
+    }
+
+    if not api_config.get("GEMINI_API_KEY"):
+        try:
+            api_config = load_api_config(load_yaml(API_CONFIG_PATH) or {})
+        except FileNotFoundError:
+            pass
+
+    if not api_config.get("GEMINI_API_KEY"):
+        raise ValueError("GEMINI_API_KEY not found! Set in .env or api_config.yaml")
+    return api_config
+
+
+def _extract_gemini_keys(api_config: dict) -> Tuple[str, ...]:
+    keys = []
+    if api_config.get("GEMINI_API_KEY"):
+        keys.append(api_config["GEMINI_API_KEY"])
+    for i in range(2, 10):
+        key_name = f"GEMINI_API_KEY_{i}"
+        if api_config.get(key_name):
+            keys.append(api_config[key_name])
+    return tuple(keys)
+
+
+@cache
+def _api_key_bundle() -> ApiKeyBundle:
+    """Resolve the API keys once per process; every FactCheckApp reuses them."""
+    api_config = _load_api_keys()
+    return ApiKeyBundle(api_config=api_config, gemini_keys=_extract_gemini_keys(api_config))
+
+
+def _file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """sha256 of a file, read in 1 MB chunks so large videos are never loaded whole."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class FactCheckApp:
     """Fact-checking application (headless version, no Gradio)."""
 
     def __init__(self, enable_multi_key: bool = True):
-        # Load API keys
-        self.api_config = self._load_api_keys()
-        self.gemini_keys = self._extract_gemini_keys()
+        # Load API keys (copied, since FactCheck and callers may mutate them)
+        bundle = _api_key_bundle()
+        self.api_config = dict(bundle.api_config)
+        self.gemini_keys = list(bundle.gemini_keys)
         self.multi_key_mode = enable_multi_key and len(self.gemini_keys) > 1
 
         # Initialize FactCheck
@@ -39,38 +111,6 @@ class FactCheckApp:
                 llm_client_factory=self._create_gemini_client
             )
 
-    def _load_api_keys(self) -> dict:
-        """Load API keys from env or config file."""
-        api_config = {
-            "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY"),
-            "GEMINI_API_KEY_2": os.getenv("GEMINI_API_KEY_2"),
-            "GEMINI_API_KEY_3": os.getenv("GEMINI_API_KEY_3"),
-            "GEMINI_API_KEY_4": os.getenv("GEMINI_API_KEY_4"),
-            "GEMINI_API_KEY_5": os.getenv("GEMINI_API_KEY_5"),
-            "GEMINI_API_KEY_MEDIA": os.getenv("GEMINI_API_KEY_MEDIA"),
-            "SERPER_API_KEY": os.getenv("SERPER_API_KEY"),
-        }
-
-        if not api_config.get("GEMINI_API_KEY"):
-            try:
-                api_config = load_api_config("factcheck/config/api_config.yaml")
-            except:
-                pass
-
-        if not api_config.get("GEMINI_API_KEY"):
-            raise ValueError("GEMINI_API_KEY not found! Set in .env or api_config.yaml")
-        return api_config
-
-    def _extract_gemini_keys(self) -> List[str]:
-        keys = []
-        if self.api_config.get("GEMINI_API_KEY"):
-            keys.append(self.api_config["GEMINI_API_KEY"])
-        for i in range(2, 10):
-            key_name = f"GEMINI_API_KEY_{i}"
-            if self.api_config.get(key_name):
-                keys.append(self.api_config[key_name])
-        return keys
-
     def _create_gemini_client(self, api_key: str):
         from factcheck.utils.llmclient.gemini import GeminiClient
         return GeminiClient(
@@ -86,9 +126,17 @@ class FactCheckApp:
         audio_file: Optional[str] = None,
         image_file: Optional[str] = None,
         video_file: Optional[str] = None,
-        model: str = "gemini-2.5-flash"
+        model: str = "gemini-2.5-flash",
+        force_refresh: bool = False,
+        on_event: Optional[Callable[[str, dict], None]] = None,
     ) -> Dict:
-        """Process input and return fact-check results."""
+        """Process input and return fact-check results.
+
+        Media transcriptions and fact-check results are memoized by content, so
+        a repeated submission returns without any Gemini or Serper calls unless
+        force_refresh is set. on_event receives the pipeline stages (see
+        FactCheck.check_text), preceded by "normalized" for media inputs.
+        """
         try:
 
             # Determine input type
@@ -115,15 +163,30 @@ class FactCheckApp:
 
 
             if modal in ["speech", "image", "video"]:
+                # Imported here so text-only use never loads the Gemini SDK for media
+                from factcheck.utils.multimodal import modal_normalization
                 print(f"🎥 Converting {modal} to text...")
-                api_key = self.api_config.get("GEMINI_API_KEY_MEDIA")
-                if not api_key:
-                    raise ValueError("Missing GEMINI_API_KEY_MEDIA for media processing.")
-                content_media = modal_normalization(
-                    modal=modal, input_data=input_path, gemini_key=api_key
-                )
+                cache_key = (modal, _file_digest(input_path))
+                with _NORMALIZED_CACHE_LOCK:
+                    content_media = None if force_refresh else _NORMALIZED_CACHE.get(cache_key)
+                    if content_media is not None:
+                        _NORMALIZED_CACHE.move_to_end(cache_key)
+                if content_media is None:
+                    # Without a dedicated media key, share the main one
+                    api_key = self.api_config.get("GEMINI_API_KEY_MEDIA") or self.api_config.get("GEMINI_API_KEY")
+                    if not api_key:
+                        raise ValueError("Missing GEMINI_API_KEY_MEDIA for media processing.")
+                    content_media = modal_normalization(
+                        modal=modal, input_data=input_path, gemini_key=api_key
+                    )
+                    with _NORMALIZED_CACHE_LOCK:
+                        _NORMALIZED_CACHE[cache_key] = content_media
+                        while len(_NORMALIZED_CACHE) > NORMALIZED_CACHE_MAX_ENTRIES:
+                            _NORMALIZED_CACHE.popitem(last=False)
                 if"No Text" in content_media:
                     content_media=""
+                if on_event is not None:
+                    on_event("normalized", {"modal": modal, "text": content_media})
             else:
                 content_media = ""
 
@@ -131,7 +194,9 @@ class FactCheckApp:
             start_time = time.time()
             if((content+content_media)==""or (content+content_media)==" "):
                 return {}
-            results = self.factcheck.check_text(content + content_media)
+            results = self.factcheck.check_text(
+                content + content_media, refresh=force_refresh, on_event=on_event
+            )
             elapsed = time.time() - start_time
 
             return results
@@ -142,3 +207,39 @@ class FactCheckApp:
             print(traceback.format_exc())
             return {"error": str(e)}
 
+    def process_input_stream(self, **kwargs) -> Iterator[Dict]:
+        """Run process_input in a worker thread, yielding its stages as they happen.
+
+        Yields {"stage": ..., **data} dicts and finally {"stage": "done", "results": ...},
+        so a UI can render claims and progress long before the pipeline finishes.
+        """
+        events = queue.Queue()
+        done = object()
+
+        def run():
+            try:
+                results = self.process_input(**kwargs, on_event=lambda stage, data: events.put({"stage": stage, **data}))
+                events.put({"stage": "done", "results": results})
+            finally:
+                events.put(done)
+
+        threading.Thread(target=run, name="factcheck-stream", daemon=True).start()
+        for event in iter(events.get, done):
+            yield event
+
+
+_shared_app: Optional[FactCheckApp] = None
+_shared_app_lock = threading.Lock()
+
+
+def shared_app() -> FactCheckApp:
+    """One FactCheckApp per process, so its clients and result cache outlive a request.
+
+    Locked so the startup warm-up and a first request cannot both build one.
+    """
+    global _shared_app
+    if _shared_app is None:
+        with _shared_app_lock:
+            if _shared_app is None:
+                _shared_app = FactCheckApp()
+    return _shared_app
@@ -1,23 +1,45 @@
-import concurrent.futures
+import asyncio
+import copy
+import functools
+import hashlib
+import importlib
+import threading
 import time
-from typing import Dict, List, Optional, Union
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+from dataclasses import replace
 
-from factcheck.utils.llmclient import CLIENTS, model2client
 from factcheck.utils.prompt import prompt_mapper
 from factcheck.utils.logger import CustomLogger
 from factcheck.utils.api_config import load_api_config
+from factcheck.utils.utils import loads_json
 from factcheck.utils.data_class import PipelineUsage, FactCheckOutput, ClaimDetail, FCSummary
-from factcheck.core import (
-    Decompose,
-    Checkworthy,
-    QueryGenerator,
-    retriever_mapper,
-    ClaimVerify,
-)
 
 logger = CustomLogger(__name__).getlog()
 
+# The pipeline steps and LLM clients pull in google-generativeai, nltk, bs4, httpx, ...
+# They are imported when FactCheck is constructed (or on attribute access below),
+# not when the package is imported.
+_LAZY = {
+    "Decompose": "factcheck.core:Decompose",
+    "Checkworthy": "factcheck.core:Checkworthy",
+    "QueryGenerator": "factcheck.core:QueryGenerator",
+    "retriever_mapper": "factcheck.core:retriever_mapper",
+    "ClaimVerify": "factcheck.core:ClaimVerify",
+    "SemanticClaimCache": "factcheck.core:SemanticClaimCache",
+    "VerdictCache": "factcheck.core:VerdictCache",
+    "CLIENTS": "factcheck.utils.llmclient:CLIENTS",
+    "model2client": "factcheck.utils.llmclient:model2client",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name].split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
 
 class FactCheck:
     """
@@ -47,6 +69,23 @@ class FactCheck:
         
         # NEW: Performance tuning
         max_parallel_verifications: int = None,  # Auto-adjust based on num keys
+        max_requests_per_minute: int = 10,  # Per key; Gemini 2.5 Flash free tier
+        use_batch_api: bool = False,
+        cache_ttl: float = 3600,
+        cache_max_entries: int = 256,
+        use_semantic_cache: bool = False,
+        semantic_cache_threshold: float = 0.92,
+        fused: bool = True,
+        cluster_retrieval: bool = False,
+        cluster_threshold: float = 0.9,
+        claims_per_request: int = 1,
+        pipelined: bool = False,
+        verdict_cache_path: Optional[str] = None,
+        prefilter_threshold: Optional[float] = None,
+        sentence_splitter: str = "nltk",
+        response_cache_ttl: float = 0,
+        context_cache_ttl: float = 0,
+        result_cache_size: int = 0,
     ):
         """
         Initialize the FactCheck pipeline.
@@ -72,9 +111,64 @@ class FactCheck:
             
             max_parallel_verifications: Number of parallel verification threads.
                                        Auto-set based on number of API keys if None.
+            max_requests_per_minute: Per-key request quota (default 10, the Gemini
+                                     2.5 Flash free tier), shared by the clients'
+                                     own limiter and the multi-key executor
+            use_batch_api: Verify all claims in one Gemini Batch API job (cheaper,
+                           but high latency; requires google-genai)
+            cache_ttl: Seconds a check_text result is reused for identical input
+                       (0 disables the cache)
+            cache_max_entries: Max number of cached check_text results
+            use_semantic_cache: Reuse evidences and verdicts of previously verified
+                                claims whose embeddings are similar enough
+            semantic_cache_threshold: Cosine similarity needed for a claim cache hit
+            fused: Run Steps 1-3 as one multi-task LLM call per document, falling
+                   back to the separate steps if its output cannot be parsed
+            cluster_retrieval: Embed checkworthy claims and retrieve evidence once per
+                               cluster of near-duplicate claims, sharing it with
+                               every member
+            cluster_threshold: Cosine similarity needed to join a claim cluster
+            claims_per_request: Claims verified together in one LLM request (Step 5)
+            pipelined: Retrieve evidence per claim and start verifying each claim as
+                       soon as its evidence arrives, overlapping Steps 4 and 5 (Serper
+                       requests and verification groups then span one claim each;
+                       ignored with cluster_retrieval)
+            verdict_cache_path: SQLite file persisting per-(claim, evidence) verdicts
+                                across runs (disabled if None)
+            prefilter_threshold: Mark evidences sharing fewer than this fraction of a
+                                 claim's salient terms IRRELEVANT without an LLM call
+                                 (disabled if None)
+            sentence_splitter: Sentence splitter for the decomposition fallback,
+                               "nltk" or "pysbd" (requires pysbd)
+            response_cache_ttl: Seconds an LLM response is reused for an identical
+                                request (same model, prompt and seed); 0 disables it
+            context_cache_ttl: Seconds Gemini keeps an explicit context cache of each
+                               prompt template's static instructions and examples, so
+                               requests only send the dynamic part; 0 disables it
+            result_cache_size: Multi-key mode: verified claims (with their evidences)
+                               remembered in memory, so a claim recurring across
+                               documents is not sent or rate limited again; 0 disables it
         """
+        from factcheck.utils.llmclient import CLIENTS, model2client
+        from factcheck.core import (
+            Decompose,
+            Checkworthy,
+            QueryGenerator,
+            retriever_mapper,
+            ClaimVerify,
+            SemanticClaimCache,
+        )
+        
         # Load prompt templates
         self.prompt = prompt_mapper(prompt_name=prompt)
+        self.prompt_name = prompt
+        self.default_model = default_model
+        
+        # Exact-input result cache: sha256 key -> (timestamp, result dict)
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         
         # Load API configurations
         self.load_config(api_config=api_config)
@@ -100,6 +194,7 @@ class FactCheck:
             "claim_verify_model": claim_verify_model,
         }
         
+        step_clients = {}
         for key, model_name in step_models.items():
             # Use default model if step-specific model not provided
             model_name = default_model if model_name is None else model_name
@@ -112,13 +207,26 @@ class FactCheck:
             else:
                 logger.info("Auto-detecting LLM client based on model name")
                 LLMClient = model2client(model_name)
-            
-            # Initialize the client for this step
-            setattr(
-                self, 
-                key, 
-                LLMClient(model=model_name, api_config=self.api_config)
+            step_clients[key] = (LLMClient, model_name)
+        
+        # Every client and the multi-key executor limit requests at the same per-key RPM,
+        # so executor-dispatched calls are not throttled again at a lower client default
+        client_kwargs = {"max_requests_per_minute": max_requests_per_minute}
+        # Only passed when enabled, so clients without a response cache still work
+        if response_cache_ttl:
+            client_kwargs["response_cache_ttl"] = response_cache_ttl
+        if context_cache_ttl and hasattr(self.prompt, "static_prefixes"):
+            client_kwargs["context_cache_ttl"] = context_cache_ttl
+            client_kwargs["cached_prefixes"] = self.prompt.static_prefixes()
+        
+        # Construct the step clients concurrently; each one sets up its own SDK model
+        with ThreadPoolExecutor(max_workers=len(step_clients)) as pool:
+            built = pool.map(
+                lambda spec: spec[0](model=spec[1], api_config=self.api_config, **client_kwargs),
+                step_clients.values(),
             )
+            for key, llm_client in zip(step_clients, built):
+                setattr(self, key, llm_client)
         
         # Create 3 separate clients for Steps 2-3 parallelism
         gemini_key_1 = api_config.get("GEMINI_API_KEY")
@@ -129,6 +237,7 @@ class FactCheck:
         decompose_client = LLMClient(
             
             api_config={"GEMINI_API_KEY": gemini_key_1},
+            **client_kwargs,
             
         )
         
@@ -136,6 +245,7 @@ class FactCheck:
         checkworthy_client = LLMClient(
         
             api_config={"GEMINI_API_KEY": gemini_key_2},
+            **client_kwargs,
            
         )
         
@@ -143,13 +253,15 @@ class FactCheck:
         query_gen_client = LLMClient(
             
             api_config={"GEMINI_API_KEY": gemini_key_3},
+            **client_kwargs,
      
         )
         
         # Initialize components with separate clients
         self.decomposer = Decompose(
             llm_client=decompose_client,
-            prompt=self.prompt
+            prompt=self.prompt,
+            sentence_splitter=sentence_splitter,
         )
         
         self.checkworthy = Checkworthy(
@@ -170,9 +282,14 @@ class FactCheck:
         if api_keys and len(api_keys) > 1:
             logger.info("Initializing ClaimVerify with multi-key support...")
             
-            # Create client factory for multi-key mode
+            # Create client factory for multi-key mode. Cached per key, so a key listed
+            # twice, or the key the claim_verify_model client already uses, is not rebuilt.
+            @functools.lru_cache(maxsize=None)
             def client_factory(api_key: str):
                 """Create a new LLM client with specific API key."""
+                if api_key == self.api_config.get("GEMINI_API_KEY"):
+                    return self.claim_verify_model
+                
                 temp_config = self.api_config.copy()
                 temp_config['GEMINI_API_KEY'] = api_key
                 
@@ -182,15 +299,20 @@ class FactCheck:
                 else:
                     LLMClient = model2client(model_name)
                 
-                return LLMClient(model=model_name, api_config=temp_config)
+                return LLMClient(model=model_name, api_config=temp_config, **client_kwargs)
             
             self.claimverify = ClaimVerify(
                 llm_client=client_factory,
                 prompt=self.prompt,
                 api_keys=api_keys,
                 max_parallel_verifications=max_parallel_verifications,
-                max_requests_per_minute=10,  # Gemini 2.5 Flash free tier
+                max_requests_per_minute=max_requests_per_minute,
                 max_requests_per_day=250,    # Daily limit per key
+                use_batch_api=use_batch_api,
+                claims_per_request=claims_per_request,
+                verdict_cache_path=verdict_cache_path,
+                prefilter_threshold=prefilter_threshold,
+                result_cache_size=result_cache_size,
             )
         else:
             logger.info("Initializing ClaimVerify with single-key mode...")
@@ -198,6 +320,10 @@ class FactCheck:
                 llm_client=self.claim_verify_model,
                 prompt=self.prompt,
                 max_parallel_verifications=max_parallel_verifications,
+                use_batch_api=use_batch_api,
+                claims_per_request=claims_per_request,
+                verdict_cache_path=verdict_cache_path,
+                prefilter_threshold=prefilter_threshold,
             )
         
         # Track sub-modules for usage reporting
@@ -209,6 +335,17 @@ class FactCheck:
             "claimverify"
         ]
         self.num_seed_retries = num_seed_retries
+        self.max_concurrent_steps = 3
+        # Claims retrieving evidence at once when pipelined
+        self.max_concurrent_retrievals = 8
+        self.pipelined = pipelined
+        self.fused = fused
+        self.cluster_retrieval = cluster_retrieval
+        self.cluster_threshold = cluster_threshold
+        
+        self.semantic_cache = (
+            SemanticClaimCache(threshold=semantic_cache_threshold) if use_semantic_cache else None
+        )
         
         logger.info("=== FactCheck Pipeline Initialized Successfully ===")
 
@@ -221,7 +358,12 @@ class FactCheck:
         """
         self.api_config = load_api_config(api_config)
 
-    def check_text(self, raw_text: str) -> dict:
+    def check_text(
+        self,
+        raw_text: str,
+        refresh: bool = False,
+        on_event: Optional[Callable[[str, dict], None]] = None,
+    ) -> dict:
         """
         Main fact-checking method - processes text through entire pipeline.
         
@@ -234,61 +376,83 @@ class FactCheck:
         
         Args:
             raw_text: Input text to fact-check
+            refresh: Rerun the pipeline even if a cached result exists, and
+                replace it
+            on_event: Called with (stage, data) as the pipeline progresses:
+                "claims" ({"claims": {claim: queries}}) after Steps 1-3,
+                "evidence" ({"evidence_counts": {claim: n}}) after Step 4 (per claim
+                when pipelined) and
+                "verification" ({"done": n, "total": m}) as claims are verified,
+                or only "cached" ({}) when the result is served from the cache
             
         Returns:
-            FactCheckOutput dictionary with claims, evidence, and factuality scores
+            FactCheckOutput dictionary with claims, evidence, and factuality scores.
+            Results for identical input are served from an in-memory cache for
+            cache_ttl seconds, with zero token usage since no LLM call was made.
         """
-        # Reset token usage counters
-        self._reset_usage()
+        cache_key = self._cache_key(raw_text)
+        cached = None if refresh else self._cache_get(cache_key)
+        if cached is not None:
+            logger.info("=== Returning cached fact-check result ===")
+            # The stored usage belongs to the run that produced the result
+            for usage in cached["usage"].values():
+                if usage is not None:
+                    usage["prompt_tokens"] = usage["completion_tokens"] = 0
+            if on_event is not None:
+                on_event("cached", {})
+            return cached
         
-        start_time = time.time()
-        logger.info("=== Starting Fact-Check Pipeline ===")
-        
-        # Step 1: Decompose text into claims
-        logger.info("Step 1: Decomposing text into claims...")
-        claims = self.decomposer.getclaims(
-            doc=raw_text, 
-            num_retries=self.num_seed_retries
-        )
-                
-        # Steps 2-3: Run with rate-limited parallelism (single-key is sufficient here)
-        logger.info("Steps 2-3: Running ")
-
-     
-        from factcheck.utils.rate_limiter import RateLimitedExecutor
-
-        executor = RateLimitedExecutor(
-            max_requests_per_minute=8,
-            max_workers=3
-        )
+        from factcheck.utils.llmclient.base import track_run_usage
+        # The instance (and its LLM clients) may be shared by concurrent requests,
+        # so token usage is collected per run rather than reset on the clients
+        with track_run_usage():
+            result = self._check_text(raw_text, on_event)
+        self._cache_put(cache_key, result)
+        return copy.deepcopy(result)
 
-        # Define tasks
-        def task_restore():
-            return self.decomposer.restore_claims(
-                doc=raw_text,
-                claims=claims,
-                num_retries=self.num_seed_retries
-            )
+    def _cache_key(self, raw_text: str) -> str:
+        """Key a check_text result on the input text, model and prompt set."""
+        return hashlib.sha256(
+            f"{raw_text}|{self.default_model}|{self.prompt_name}".encode("utf-8")
+        ).hexdigest()
 
-        def task_checkworthy():
-            return self.checkworthy.identify_checkworthiness(
-                claims,
-                num_retries=self.num_seed_retries
-            )
+    def _cache_get(self, key: str) -> Optional[dict]:
+        """Return a copy of a fresh cached result, evicting it if expired."""
+        if self.cache_ttl <= 0:
+            return None
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            timestamp, result = entry
+            if time.monotonic() - timestamp >= self.cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+        return copy.deepcopy(result)
 
-        def task_queries():
-            return self.query_generator.generate_query(claims=claims)
+    def _cache_put(self, key: str, result: dict) -> None:
+        """Store a result, dropping the least recently used entries past the size limit."""
+        if self.cache_ttl <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
 
-        results = []
-        results.append(task_restore())
-        results.append(task_checkworthy())
-        results.append(task_queries())
-
-        claim2doc = results[0]
-        checkworthy_claims, claim2checkworthy = results[1]
-        claim_queries_dict = results[2]
+    def _check_text(self, raw_text: str, on_event: Optional[Callable[[str, dict], None]] = None) -> dict:
+        """Run the full pipeline for check_text without consulting the cache."""
+        start_time = time.time()
+        logger.info("=== Starting Fact-Check Pipeline ===")
+        
+        # Steps 1-3: one fused LLM call, falling back to the separate steps
+        extracted = self.fused_extract(raw_text) if self.fused else None
+        if extracted is None:
+            extracted = self._extract_claims(raw_text)
+        claims, claim2doc, checkworthy_claims, claim2checkworthy, claim_queries_dict = extracted
 
-        logger.info(f"Steps 2-3 complete: {len(claims)} claims, {len(checkworthy_claims)} checkworthy")
+        logger.info(f"Steps 1-3 complete: {len(claims)} claims, {len(checkworthy_claims)} checkworthy")
 
 
 
@@ -321,40 +485,94 @@ class FactCheck:
         for claim, queries in claim_queries_dict.items():
             logger.info(f"Claim: {claim}")
             logger.info(f"Queries: {queries}")
+        if on_event is not None:
+            on_event("claims", {"claims": dict(claim_queries_dict)})
         
         step123_time = time.time()
         
-        # Step 4: Retrieve evidence from web
-        logger.info("Step 4: Retrieving evidence from web...")
-        claim_evidences_dict = self.evidence_crawler.retrieve_evidence(
-            claim_queries_dict=claim_queries_dict
-        )
+        # Claims similar to already verified ones skip Steps 4-5
+        claim_embeddings, cached_claims = None, {}
+        if self.semantic_cache is not None:
+            claim_embeddings, cached_claims = self.semantic_cache.lookup(list(claim_queries_dict))
+        uncached_claims = [claim for claim in claim_queries_dict if claim not in cached_claims]
         
-        for claim, evidences in claim_evidences_dict.items():
-            logger.info(f"Claim: {claim}")
-            logger.info(f"Evidence count: {len(evidences)}")
+        if uncached_claims and self.pipelined and not self.cluster_retrieval:
+            # Steps 4-5 overlapped: each claim is verified as soon as its evidence is in
+            logger.info("Steps 4-5: Retrieving and verifying claims as their evidence arrives...")
+            claim_evidences_dict, claim_verifications_dict = asyncio.run(self._aretrieve_and_verify(
+                {claim: claim_queries_dict[claim] for claim in uncached_claims}, on_event
+            ))
+            step4_time = step123_time
+        else:
+            # Step 4: Retrieve evidence from web
+            logger.info("Step 4: Retrieving evidence from web...")
+            if uncached_claims and self.cluster_retrieval and len(uncached_claims) > 1:
+                uncached_embeddings = None
+                if claim_embeddings is not None:
+                    claim_index = {claim: i for i, claim in enumerate(claim_queries_dict)}
+                    uncached_embeddings = claim_embeddings[[claim_index[claim] for claim in uncached_claims]]
+                claim_evidences_dict = self._retrieve_clustered(
+                    {claim: claim_queries_dict[claim] for claim in uncached_claims},
+                    uncached_embeddings,
+                )
+            elif uncached_claims:
+                claim_evidences_dict = self.evidence_crawler.retrieve_evidence(
+                    claim_queries_dict={claim: claim_queries_dict[claim] for claim in uncached_claims}
+                )
+            else:
+                claim_evidences_dict = {}
         
-        step4_time = time.time()
+            for claim, evidences in claim_evidences_dict.items():
+                logger.info(f"Claim: {claim}")
+                logger.info(f"Evidence count: {len(evidences)}")
+            if on_event is not None:
+                on_event("evidence", {"evidence_counts": {claim: len(ev) for claim, ev in claim_evidences_dict.items()}})
         
-        # Step 5: Verify claims against evidence
-        logger.info("Step 5: Verifying claims against evidence...")
+            step4_time = time.time()
+        
+            # Step 5: Verify claims against evidence
+            logger.info("Step 5: Verifying claims against evidence...")
 
-        # Convert to (text, url) tuples - handle both dicts and Evidence objects
-        claim_evidence_tuples = {}
-        for claim, evidences in claim_evidences_dict.items():
-            tuples_list = []
-            for ev in evidences:
-                if isinstance(ev, dict):
+            claim_evidence_tuples = {
+                claim: self._evidence_tuples(evidences) for claim, evidences in claim_evidences_dict.items()
+            }
 
-                    tuples_list.append((ev.get('text', ''), ev.get('url', '')))
-                else:
-    
-                    tuples_list.append((ev.text, ev.url))
-            claim_evidence_tuples[claim] = tuples_list
+            if not any(claim_evidence_tuples.values()):
+                # Nothing was retrieved for any claim, so there is nothing to verify
+                claim_verifications_dict = {claim: [] for claim in claim_evidence_tuples}
+            else:
+                # Verify each distinct evidence text once per claim, then fan verdicts back out
+                unique_evidence_tuples, evidence_index_map = self._dedupe_evidences(claim_evidence_tuples)
+                unique_verifications_dict = self.claimverify.verify_claims(
+                    claim_evidences_dict=unique_evidence_tuples,
+                    on_progress=(
+                        (lambda done, total: on_event("verification", {"done": done, "total": total}))
+                        if on_event is not None else None
+                    ),
+                )
+                claim_verifications_dict = self._scatter_verifications(
+                    claim_evidence_tuples, evidence_index_map, unique_verifications_dict
+                )
 
-        claim_verifications_dict = self.claimverify.verify_claims(
-            claim_evidences_dict=claim_evidence_tuples
-        )
+        if self.semantic_cache is not None:
+            if claim_embeddings is not None:
+                claim_index = {claim: i for i, claim in enumerate(claim_queries_dict)}
+                # Don't cache fallback verdicts from failed LLM calls
+                verified = [
+                    claim for claim in uncached_claims
+                    if claim in claim_verifications_dict
+                    and not any(
+                        v.reasoning.startswith("Verification failed") for v in claim_verifications_dict[claim]
+                    )
+                ]
+                self.semantic_cache.add(
+                    claim_embeddings[[claim_index[claim] for claim in verified]],
+                    [claim_evidences_dict[claim] for claim in verified],
+                    [claim_verifications_dict[claim] for claim in verified],
+                )
+            for claim, (evidences, verifications) in cached_claims.items():
+                claim_evidences_dict[claim] = evidences
+                claim_verifications_dict[claim] = verifications
 
 
         
@@ -389,36 +607,283 @@ class FactCheck:
             return_dict=True
         )
 
+    def _retrieve_clustered(self, claim_queries_dict: Dict[str, List[str]], embeddings=None) -> dict:
+        """
+        Retrieve evidence once per cluster of near-duplicate claims.
+        
+        Args:
+            claim_queries_dict: Claims to retrieve evidence for, with their queries
+            embeddings: Normalized claim embeddings in the same order, if already computed
+            
+        Returns:
+            Dictionary mapping every claim to its cluster's evidences
+        """
+        from factcheck.core.semantic_cache import cluster_claims, embed_claims
+        
+        claims = list(claim_queries_dict)
+        if embeddings is None:
+            try:
+                embeddings = embed_claims(claims)
+            except Exception as e:
+                logger.error(f"Claim embedding failed, retrieving per claim: {e}")
+                return self.evidence_crawler.retrieve_evidence(claim_queries_dict=claim_queries_dict)
+        
+        clusters = cluster_claims(embeddings, self.cluster_threshold)
+        logger.info(f"Clustered {len(claims)} claims into {len(clusters)} retrieval groups")
+        
+        representative_evidences = self.evidence_crawler.retrieve_evidence(
+            claim_queries_dict={
+                claims[representative]: claim_queries_dict[claims[representative]]
+                for representative, _ in clusters
+            }
+        )
+        
+        claim_evidences_dict = {}
+        for representative, members in clusters:
+            evidences = representative_evidences.get(claims[representative], [])
+            for member in members:
+                claim_evidences_dict[claims[member]] = evidences
+        return claim_evidences_dict
+
+    def fused_extract(self, raw_text: str):
+        """
+        Run Steps 1-3 (decompose, restore, checkworthy, query generation) as a
+        single LLM call over the document.
+        
+        Args:
+            raw_text: Input text to fact-check
+            
+        Returns:
+            (claims, claim2doc, checkworthy_claims, claim2checkworthy, claim_queries_dict),
+            or None if the response could not be used
+        """
+        logger.info("Steps 1-3: Running fused extraction...")
+        user_input = self.prompt.fused_extract_prompt.format(doc=raw_text).strip()
+        messages = self.decomposer.llm_client.construct_message_list([user_input])
+        
+        for i in range(self.num_seed_retries):
+            response = ""
+            try:
+                response = self.decomposer.llm_client.call(messages, num_retries=1, seed=42 + i)
+                items = loads_json(self.decomposer._clean_json_response(response))["claims"]
+                
+                claims = [item["claim"] for item in items]
+                if not claims or len(set(claims)) != len(claims):
+                    raise ValueError("Fused extraction returned no claims or duplicate claims")
+                
+                claim2doc, _ = self.decomposer.restore_spans(
+                    raw_text, {item["claim"]: item["origin"] for item in items}
+                )
+                claim2checkworthy = {item["claim"]: item["checkworthy"] for item in items}
+                checkworthy_claims = [
+                    claim for claim, verdict in claim2checkworthy.items() if verdict.startswith("Yes")
+                ]
+                max_queries = self.query_generator.max_query_per_claim
+                claim_queries_dict = {
+                    item["claim"]: [item["claim"]] + list(item.get("questions", []))[:(max_queries - 1)]
+                    for item in items
+                }
+                
+                return claims, claim2doc, checkworthy_claims, claim2checkworthy, claim_queries_dict
+            except Exception as e:
+                logger.error(f"Fused extraction failed: {e}, response is: {response[:500]}")
+        
+        logger.warning("Fused extraction failed, falling back to separate Steps 1-3")
+        return None
+
+    def _extract_claims(self, raw_text: str):
+        """
+        Run Steps 1-3 as separate LLM calls.
+        
+        Args:
+            raw_text: Input text to fact-check
+            
+        Returns:
+            (claims, claim2doc, checkworthy_claims, claim2checkworthy, claim_queries_dict)
+        """
+        # Step 1: Decompose text into claims
+        logger.info("Step 1: Decomposing text into claims...")
+        claims = self.decomposer.getclaims(
+            doc=raw_text, 
+            num_retries=self.num_seed_retries
+        )
+                
+        # Steps 2-3: the three calls only depend on `claims` and use separate clients/keys,
+        # so run them concurrently
+        logger.info("Steps 2-3: Running restore, checkworthy and query generation concurrently")
+
+        async def run_steps_2_3():
+            semaphore = asyncio.Semaphore(self.max_concurrent_steps)
+
+            async def bounded(func, *args, **kwargs):
+                async with semaphore:
+                    return await asyncio.to_thread(func, *args, **kwargs)
+
+            return await asyncio.gather(
+                bounded(
+                    self.decomposer.restore_claims,
+                    doc=raw_text,
+                    claims=claims,
+                    num_retries=self.num_seed_retries,
+                ),
+                bounded(
+                    self.checkworthy.identify_checkworthiness,
+                    claims,
+                    num_retries=self.num_seed_retries,
+                ),
+                # Native coroutine: waits on the event loop rather than a worker thread
+                self.query_generator.agenerate_query(claims=claims),
+            )
+
+        results = asyncio.run(run_steps_2_3())
+
+        claim2doc = results[0]
+        checkworthy_claims, claim2checkworthy = results[1]
+        claim_queries_dict = results[2]
+
+        return claims, claim2doc, checkworthy_claims, claim2checkworthy, claim_queries_dict
+
+    async def _aretrieve_and_verify(
+        self,
+        claim_queries_dict: Dict[str, List[str]],
+        on_event: Optional[Callable[[str, dict], None]] = None,
+    ):
+        """
+        Run Steps 4-5 per claim, so verifying one claim overlaps retrieving the others.
+        
+        Args:
+            claim_queries_dict: Claims to retrieve evidence for and verify, with their queries
+            on_event: Stage callback, as for check_text
+            
+        Returns:
+            ({claim: evidences}, {claim: verifications}) in the order of claim_queries_dict
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_retrievals)
+        total = len(claim_queries_dict)
+        done = 0
+
+        async def run_claim(claim, queries):
+            nonlocal done
+            async with semaphore:
+                evidences = (await self.evidence_crawler.aretrieve_evidence({claim: queries})).get(claim, [])
+            if on_event is not None:
+                on_event("evidence", {"evidence_counts": {claim: len(evidences)}})
+            tuples = {claim: self._evidence_tuples(evidences)}
+            verifications = []
+            if tuples[claim]:
+                unique_evidence_tuples, evidence_index_map = self._dedupe_evidences(tuples)
+                # ClaimVerify schedules its own requests (and keys) on worker threads
+                unique_verifications_dict = await asyncio.to_thread(
+                    self.claimverify.verify_claims, unique_evidence_tuples
+                )
+                verifications = self._scatter_verifications(
+                    tuples, evidence_index_map, unique_verifications_dict
+                )[claim]
+            done += 1
+            if on_event is not None:
+                on_event("verification", {"done": done, "total": total})
+            return evidences, verifications
+
+        results = await asyncio.gather(
+            *(run_claim(claim, queries) for claim, queries in claim_queries_dict.items())
+        )
+        claim_evidences_dict = {claim: ev for claim, (ev, _) in zip(claim_queries_dict, results)}
+        claim_verifications_dict = {claim: vf for claim, (_, vf) in zip(claim_queries_dict, results)}
+        return claim_evidences_dict, claim_verifications_dict
+
+    @staticmethod
+    def _evidence_tuples(evidences) -> List[tuple]:
+        """Convert retrieved evidences (dicts or Evidence objects) to (text, url) tuples."""
+        return [
+            (ev.get('text', ''), ev.get('url', '')) if isinstance(ev, dict) else (ev.text, ev.url)
+            for ev in evidences
+        ]
+
+    def _dedupe_evidences(self, claim_evidence_tuples: Dict[str, List[tuple]]):
+        """
+        Drop repeated evidence texts within each claim before verification.
+        
+        Args:
+            claim_evidence_tuples: Maps claims to [(evidence_text, url), ...]
+            
+        Returns:
+            ({claim: unique (text, url) tuples}, {claim: unique index for every original tuple})
+        """
+        unique_evidence_tuples = {}
+        evidence_index_map = {}
+        for claim, tuples_list in claim_evidence_tuples.items():
+            first_seen = {}
+            unique = []
+            index_map = []
+            for text, url in tuples_list:
+                key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+                if key not in first_seen:
+                    first_seen[key] = len(unique)
+                    unique.append((text, url))
+                index_map.append(first_seen[key])
+            if len(unique) < len(tuples_list):
+                logger.info(f"Deduplicated {len(tuples_list) - len(unique)} repeated evidences for claim: {claim[:60]}")
+            unique_evidence_tuples[claim] = unique
+            evidence_index_map[claim] = index_map
+        return unique_evidence_tuples, evidence_index_map
+
+    def _scatter_verifications(
+        self,
+        claim_evidence_tuples: Dict[str, List[tuple]],
+        evidence_index_map: Dict[str, List[int]],
+        unique_verifications_dict: Dict[str, List],
+    ) -> Dict[str, List]:
+        """
+        Map verdicts for unique evidences back onto every original evidence.
+        
+        Args:
+            claim_evidence_tuples: Original [(evidence_text, url), ...] per claim
+            evidence_index_map: Unique index of each original tuple, from _dedupe_evidences
+            unique_verifications_dict: Verification results for the unique evidences
+            
+        Returns:
+            Maps claims to Evidence verifications in the original evidence order
+        """
+        claim_verifications_dict = {}
+        for claim, verifications in unique_verifications_dict.items():
+            scattered = []
+            for (_, url), unique_index in zip(claim_evidence_tuples[claim], evidence_index_map[claim]):
+                # Evidences past ClaimVerify's per-claim limit have no verdict
+                if unique_index < len(verifications):
+                    verification = verifications[unique_index]
+                    scattered.append(verification if verification.url == url else replace(verification, url=url))
+            claim_verifications_dict[claim] = scattered
+        return claim_verifications_dict
+
     def _get_usage(self) -> PipelineUsage:
         """
-        Collect token usage statistics from all sub-modules.
+        Collect token usage statistics from all sub-modules for the check_text
+        run in progress.
         
         Returns:
-            PipelineUsage object with usage stats for each module
+            PipelineUsage object with usage stats for each module (copies, so
+            later calls on the shared clients do not change them)
         """
+        from factcheck.utils.llmclient.base import current_run_usage
+        from factcheck.utils.data_class import TokenUsage
+        
+        run_usage = current_run_usage()
         usage_dict = {}
         
         for attr in self.attr_list:
-            module = getattr(self, attr)
+            client = getattr(getattr(self, attr), 'llm_client', None)
 
-            if hasattr(module, 'llm_client') and hasattr(module.llm_client, 'usage'):
-                usage_dict[attr] = module.llm_client.usage
-            else:
-                from factcheck.utils.data_class import TokenUsage
+            if not hasattr(client, 'usage'):
                 usage_dict[attr] = TokenUsage()
+            elif run_usage is None:
+                # Outside check_text: the client's running totals
+                usage_dict[attr] = replace(client.usage)
+            else:
+                usage_dict[attr] = replace(run_usage.get(id(client)) or TokenUsage(model=client.model))
         
         return PipelineUsage(**usage_dict)
 
 
-    def _reset_usage(self) -> None:
-        """Reset token usage counters for all sub-modules."""
-        for attr in self.attr_list:
-            module = getattr(self, attr)
-
-            if hasattr(module, 'llm_client') and hasattr(module.llm_client, 'reset_usage'):
-                module.llm_client.reset_usage()
-
-
     def _merge_claim_details(
         self,
         claim2doc: Dict[str, dict],
@@ -443,17 +908,21 @@ class FactCheck:
         claim_details = []
         
         for i, (claim, origin) in enumerate(claim2doc.items()):
-            if claim in claim2verifications:
+            # One lookup decides verified vs. not checkworthy and fetches the verdicts
+            evidences = claim2verifications.get(claim)
+            if evidences is not None:
                 # Claim was verified - calculate factuality score
                 assert claim in claim2queries, f"Claim not found in queries: {claim}"
                 assert claim in claim2evidences, f"Claim not found in evidences: {claim}"
                 
-                evidences = claim2verifications.get(claim, {})
-                labels = [e.relationship for e in evidences]
-                
-                # Calculate factuality: SUPPORTS / (SUPPORTS + REFUTES)
-                num_supports = labels.count("SUPPORTS")
-                num_refutes = labels.count("REFUTES")
+                # Calculate factuality: SUPPORTS / (SUPPORTS + REFUTES), counted in one pass
+                num_supports = num_refutes = 0
+                for e in evidences:
+                    relationship = e.relationship
+                    if relationship == "SUPPORTS":
+                        num_supports += 1
+                    elif relationship == "REFUTES":
+                        num_refutes += 1
                 
                 if num_supports + num_refutes == 0:
                     factuality = "No evidence found."
@@ -517,35 +986,30 @@ class FactCheck:
         if claim_detail is None:
             claim_detail = []
         
-        # Calculate summary statistics
-        verified_claims = [
-            c for c in claim_detail 
-            if not isinstance(c.factuality, str)
-        ]
-        
+        # Calculate summary statistics in a single pass over the claim factualities
         num_claims = len(claim_detail)
-        num_checkworthy_claims = len([
-            c for c in claim_detail 
-            if c.factuality != "Nothing to check."
-        ])
-        num_verified_claims = len(verified_claims)
-        num_supported_claims = len([
-            c for c in verified_claims 
-            if c.factuality == 1
-        ])
-        num_refuted_claims = len([
-            c for c in verified_claims 
-            if c.factuality == 0
-        ])
+        num_checkworthy_claims = 0
+        num_verified_claims = 0
+        num_supported_claims = 0
+        num_refuted_claims = 0
+        total_factuality = 0.0
+        for c in claim_detail:
+            if c.factuality != "Nothing to check.":
+                num_checkworthy_claims += 1
+            if isinstance(c.factuality, str):
+                continue
+            num_verified_claims += 1
+            total_factuality += c.factuality
+            if c.factuality == 1:
+                num_supported_claims += 1
+            elif c.factuality == 0:
+                num_refuted_claims += 1
         num_controversial_claims = (
             num_verified_claims - num_supported_claims - num_refuted_claims
         )
         
         # Overall factuality score
-        if num_verified_claims > 0:
-            factuality = sum(c.factuality for c in verified_claims) / num_verified_claims
-        else:
-            factuality = 0.0
+        factuality = total_factuality / num_verified_claims if num_verified_claims > 0 else 0.0
         
         summary = FCSummary(
             num_claims=num_claims,
@@ -574,6 +1038,6 @@ class FactCheck:
         logger.info(f"=== Overall Factuality Score: {output.summary.factuality:.2f} ===")
         
         if return_dict:
-            return asdict(output)
+            return output.to_dict()
         else:
             return output
\ No newline at end of file
@@ -1,17 +1,69 @@
 
+import os
+import glob
 import json
 import argparse
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
 
-from factcheck.utils.llmclient import CLIENTS
-from factcheck.utils.multimodal import modal_normalization
 from factcheck.utils.utils import load_yaml
 from factcheck.utils.logger import CustomLogger
-from factcheck import FactCheck
 
 logger = CustomLogger(__name__).getlog()
 
 
+def resolve_config_paths(patterns: List[str]) -> List[str]:
+    """Expand --api_config entries (files, directories or glob patterns) into YAML file paths.
+
+    Args:
+        patterns: Values passed to --api_config
+
+    Returns:
+        Config file paths in the given order; directories contribute their *.yaml/*.yml files
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(
+                glob.glob(os.path.join(pattern, "*.yaml")) + glob.glob(os.path.join(pattern, "*.yml"))
+            ))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern)))
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def load_api_configs(paths: List[str]) -> dict:
+    """Load and merge API config YAML files, later files overriding earlier ones.
+
+    Several files are parsed in parallel worker processes.
+
+    Args:
+        paths: Config file paths
+
+    Returns:
+        The merged config dict
+    """
+    existing = []
+    for path in paths:
+        if os.path.isfile(path):
+            existing.append(path)
+        else:
+            logger.warning(f"API config file not found: {path}")
+
+    if len(existing) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(existing), os.cpu_count() or 1)) as pool:
+            configs = list(pool.map(load_yaml, existing))
+    else:
+        configs = [load_yaml(path) for path in existing]
+
+    api_config = {}
+    for config in configs:
+        api_config.update(config or {})
+    return api_config
+
+
 def check(args):
     """
     Run fact-checking pipeline on input.
@@ -24,19 +76,22 @@ def check(args):
             - input: Input content or path to file
             - prompt: Prompt template set to use
             - retriever: Evidence retrieval method
-            - api_config: Path to API config YAML file
+            - api_config: Paths, directories or glob patterns of API config YAML files
     """
-    # Load API configuration from YAML file
-    logger.info(f"Loading API config from: {args.api_config}")
+    # Imported here so `--help` and argument errors don't load the pipeline and SDKs
+    from factcheck import FactCheck
+    from factcheck.utils.multimodal import modal_normalization
+
+    # Load API configuration from YAML file(s)
+    config_paths = resolve_config_paths(args.api_config)
+    logger.info(f"Loading API config from: {', '.join(config_paths)}")
     try:
-        api_config = load_yaml(args.api_config)
-    except FileNotFoundError:
-        logger.warning(f"API config file not found: {args.api_config}")
-        logger.info("Using empty config - make sure API keys are in environment variables")
-        api_config = {}
+        api_config = load_api_configs(config_paths)
     except Exception as e:
         logger.error(f"Error loading API config: {e}")
         api_config = {}
+    if not api_config:
+        logger.info("Using empty config - make sure API keys are in environment variables")
 
     # Initialize FactCheck pipeline
     logger.info(f"Initializing FactCheck with model: {args.model}")
@@ -121,8 +176,7 @@ Examples:
         "--client",
         type=str,
         default=None,
-        choices=list(CLIENTS.keys()),
-        help="Specific LLM client to use (auto-detected if not specified)"
+        help="Specific LLM client to use (auto-detected if not specified). Options: gemini"
     )
     parser.add_argument(
         "--prompt",
@@ -158,12 +212,20 @@ Examples:
     parser.add_argument(
         "--api_config",
         type=str,
-        default="factcheck/config/api_config.yaml",
-        help="Path to API configuration YAML file (default: factcheck/config/api_config.yaml)"
+        nargs="+",
+        default=["factcheck/config/api_config.yaml"],
+        help="API configuration YAML file(s), directories or glob patterns; later files override "
+             "earlier ones (default: factcheck/config/api_config.yaml)"
     )
     
     args = parser.parse_args()
     
+    # Validated after parsing so building the parser doesn't import the LLM clients
+    if args.client is not None:
+        from factcheck.utils.llmclient import CLIENTS
+        if args.client not in CLIENTS:
+            parser.error(f"argument --client: invalid choice: {args.client!r} (choose from {', '.join(CLIENTS)})")
+    
     # Run fact-checking
     check(args)
 
@@ -1,4 +1,5 @@
 from factcheck.utils.logger import CustomLogger
+from factcheck.utils.utils import loads_json
 
 logger = CustomLogger(__name__).getlog()
 
@@ -36,7 +37,7 @@ class Checkworthy:
         for i in range(num_retries):
             response = self.llm_client.call(messages, num_retries=1, seed=42 + i)
             try:
-                claim2checkworthy = eval(response)
+                claim2checkworthy = loads_json(response)
                 valid_answer = list(
                     filter(
                         lambda x: x[1].startswith("Yes") or x[1].startswith("No"),
@@ -1,13 +1,81 @@
 from __future__ import annotations
+import asyncio
+import functools
 import json
+import logging
+import re
+import string
 import time
-from typing import List, Optional, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict, Tuple
 from factcheck.utils.logger import CustomLogger
 from factcheck.utils.data_class import Evidence
+from factcheck.utils.utils import loads_json
 from factcheck.utils.rate_limiter import MultiKeyRateLimitedExecutor
+from factcheck.core.verdict_cache import VerdictCache, prompt_fingerprint
+
+try:
+    from google import genai as genai_sdk
+except ImportError:
+    genai_sdk = None
 
 logger = CustomLogger(__name__).getlog()
 
+# Start of a per-evidence verdict object in a (possibly partial) JSON response
+_EVIDENCE_KEY_RE = re.compile(r'"(evidence_\d+)"\s*:\s*')
+# Markdown code block: body between the opening ```lang line and the closing line
+_CODE_BLOCK_RE = re.compile(r"^```[^\n]*\n(.*)\n[^\n]*$", re.DOTALL)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Function words ignored by the lexical prefilter
+_STOPWORDS = frozenset(
+    "the and for are was were with that this from its has have had not but his her their "
+    "they them who whom which what when where why how all any can did does been being into "
+    "than then there these those over under about after before also more most such only "
+    "other some very will would should could may might our out you your she him".split()
+)
+PREFILTER_REASONING = "Prefiltered: the evidence shares no salient terms with the claim"
+
+
+def _salient_tokens(text: str) -> set:
+    """Lowercased words and numbers of text, minus stopwords and one/two-letter words."""
+    return {w for w in _WORD_RE.findall(text.lower()) if len(w) > 2 and w not in _STOPWORDS}
+
+
+def _clip_text(text: str, limit: int) -> str:
+    """Collapse whitespace runs and cut text to at most limit characters at a word boundary."""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    clipped = text[:limit]
+    # Don't leave a partial word (it costs tokens and carries no meaning)
+    cut = clipped.rfind(" ")
+    return clipped[:cut] if cut > limit // 2 else clipped
+
+
+def _compile_template(template: str) -> Optional[List[Tuple[str, Optional[str]]]]:
+    """Parse a str.format template once into (literal_text, field_name) segments.
+
+    Returns None for templates using conversions, format specs or attribute/index
+    lookups, which are left to str.format.
+    """
+    segments = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        segments.append((literal, field))
+    return segments
+
+
+@functools.lru_cache(maxsize=16)
+def _evidence_labels(num_evidences: int) -> Tuple[str, ...]:
+    """"[Evidence i]: " prefixes for a prompt with num_evidences evidences."""
+    return tuple(f"[Evidence {i}]: " for i in range(1, num_evidences + 1))
+
+
+# Static system message shared by every verification request
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful assistant designed to output JSON."}
+
+
 class ClaimVerify:
     """Optimized claim verification: 1 claim = 1 API call with all evidences batched."""
     
@@ -19,17 +87,71 @@ class ClaimVerify:
         max_parallel_verifications: int = 5,
         max_requests_per_minute: int = 10,
         max_requests_per_day: int = 250,
+        max_tokens_per_minute: Optional[int] = None,
         batch_size: int = 5,  
+        evidence_char_budget: int = 2500,
+        use_batch_api: bool = False,
+        batch_poll_timeout: float = 3600,
+        claims_per_request: int = 1,
+        verdict_cache_path: Optional[str] = None,
+        stream_responses: bool = False,
+        stream_timeout: float = 120,
+        use_async: bool = False,
+        prefilter_threshold: Optional[float] = None,
+        result_cache_size: int = 0,
     ):
         """
         Initialize ClaimVerify with optimized batching.
         
         Args:
+            max_tokens_per_minute: Per-key input-token quota (TPM). When set, the
+                multi-key executor delays a request until its estimated prompt
+                tokens fit in the key's budget instead of letting it fail with 429.
             batch_size: Max evidences per claim (default 5)
+            evidence_char_budget: Characters of evidence text per claim in a prompt,
+                split evenly across its evidences (default 2500, i.e. 500 each for 5)
+            use_batch_api: Submit all claims as one Gemini Batch API job instead of
+                one request per claim. Cheaper and not bound by per-key RPM, but jobs
+                can take minutes to hours, so only for latency-tolerant callers.
+                Requires the google-genai package.
+            batch_poll_timeout: Max seconds to wait for a batch job before falling
+                back to per-claim requests
+            claims_per_request: Number of claims verified together in one LLM request
+                (default 1). Larger groups divide the request count, which is what the
+                per-key RPM limit is spent on, at the cost of longer responses.
+            verdict_cache_path: SQLite file for persisting per-(claim, evidence)
+                verdicts across runs; only evidences without a cached verdict are
+                sent to the LLM. Disabled if None.
+            stream_responses: Stream per-claim responses and decode each
+                "evidence_i" verdict as soon as its object is complete
+            stream_timeout: Max seconds to wait for a streamed response
+            use_async: Run verification requests (per claim, or per group with
+                claims_per_request > 1) as coroutines on one event loop (at most
+                max_parallel_verifications in flight) instead of on the thread pool.
+                Used when verify_claims is not called from a running loop.
+            prefilter_threshold: Mark an evidence IRRELEVANT without asking the LLM when
+                the fraction of the claim's salient terms it contains is below this value
+                (e.g. 0.1). Disabled if None.
+            result_cache_size: Multi-key mode only: keep this many verified claims
+                (keyed by claim and evidences) in memory and return them again for an
+                identical task without a request or rate-limit slot. 0 disables it.
         """
         self.llm_client = llm_client
         self.prompt = prompt
+        # Resolved once instead of per claim
+        self._verify_template = prompt.verify_prompt if hasattr(prompt, "verify_prompt") else prompt
+        self._verify_segments = _compile_template(self._verify_template)
         self.batch_size = batch_size
+        self.evidence_char_budget = evidence_char_budget
+        self.api_keys = api_keys
+        self.use_batch_api = use_batch_api
+        self.batch_poll_timeout = batch_poll_timeout
+        self.claims_per_request = max(1, claims_per_request)
+        self.stream_responses = stream_responses
+        self.stream_timeout = stream_timeout
+        self.use_async = use_async
+        self.max_parallel_verifications = max_parallel_verifications
+        self.prefilter_threshold = prefilter_threshold
         
         # Multi-key setup
         self.use_multi_key = api_keys is not None and len(api_keys) > 1
@@ -37,9 +159,12 @@ class ClaimVerify:
         if self.use_multi_key:
 
             if callable(llm_client):
-                self.client_pool = {key: llm_client(key) for key in api_keys}
+                # Build the per-key clients concurrently
+                with ThreadPoolExecutor(max_workers=len(api_keys)) as pool:
+                    self.client_pool = dict(zip(api_keys, pool.map(llm_client, api_keys)))
             else:
                 self.client_pool = {key: llm_client for key in api_keys}
+            self._key_index = {key: i for i, key in enumerate(api_keys)}
 
             self.executor = MultiKeyRateLimitedExecutor(
                 api_keys=api_keys,
@@ -47,19 +172,40 @@ class ClaimVerify:
                 max_requests_per_day=max_requests_per_day,
                 max_workers=max_parallel_verifications,
                 request_window=60,
+                max_tokens_per_minute=max_tokens_per_minute,
+                result_cache_size=result_cache_size,
+                cache_if=self._is_cacheable,
             )
         else:
 
             self.client_pool = None
+            self._key_index = {}
             self.executor = None
+
+        self.verdict_cache = None
+        if verdict_cache_path is not None:
+            model_client = next(iter(self.client_pool.values())) if self.use_multi_key else llm_client
+            self.verdict_cache = VerdictCache(
+                verdict_cache_path,
+                prompt_version=prompt_fingerprint(self._verify_template),
+                model_id=getattr(model_client, "model", ""),
+            )
     
     
     def verify_claims(
         self,
         claim_evidences_dict: Dict[str, List[Tuple[str, str]]],
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        results_sink: Optional[Callable[[str, List[Evidence]], None]] = None,
     ) -> Dict[str, List[Evidence]]:
         """
         Verify all claims in parallel (multi-key) or sequentially (single-key).
+        
+        Args:
+            claim_evidences_dict: {claim: [(evidence_text, url), ...]}
+            on_progress: Called with (claims done, total) as each per-claim request finishes
+            results_sink: Called with (claim, evidences) as soon as a claim is verified,
+                e.g. to persist results incrementally
         """
         start_time = time.time()
     
@@ -72,17 +218,83 @@ class ClaimVerify:
         for claim, evidence_tuples in claim_evidences_dict.items():
             claim_tasks.append((claim, evidence_tuples))
         
+        # Only evidences without a cached (or prefiltered) verdict go to the LLM
+        cached_verdicts = {}
+        if self.verdict_cache is not None or self.prefilter_threshold is not None:
+            claim_tasks, cached_verdicts = self._split_cached_verdicts(claim_tasks)
+        
+        results_dict = None
+        # Whether claims were reported to the callbacks as they finished
+        streamed = False
+        if self.use_batch_api and claim_tasks:
+            logger.info(f" Submitting {len(claim_tasks)} claims as one Gemini batch job...")
+            results_dict = self._verify_claims_batch_api(claim_tasks)
+
         # Process in parallel (multi-key) or sequential (single-key)
-        if self.use_multi_key:
-            logger.info(f" Processing {len(claim_tasks)} claims IN PARALLEL...")
-            results = self.executor.map(self._verify_single_claim, claim_tasks)
+        if results_dict is not None:
+            logger.info(f" Batch job verified {len(results_dict)} claims")
+        elif self.use_async and not self._in_event_loop():
+            logger.info(f" Processing {len(claim_tasks)} claims concurrently on the event loop...")
+            results = asyncio.run(self._averify_claims(claim_tasks))
             results_dict = {claim: evidences for claim, evidences in results}
+        elif self.claims_per_request > 1 and len(claim_tasks) > 1:
+            num_groups = -(-len(claim_tasks) // self.claims_per_request)
+            logger.info(f" Processing {len(claim_tasks)} claims in {num_groups} grouped requests...")
+            if self.use_multi_key:
+                results = self.executor.map_batched(
+                    self._verify_claim_group,
+                    claim_tasks,
+                    batch_size=self.claims_per_request,
+                    cost_fn=self._estimate_group_tokens,
+                )
+            else:
+                results = [
+                    result
+                    for i in range(0, len(claim_tasks), self.claims_per_request)
+                    for result in self._verify_claim_group(claim_tasks[i : i + self.claims_per_request])
+                ]
+            results_dict = {}
+            for (claim, evidence_tuples), result in zip(claim_tasks, results):
+                if result is None:
+                    result = (claim, self._create_fallback_evidences(
+                        claim, self._truncate_evidences(evidence_tuples), "request failed"
+                    ))
+                results_dict[claim] = result[1]
+        elif self.use_multi_key:
+            logger.info(f" Processing {len(claim_tasks)} claims IN PARALLEL...")
+            # Consume verdicts as they land instead of waiting for the slowest claim
+            results_dict = {}
+            completed = self.executor.imap_unordered(
+                self._verify_single_claim, claim_tasks, cost_fn=self._estimate_claim_tokens
+            )
+            for done, (index, result) in enumerate(completed, start=1):
+                if result is None:
+                    claim, evidence_tuples = claim_tasks[index]
+                    result = (claim, self._create_fallback_evidences(
+                        claim, self._truncate_evidences(evidence_tuples), "request failed"
+                    ))
+                claim, evidences = result
+                results_dict[claim] = evidences
+                self._report(claim, evidences, done, len(claim_tasks), on_progress, results_sink)
+            # Restore input order
+            results_dict = {claim: results_dict[claim] for claim, _ in claim_tasks if claim in results_dict}
+            streamed = True
         else:
             logger.info(f" Processing {len(claim_tasks)} claims sequentially...")
             results_dict = {}
-            for task in claim_tasks:
+            for done, task in enumerate(claim_tasks, start=1):
                 claim, evidences = self._verify_single_claim(task, api_key=None)
                 results_dict[claim] = evidences
+                self._report(claim, evidences, done, len(claim_tasks), on_progress, results_sink)
+            streamed = True
+        
+        if not streamed:
+            # Batch, grouped and async results arrive together
+            for done, (claim, evidences) in enumerate(results_dict.items(), start=1):
+                self._report(claim, evidences, done, len(results_dict), on_progress, results_sink)
+        
+        if cached_verdicts:
+            results_dict = self._merge_cached_verdicts(results_dict, cached_verdicts)
         
         duration = time.time() - start_time
         logger.info(
@@ -94,6 +306,102 @@ class ClaimVerify:
         
         return results_dict
     
+    @staticmethod
+    def _report(claim, evidences, done, total, on_progress, results_sink) -> None:
+        """Forward one finished claim to the optional progress and sink callbacks."""
+        if results_sink is not None:
+            results_sink(claim, evidences)
+        if on_progress is not None:
+            on_progress(done, total)
+
+    def _split_cached_verdicts(
+        self,
+        claim_tasks: List[Tuple[str, List[Tuple[str, str]]]],
+    ) -> Tuple[List[Tuple[str, List[Tuple[str, str]]]], Dict[str, tuple]]:
+        """
+        Separate evidences that already have a cached verdict, or that the lexical
+        prefilter marks IRRELEVANT, from those that need the LLM.
+        
+        Returns:
+            (tasks with only the uncached evidences, {claim: (evidence_tuples, {text: verdict})})
+        """
+        remaining_tasks = []
+        cached_verdicts = {}
+        for claim, evidence_tuples in claim_tasks:
+            evidence_tuples = self._truncate_evidences(evidence_tuples)
+            hits = {}
+            if self.verdict_cache is not None:
+                hits = self.verdict_cache.get_many(claim, [text for text, _ in evidence_tuples])
+            if self.prefilter_threshold is not None:
+                hits.update(self._prefilter_verdicts(claim, evidence_tuples, hits))
+            cached_verdicts[claim] = (evidence_tuples, hits)
+            uncached = [(text, url) for text, url in evidence_tuples if text not in hits]
+            if uncached:
+                remaining_tasks.append((claim, uncached))
+        
+        if self.verdict_cache is not None:
+            logger.info(f" Verdict cache hit rate: {self.verdict_cache.hit_rate():.1%}")
+        return remaining_tasks, cached_verdicts
+
+    def _prefilter_verdicts(
+        self,
+        claim: str,
+        evidence_tuples: List[Tuple[str, str]],
+        known: Dict[str, Tuple[str, str]],
+    ) -> Dict[str, Tuple[str, str]]:
+        """
+        IRRELEVANT verdicts for evidences whose overlap with the claim's salient terms
+        is below prefilter_threshold.
+        
+        Returns:
+            {evidence_text: (reasoning, relationship)} for the filtered evidences
+        """
+        claim_tokens = _salient_tokens(claim)
+        if not claim_tokens:
+            return {}
+        
+        filtered = {}
+        for text, _ in evidence_tuples:
+            if text in known or text in filtered:
+                continue
+            overlap = len(claim_tokens & _salient_tokens(text)) / len(claim_tokens)
+            if overlap < self.prefilter_threshold:
+                filtered[text] = (PREFILTER_REASONING, "IRRELEVANT")
+        if filtered:
+            logger.debug("Prefiltered %d/%d evidences for claim: %.60s", len(filtered), len(evidence_tuples), claim)
+        return filtered
+
+    def _merge_cached_verdicts(
+        self,
+        results_dict: Dict[str, List[Evidence]],
+        cached_verdicts: Dict[str, tuple],
+    ) -> Dict[str, List[Evidence]]:
+        """Persist fresh verdicts and rebuild each claim's evidences in their original order."""
+        if self.verdict_cache is not None:
+            for claim, evidences in results_dict.items():
+                self.verdict_cache.put_many(claim, [
+                    (ev.text, ev.reasoning, ev.relationship)
+                    for ev in evidences
+                    if not ev.reasoning.startswith("Verification failed")
+                ])
+        
+        merged = {}
+        for claim, (evidence_tuples, hits) in cached_verdicts.items():
+            fresh = {ev.text: ev for ev in results_dict.get(claim, [])}
+            evidence_objects = []
+            for text, url in evidence_tuples:
+                if text in hits:
+                    reasoning, relationship = hits[text]
+                    evidence_objects.append(Evidence(
+                        claim=claim, text=text, url=url, reasoning=reasoning, relationship=relationship
+                    ))
+                elif text in fresh:
+                    evidence_objects.append(fresh[text])
+                else:
+                    evidence_objects += self._create_fallback_evidences(claim, [(text, url)], "no verdict returned")
+            merged[claim] = evidence_objects
+        return merged
+
     def _verify_single_claim(
         self,
         claim_task: Tuple[str, List[Tuple[str, str]]],
@@ -111,42 +419,14 @@ class ClaimVerify:
         """
         claim, evidence_tuples = claim_task
         
-        # Get appropriate client
-        if self.use_multi_key and api_key:
-            client = self.client_pool[api_key]
-            key_id = f"key_{list(self.client_pool.keys()).index(api_key)}"
-        else:
-            client = self.llm_client
-            key_id = "single_key"
+        client, key_id = self._get_client(api_key)
         
-        logger.info(f"  {key_id} → Claim: {claim[:60]}... ({len(evidence_tuples)} evidences)")
+        logger.debug("  %s -> Claim: %.60s... (%d evidences)", key_id, claim, len(evidence_tuples))
         
 
-        if len(evidence_tuples) > self.batch_size:
-            logger.warning(
-                f"   Claim has {len(evidence_tuples)} evidences, "
-                f"truncating to {self.batch_size}"
-            )
-            evidence_tuples = evidence_tuples[:self.batch_size]
-        
-        # Format evidences for prompt
-        evidences_text = ""
-        for i, (evidence_text, _) in enumerate(evidence_tuples, 1):
-
-            evidence_truncated = evidence_text[:500] if len(evidence_text) > 500 else evidence_text
-            evidences_text += f"[Evidence {i}]: {evidence_truncated}\n"
+        evidence_tuples = self._truncate_evidences(evidence_tuples)
         try:
-  
-            if hasattr(self.prompt, 'verify_prompt'):
-                prompt_template = self.prompt.verify_prompt
-            else:
-      
-                prompt_template = self.prompt
-            
-            prompt_text = prompt_template.format(
-                claim=claim,
-                evidence=evidences_text.strip()
-            )
+            prompt_text = self._build_prompt(claim, evidence_tuples)
         except Exception as e:
     
             # Return fallback evidences
@@ -154,44 +434,435 @@ class ClaimVerify:
         
         try:
             messages = [
-                {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
+                SYSTEM_MESSAGE,
                 {"role": "user", "content": prompt_text}
             ]
-            response = client._call(messages)
-            # Parse response
-            verdicts = self._parse_batch_response(response)
+            if self.stream_responses and hasattr(client, "_stream"):
+                response, verdicts = self._stream_verdicts(client, messages)
+            else:
+                response = client._call(messages)
+                # Parse response
+                verdicts = self._parse_batch_response(response)
             
 
             if not isinstance(verdicts, dict):
                 logger.error(f"Converting {type(verdicts)} to empty dict")
                 verdicts = {}
 
+            evidence_objects = self._build_evidences(claim, evidence_tuples, verdicts)
             
-            # Parse response
-            verdicts = self._parse_batch_response(response)
-            
-            # Create Evidence objects
-            evidence_objects = []
-            for i, (evidence_text, evidence_url) in enumerate(evidence_tuples, start=1):
-                evidence_key = f"evidence_{i}"
-                verdict = verdicts.get(evidence_key, {})
-                
-                evidence_obj = Evidence(
-                    claim=claim,
-                    text=evidence_text,
-                    url=evidence_url,
-                    reasoning=verdict.get("reasoning", "No reasoning provided"),
-                    relationship=verdict.get("relationship", "IRRELEVANT")
-                )
-                evidence_objects.append(evidence_obj)
-            
-            logger.info(f" Verified {len(evidence_objects)} evidences")
+            logger.debug(" Verified %d evidences", len(evidence_objects))
             return (claim, evidence_objects)
             
         except Exception as e:
             logger.error(f"Verification failed for claim: {str(e)}")
             return (claim, self._create_fallback_evidences(claim, evidence_tuples, str(e)))
 
+    @staticmethod
+    def _in_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    async def _averify_claims(
+        self,
+        claim_tasks: List[Tuple[str, List[Tuple[str, str]]]],
+    ) -> List[Tuple[str, List[Evidence]]]:
+        """
+        Verify claims concurrently as coroutines, over all API keys in multi-key mode.
+        
+        With claims_per_request > 1, claims are sent claims_per_request at a time
+        in grouped requests, as on the threaded path.
+        """
+        k = self.claims_per_request
+        if k > 1 and len(claim_tasks) > 1:
+            groups = [claim_tasks[i : i + k] for i in range(0, len(claim_tasks), k)]
+            logger.info(f" Verifying {len(claim_tasks)} claims in {len(groups)} grouped requests...")
+            group_results = await self._arun_all(self._averify_claim_group, groups, self._estimate_group_tokens)
+            results = [
+                result
+                for group, group_result in zip(groups, group_results)
+                for result in (group_result if group_result is not None else [None] * len(group))
+            ]
+        else:
+            results = await self._arun_all(self._averify_single_claim, claim_tasks, self._estimate_claim_tokens)
+        return [
+            result if result is not None else (claim, self._create_fallback_evidences(
+                claim, self._truncate_evidences(evidence_tuples), "request failed"
+            ))
+            for (claim, evidence_tuples), result in zip(claim_tasks, results)
+        ]
+
+    async def _arun_all(self, func, items: list, cost_fn: Callable) -> list:
+        """Await func over items, through the multi-key executor or a local semaphore."""
+        if self.use_multi_key:
+            # Same per-key windows and daily quotas as the threaded path
+            return await self.executor.map_async(func, items, cost_fn=cost_fn)
+
+        semaphore = asyncio.Semaphore(self.max_parallel_verifications)
+        
+        async def _run(item):
+            async with semaphore:
+                return await func(item)
+        
+        return await asyncio.gather(*(_run(item) for item in items))
+
+    async def _averify_single_claim(
+        self,
+        claim_task: Tuple[str, List[Tuple[str, str]]],
+        api_key: str = None
+    ) -> Tuple[str, List[Evidence]]:
+        """
+        Async counterpart of _verify_single_claim.
+        
+        The client's sync _call runs in a worker thread: verify_claims starts a
+        fresh asyncio.run each time, and the Gemini SDK's async gRPC channel on
+        these long-lived clients stays bound to the first, closed, loop.
+        """
+        claim, evidence_tuples = claim_task
+        client, key_id = self._get_client(api_key)
+        logger.debug("  %s -> Claim: %.60s... (%d evidences)", key_id, claim, len(evidence_tuples))
+        
+        evidence_tuples = self._truncate_evidences(evidence_tuples)
+        try:
+            messages = [
+                SYSTEM_MESSAGE,
+                {"role": "user", "content": self._build_prompt(claim, evidence_tuples)}
+            ]
+            response = await asyncio.to_thread(client._call, messages)
+            verdicts = self._parse_batch_response(response)
+            return (claim, self._build_evidences(claim, evidence_tuples, verdicts))
+        except Exception as e:
+            logger.error(f"Verification failed for claim: {str(e)}")
+            return (claim, self._create_fallback_evidences(claim, evidence_tuples, str(e)))
+
+    def _stream_verdicts(self, client, messages: List[Dict[str, str]]) -> Tuple[str, Dict]:
+        """
+        Stream a verification response, decoding each "evidence_i" verdict as soon
+        as its JSON object has fully arrived.
+        
+        Falls back to a buffered call if the stream fails before any text arrives,
+        and to parsing the full text if no verdict could be decoded incrementally.
+        
+        Returns:
+            (full response text, {"evidence_i": verdict})
+        """
+        decoder = json.JSONDecoder()
+        deadline = time.monotonic() + self.stream_timeout
+        verdicts = {}
+        buffer = ""
+        pos = 0
+        try:
+            for chunk in client._stream(messages):
+                buffer += chunk
+                while True:
+                    match = _EVIDENCE_KEY_RE.search(buffer, pos)
+                    if match is None:
+                        break
+                    try:
+                        verdict, end = decoder.raw_decode(buffer, match.end())
+                    except json.JSONDecodeError:
+                        break  # object not complete yet
+                    if isinstance(verdict, dict):
+                        verdicts[match.group(1)] = verdict
+                    pos = end
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Streamed response exceeded {self.stream_timeout}s")
+        except Exception as e:
+            if not buffer:
+                logger.warning(f"Streaming failed ({e}), retrying without streaming")
+                response = client._call(messages)
+                return response, self._parse_batch_response(response)
+            raise
+        
+        if not verdicts:
+            verdicts = self._parse_batch_response(buffer)
+        return buffer, verdicts
+
+    def _verify_claim_group(
+        self,
+        group_tasks: List[Tuple[str, List[Tuple[str, str]]]],
+        api_key: str = None
+    ) -> List[Tuple[str, List[Evidence]]]:
+        """
+        Verify several claims, each with all its evidences, in one API call.
+        
+        Args:
+            group_tasks: [(claim, [(evidence_text, url), ...]), ...]
+            api_key: API key (provided by executor in multi-key mode)
+            
+        Returns:
+            [(claim, [Evidence objects]), ...] in the order of group_tasks
+        """
+        client, key_id = self._get_client(api_key)
+        logger.debug("  %s -> %d claims in one request", key_id, len(group_tasks))
+        
+        group_tasks = [(claim, self._truncate_evidences(ev)) for claim, ev in group_tasks]
+        try:
+            verdicts = self._parse_batch_response(client._call(self._group_messages(group_tasks)))
+        except Exception as e:
+            logger.error(f"Grouped verification failed: {str(e)}")
+            return self._group_fallback(group_tasks, e)
+        
+        results = self._split_group_verdicts(group_tasks, verdicts)
+        return [
+            result if result is not None else self._verify_single_claim(task, api_key=api_key)
+            for task, result in zip(group_tasks, results)
+        ]
+
+    async def _averify_claim_group(
+        self,
+        group_tasks: List[Tuple[str, List[Tuple[str, str]]]],
+        api_key: str = None
+    ) -> List[Tuple[str, List[Evidence]]]:
+        """Async counterpart of _verify_claim_group."""
+        client, key_id = self._get_client(api_key)
+        logger.debug("  %s -> %d claims in one request", key_id, len(group_tasks))
+        
+        group_tasks = [(claim, self._truncate_evidences(ev)) for claim, ev in group_tasks]
+        messages = self._group_messages(group_tasks)
+        try:
+            response = await asyncio.to_thread(client._call, messages)
+            verdicts = self._parse_batch_response(response)
+        except Exception as e:
+            logger.error(f"Grouped verification failed: {str(e)}")
+            return self._group_fallback(group_tasks, e)
+        
+        results = self._split_group_verdicts(group_tasks, verdicts)
+        missing = [i for i, result in enumerate(results) if result is None]
+        retried = await asyncio.gather(
+            *(self._averify_single_claim(group_tasks[i], api_key=api_key) for i in missing)
+        )
+        for i, result in zip(missing, retried):
+            results[i] = result
+        return results
+
+    def _group_messages(self, group_tasks: List[Tuple[str, List[Tuple[str, str]]]]) -> List[Dict[str, str]]:
+        return [
+            SYSTEM_MESSAGE,
+            {"role": "user", "content": self._build_group_prompt(group_tasks)}
+        ]
+
+    def _group_fallback(
+        self, group_tasks: List[Tuple[str, List[Tuple[str, str]]]], error: Exception
+    ) -> List[Tuple[str, List[Evidence]]]:
+        return [
+            (claim, self._create_fallback_evidences(claim, evidence_tuples, str(error)))
+            for claim, evidence_tuples in group_tasks
+        ]
+
+    def _split_group_verdicts(
+        self, group_tasks: List[Tuple[str, List[Tuple[str, str]]]], verdicts: Dict
+    ) -> List[Optional[Tuple[str, List[Evidence]]]]:
+        """Per-claim results of a grouped response; None for claims the model skipped."""
+        results = []
+        for k, (claim, evidence_tuples) in enumerate(group_tasks, start=1):
+            claim_verdicts = verdicts.get(f"claim_{k}")
+            if isinstance(claim_verdicts, dict):
+                results.append((claim, self._build_evidences(claim, evidence_tuples, claim_verdicts)))
+            else:
+                # The model skipped this claim; the caller verifies it on its own
+                logger.warning(f"  No verdicts for claim_{k} in grouped response, retrying it alone")
+                results.append(None)
+        return results
+
+    def _get_client(self, api_key: Optional[str]):
+        """Return (client, key_id) for an API key handed out by the executor."""
+        if self.use_multi_key and api_key:
+            client = self.client_pool[api_key]
+            key_id = f"key_{self._key_index[api_key]}"
+        else:
+            client = self.llm_client
+            key_id = "single_key"
+        return client, key_id
+
+    def _estimate_tokens(self, template: str, claim_tasks: List[Tuple[str, List[Tuple[str, str]]]]) -> int:
+        """Rough prompt size of a request over claim_tasks (~4 characters per token)."""
+        chars = len(template)
+        for claim, evidence_tuples in claim_tasks:
+            evidence_tuples = evidence_tuples[:self.batch_size]
+            limit = self._evidence_char_limit(len(evidence_tuples))
+            chars += len(claim) + sum(min(len(text), limit) for text, _ in evidence_tuples)
+        return chars // 4
+
+    def _estimate_claim_tokens(self, claim_task: Tuple[str, List[Tuple[str, str]]]) -> int:
+        return self._estimate_tokens(self._verify_template, [claim_task])
+
+    def _estimate_group_tokens(self, group_tasks: List[Tuple[str, List[Tuple[str, str]]]]) -> int:
+        return self._estimate_tokens(getattr(self.prompt, "multi_verify_prompt", ""), group_tasks)
+
+    def _truncate_evidences(self, evidence_tuples: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """Drop repeated evidence texts, then keep at most batch_size evidences for a claim."""
+        # First occurrence of each text wins, so repeats don't take up batch_size slots
+        unique = {}
+        for evidence in evidence_tuples:
+            unique.setdefault(evidence[0], evidence)
+        if len(unique) < len(evidence_tuples):
+            evidence_tuples = list(unique.values())
+        if len(evidence_tuples) > self.batch_size:
+            logger.warning(
+                f"   Claim has {len(evidence_tuples)} evidences, "
+                f"truncating to {self.batch_size}"
+            )
+            evidence_tuples = evidence_tuples[:self.batch_size]
+        return evidence_tuples
+
+    def _build_prompt(self, claim: str, evidence_tuples: List[Tuple[str, str]]) -> str:
+        """Format the verification prompt for one claim and its evidences."""
+        evidence = self._format_evidences(evidence_tuples)
+        if self._verify_segments is None:
+            return self._verify_template.format(claim=claim, evidence=evidence)
+        # Fill the pre-parsed template instead of re-parsing it for every claim
+        values = {"claim": claim, "evidence": evidence}
+        return "".join(
+            literal if field is None else literal + str(values[field])
+            for literal, field in self._verify_segments
+        )
+
+    def _evidence_char_limit(self, num_evidences: int) -> int:
+        """Per-evidence share of the claim's evidence character budget."""
+        return self.evidence_char_budget // max(1, num_evidences)
+
+    def _format_evidences(self, evidence_tuples: List[Tuple[str, str]]) -> str:
+        """Number and truncate evidences for a verification prompt."""
+        limit = self._evidence_char_limit(len(evidence_tuples))
+        labels = _evidence_labels(len(evidence_tuples))
+        parts = [
+            label + _clip_text(evidence_text, limit)
+            for label, (evidence_text, _) in zip(labels, evidence_tuples)
+        ]
+        return "\n".join(parts).strip()
+
+    def _build_group_prompt(self, group_tasks: List[Tuple[str, List[Tuple[str, str]]]]) -> str:
+        """Format the multi-claim verification prompt for a group of claims."""
+        claim_blocks = [
+            f"[Claim {k}]: {claim}\nEvidences:\n{self._format_evidences(evidence_tuples)}"
+            for k, (claim, evidence_tuples) in enumerate(group_tasks, start=1)
+        ]
+        return self.prompt.multi_verify_prompt.format(claims="\n\n".join(claim_blocks))
+
+    def _build_evidences(
+        self,
+        claim: str,
+        evidence_tuples: List[Tuple[str, str]],
+        verdicts: Dict,
+    ) -> List[Evidence]:
+        """Create Evidence objects from the per-evidence verdicts returned by the LLM."""
+        evidence_objects = []
+        for i, (evidence_text, evidence_url) in enumerate(evidence_tuples, start=1):
+            evidence_key = f"evidence_{i}"
+            verdict = verdicts.get(evidence_key, {})
+            
+            evidence_obj = Evidence(
+                claim=claim,
+                text=evidence_text,
+                url=evidence_url,
+                reasoning=verdict.get("reasoning", "No reasoning provided"),
+                relationship=verdict.get("relationship", "IRRELEVANT")
+            )
+            evidence_objects.append(evidence_obj)
+        return evidence_objects
+
+    def _verify_claims_batch_api(
+        self,
+        claim_tasks: List[Tuple[str, List[Tuple[str, str]]]],
+    ) -> Optional[Dict[str, List[Evidence]]]:
+        """
+        Verify all claims in a single Gemini Batch API job.
+        
+        Args:
+            claim_tasks: [(claim, [(evidence_text, url), ...]), ...]
+            
+        Returns:
+            {claim: [Evidence objects]}, or None if the batch job could not be
+            completed (the caller then falls back to per-claim requests)
+        """
+        if genai_sdk is None:
+            logger.warning("google-genai is not installed; falling back to per-claim verification")
+            return None
+
+        if self.use_multi_key:
+            api_key = self.api_keys[0]
+            model_name = self.client_pool[api_key].model
+        else:
+            api_key = self.llm_client.api_config.get("GEMINI_API_KEY")
+            model_name = self.llm_client.model
+
+        tasks = []
+        inline_requests = []
+        for claim, evidence_tuples in claim_tasks:
+            evidence_tuples = self._truncate_evidences(evidence_tuples)
+            try:
+                prompt_text = self._build_prompt(claim, evidence_tuples)
+            except Exception as e:
+                logger.error(f"Failed to build prompt for claim: {str(e)}")
+                return None
+            tasks.append((claim, evidence_tuples))
+            inline_requests.append({
+                "contents": [{
+                    "role": "user",
+                    "parts": [{"text": f"System Instructions: You are a helpful assistant designed to output JSON.\n\n{prompt_text}"}],
+                }],
+                "config": {"response_mime_type": "application/json"},
+            })
+
+        try:
+            client = genai_sdk.Client(api_key=api_key)
+            batch_job = client.batches.create(
+                model=model_name,
+                src=inline_requests,
+                config={"display_name": f"claim-verify-{int(time.time())}"},
+            )
+            logger.info(f"Created batch job {batch_job.name} for {len(inline_requests)} claims")
+
+            # Poll with exponential backoff until the job reaches a terminal state
+            deadline = time.monotonic() + self.batch_poll_timeout
+            poll_interval = 5.0
+            terminal_states = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+            while batch_job.state.name not in terminal_states:
+                if time.monotonic() > deadline:
+                    logger.error(f"Batch job {batch_job.name} timed out after {self.batch_poll_timeout}s")
+                    client.batches.cancel(name=batch_job.name)
+                    return None
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, 60.0)
+                batch_job = client.batches.get(name=batch_job.name)
+
+            if batch_job.state.name != "JOB_STATE_SUCCEEDED":
+                logger.error(f"Batch job {batch_job.name} ended with {batch_job.state.name}")
+                return None
+
+            responses = batch_job.dest.inlined_responses or []
+        except Exception as e:
+            logger.error(f"Batch verification failed: {str(e)}")
+            return None
+
+        if len(responses) != len(tasks):
+            logger.error(f"Batch job returned {len(responses)} responses for {len(tasks)} claims")
+            return None
+
+        # Inline responses come back in request order
+        results_dict = {}
+        for (claim, evidence_tuples), inline_response in zip(tasks, responses):
+            if inline_response.error or inline_response.response is None:
+                error_msg = str(inline_response.error) if inline_response.error else "empty response"
+                results_dict[claim] = self._create_fallback_evidences(claim, evidence_tuples, error_msg)
+                continue
+            verdicts = self._parse_batch_response(inline_response.response.text)
+            results_dict[claim] = self._build_evidences(claim, evidence_tuples, verdicts)
+
+        return results_dict
+
+    @staticmethod
+    def _is_cacheable(result) -> bool:
+        """Whether a per-claim or grouped verification result contains no failure fallbacks."""
+        pairs = result if isinstance(result, list) else [result]
+        return not any(
+            ev.reasoning.startswith("Verification failed") for _, evidences in pairs for ev in evidences
+        )
+
     def _create_fallback_evidences(
         self,
         claim: str,
@@ -219,12 +890,12 @@ class ClaimVerify:
             
             # Remove markdown code blocks
             if response.startswith("```"):
-                lines = response.split("\n")
-                if len(lines) > 2:
-                    response = "\n".join(lines[1:-1])
+                match = _CODE_BLOCK_RE.match(response)
+                if match:
+                    response = match.group(1)
             
-            # Parse JSON
-            parsed = json.loads(response)
+            # Parse JSON (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+            parsed = loads_json(response)
             
             # Ensure it's a dict
             if isinstance(parsed, dict):
@@ -234,8 +905,9 @@ class ClaimVerify:
                 return {}
             
         except json.JSONDecodeError as e:
-            logger.error(f"JSON parse error: {str(e)}")
-            logger.error(f"Response: {response[:300]}...")
+            logger.error("JSON parse error: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response: %s...", response[:300])
             return {}  # Always return dict!
         except Exception as e:
             logger.error(f"Parse error: {str(e)}")
@@ -1,21 +1,70 @@
 from factcheck.utils.logger import CustomLogger
+from factcheck.utils.utils import loads_json
+import asyncio
+import bisect
+import functools
 import nltk
+from typing import Iterator
 import json  
 import re    
 
 logger = CustomLogger(__name__).getlog()
 
+_CODE_FENCE_RE = re.compile(r'```\s*')
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+# Opening of the claim list in a (possibly partial) decomposition response
+_CLAIMS_ARRAY_RE = re.compile(r'"claims"\s*:\s*\[')
+_ARRAY_SEPARATOR_RE = re.compile(r'[\s,]*')
+
+try:
+    import pysbd
+except ImportError:
+    pysbd = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from nltk.tokenize import PunktTokenizer
+except ImportError:  # NLTK < 3.8.2
+    PunktTokenizer = None
+
+
+@functools.lru_cache(maxsize=1)
+def _sentence_tokenizer():
+    """Load the English Punkt model once; nltk.sent_tokenize reloads it on every call."""
+    if PunktTokenizer is not None:
+        return PunktTokenizer("english").tokenize
+    return nltk.sent_tokenize
+
+
+@functools.lru_cache(maxsize=1)
+def _pysbd_segmenter():
+    return pysbd.Segmenter(language="en", clean=False)
+
+
 class Decompose:
-    def __init__(self, llm_client, prompt):
+    def __init__(self, llm_client, prompt, sentence_splitter: str = "nltk"):
         """Initialize the Decompose class
         
         Args:
             llm_client (BaseClient): The LLM client used for decomposing documents into claims.
             prompt (BasePrompt): The prompt used for fact checking.
+            sentence_splitter (str, optional): "nltk" (Punkt) or "pysbd" (rule-based, requires
+                the pysbd package) for the sentence-splitting fallback. Defaults to "nltk".
         """
         self.llm_client = llm_client
         self.prompt = prompt
-        self.doc2sent = self._nltk_doc2sent
+        if sentence_splitter == "pysbd":
+            if pysbd is None:
+                raise ImportError("sentence_splitter='pysbd' requires the pysbd package")
+            self.doc2sent = self._pysbd_doc2sent
+        elif sentence_splitter == "nltk":
+            self.doc2sent = self._nltk_doc2sent
+        else:
+            raise ValueError(f"Unknown sentence_splitter: {sentence_splitter}")
     
     def _nltk_doc2sent(self, text: str):
         """Split the document into sentences using nltk
@@ -26,7 +75,20 @@ class Decompose:
         Returns:
             list: a list of sentences
         """
-        sentences = nltk.sent_tokenize(text)
+        sentences = _sentence_tokenizer()(text)
+        sentence_list = [s.strip() for s in sentences if len(s.strip()) >= 3]
+        return sentence_list
+    
+    def _pysbd_doc2sent(self, text: str):
+        """Split the document into sentences using pysbd
+        
+        Args:
+            text (str): the document to be split into sentences
+        
+        Returns:
+            list: a list of sentences
+        """
+        sentences = _pysbd_segmenter().segment(text)
         sentence_list = [s.strip() for s in sentences if len(s.strip()) >= 3]
         return sentence_list
     
@@ -37,14 +99,35 @@ class Decompose:
         """
 
 
-        response = re.sub(r'```\s*', '', response)
+        response = _CODE_FENCE_RE.sub('', response)
         
-        match = re.search(r'\{.*\}', response, re.DOTALL)
+        match = _JSON_OBJECT_RE.search(response)
         if match:
             return match.group(0)
         
         return response.strip()
     
+    def _decompose_messages(self, doc: str, prompt: str = None):
+        """Build the decomposition request messages for a document."""
+        if prompt is None:
+            user_input = self.prompt.decompose_prompt.format(doc=doc).strip()
+        else:
+            user_input = prompt.format(doc=doc).strip()
+        return self.llm_client.construct_message_list([user_input])
+    
+    @staticmethod
+    def _decompose_output_tokens(doc: str) -> int:
+        """Response length cap for decomposing doc: claims are about as long as the text they restate."""
+        return 1500 + len(doc) // 3
+    
+    def _parse_claims(self, response: str):
+        """Extract the claim list from a decomposition response."""
+        # Clean the response
+        cleaned_response = self._clean_json_response(response)
+        
+        # Parse JSON
+        return loads_json(cleaned_response).get("claims", [])
+    
     def getclaims(self, doc: str, num_retries: int = 3, prompt: str = None) -> list[str]:
         """Use LLM to decompose a document into claims
         
@@ -55,34 +138,113 @@ class Decompose:
         Returns:
             list: a list of claims
         """
-        if prompt is None:
-            user_input = self.prompt.decompose_prompt.format(doc=doc).strip()
-        else:
-            user_input = prompt.format(doc=doc).strip()
-        
         claims = None
-        messages = self.llm_client.construct_message_list([user_input])
+        messages = self._decompose_messages(doc, prompt)
         
         for i in range(num_retries):
+            response = ""
             try:
                 response = self.llm_client.call(
                     messages=messages,
                     num_retries=1,
                     seed=42 + i,
+                    max_output_tokens=self._decompose_output_tokens(doc),
                 )
+                claims = self._parse_claims(response)
                 
-                # Clean the response
-                cleaned_response = self._clean_json_response(response)
-                
-                # Parse JSON
-                try:
-                    parsed = json.loads(cleaned_response)
-                except json.JSONDecodeError:
-                
-                    logger.warning(f"JSON decode failed, trying eval. Response: {response[:200]}")
-                    parsed = eval(cleaned_response)
-                
-                claims = parsed.get("claims", [])
+                if isinstance(claims, list) and len(claims) > 0:
+                    logger.info(f"Successfully extracted {len(claims)} claims")
+                    break
+                    
+            except Exception as e:
+                logger.error(f"Parse LLM response error {e}, response is: {response[:500]}")
+                logger.error(f"Prompt was: {messages}")
+        
+        return self._claims_or_sentences(doc, claims)
+    
+    def getclaims_batch(self, docs: list[str], docs_per_request: int = 8, num_retries: int = 3) -> list[list[str]]:
+        """Decompose several documents, docs_per_request of them per LLM call
+
+        Args:
+            docs (list[str]): the documents to be decomposed into claims
+            docs_per_request (int, optional): documents sent together in one request. Defaults to 8.
+            num_retries (int, optional): attempts per request; documents still missing
+                afterwards are decomposed one by one with getclaims. Defaults to 3.
+
+        Returns:
+            list: one list of claims per document, in the order of docs
+        """
+        results = []
+        for start in range(0, len(docs), max(1, docs_per_request)):
+            results.extend(self._getclaims_chunk(docs[start : start + docs_per_request], num_retries))
+        return results
+
+    def _getclaims_chunk(self, docs: list[str], num_retries: int) -> list[list[str]]:
+        """Decompose a chunk of documents with one batched request per attempt."""
+        batched_prompt = getattr(self.prompt, "decompose_prompt_batched", None)
+        if len(docs) == 1 or batched_prompt is None:
+            return [self.getclaims(doc, num_retries=num_retries) for doc in docs]
+
+        # Numbered one per line, so newlines inside a document are flattened
+        listing = "\n".join(f"[{k}] {' '.join(doc.split())}" for k, doc in enumerate(docs, start=1))
+        messages = self.llm_client.construct_message_list([batched_prompt.format(docs=listing).strip()])
+        max_output_tokens = sum(self._decompose_output_tokens(doc) for doc in docs)
+
+        claims_by_doc = {}
+        for i in range(num_retries):
+            response = ""
+            try:
+                response = self.llm_client.call(
+                    messages=messages,
+                    num_retries=1,
+                    seed=42 + i,
+                    max_output_tokens=max_output_tokens,
+                )
+                parsed = loads_json(self._clean_json_response(response))
+                for k in range(1, len(docs) + 1):
+                    entry = parsed.get(str(k))
+                    claims = entry.get("claims") if isinstance(entry, dict) else None
+                    if isinstance(claims, list) and len(claims) > 0:
+                        claims_by_doc.setdefault(k, claims)
+                if len(claims_by_doc) == len(docs):
+                    break
+            except Exception as e:
+                logger.error(f"Parse LLM response error {e}, response is: {response[:500]}")
+
+        logger.info(f"Batched decomposition extracted claims for {len(claims_by_doc)}/{len(docs)} documents")
+        return [
+            claims_by_doc[k] if k in claims_by_doc else self.getclaims(doc, num_retries=1)
+            for k, doc in enumerate(docs, start=1)
+        ]
+
+    async def agetclaims(self, doc: str, num_retries: int = 3, prompt: str = None) -> list[str]:
+        """Async getclaims, so many documents can be decomposed concurrently
+        (e.g. with asyncio.gather); each LLM call runs in a worker thread
+        
+        Args:
+            doc (str): the document to be decomposed into claims
+            num_retries (int, optional): maximum attempts for LLM to decompose the document into claims. Defaults to 3.
+        
+        Returns:
+            list: a list of claims
+        """
+        claims = None
+        messages = self._decompose_messages(doc, prompt)
+        
+        for i in range(num_retries):
+            response = ""
+            try:
+                # The sync client in a worker thread, never the SDK's async API: its
+                # gRPC channel is bound to the first event loop, and callers may run
+                # this under a fresh asyncio.run each time
+                response = await asyncio.to_thread(
+                    self.llm_client.call,
+                    messages=messages,
+                    num_retries=1,
+                    seed=42 + i,
+                    max_output_tokens=self._decompose_output_tokens(doc),
+                )
+                claims = self._parse_claims(response)
                 
                 if isinstance(claims, list) and len(claims) > 0:
                     logger.info(f"Successfully extracted {len(claims)} claims")
@@ -92,6 +254,66 @@ class Decompose:
                 logger.error(f"Parse LLM response error {e}, response is: {response[:500]}")
                 logger.error(f"Prompt was: {messages}")
         
+        return self._claims_or_sentences(doc, claims)
+    
+    def iter_claims(self, doc: str, prompt: str = None) -> Iterator[str]:
+        """Stream the decomposition and yield each claim as soon as it has fully arrived,
+        so downstream steps can start before the whole response is generated
+        
+        Falls back to getclaims when the client cannot stream or the stream fails before
+        any claim was decoded.
+        
+        Args:
+            doc (str): the document to be decomposed into claims
+        
+        Yields:
+            str: claims in response order
+        """
+        if not hasattr(self.llm_client, "_stream"):
+            yield from self.getclaims(doc, num_retries=1, prompt=prompt)
+            return
+        
+        messages = self._decompose_messages(doc, prompt)
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = None  # index of the next claim once the "claims" array has opened
+        num_claims = 0
+        try:
+            for chunk in self.llm_client._stream(messages):
+                buffer += chunk
+                if pos is None:
+                    match = _CLAIMS_ARRAY_RE.search(buffer)
+                    if match is None:
+                        continue
+                    pos = match.end()
+                while True:
+                    pos = _ARRAY_SEPARATOR_RE.match(buffer, pos).end()
+                    if pos >= len(buffer) or buffer[pos] == "]":
+                        break
+                    try:
+                        claim, pos = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        break  # claim not complete yet
+                    if isinstance(claim, str) and claim:
+                        num_claims += 1
+                        yield claim
+        except Exception as e:
+            if num_claims:
+                raise
+            logger.warning(f"Streaming decomposition failed ({e}), retrying without streaming")
+            yield from self.getclaims(doc, num_retries=1, prompt=prompt)
+            return
+        
+        if not num_claims:
+            try:
+                claims = self._parse_claims(buffer)
+            except Exception as e:
+                logger.error(f"Parse LLM response error {e}, response is: {buffer[:500]}")
+                claims = None
+            yield from self._claims_or_sentences(doc, claims)
+    
+    def _claims_or_sentences(self, doc: str, claims) -> list[str]:
+        """Return the LLM claims, or the document's sentences if there are none."""
         if isinstance(claims, list) and len(claims) > 0:
             return claims
         else:
@@ -99,6 +321,88 @@ class Decompose:
             claims = self.doc2sent(doc)
             return claims
     
+    def restore_spans(self, doc: str, claim2doc: dict) -> tuple[dict[str, dict], bool]:
+        """Locate each claim's text span in the document and make the spans contiguous
+        
+        Args:
+            doc (str): the original document
+            claim2doc (dict): a dictionary of claims and the text spans the LLM copied from the document
+        
+        Returns:
+            tuple: ({claim: {"text", "start", "end"}}, whether every span was found without adjustment)
+        """
+        claim2doc_detail = {}
+        flag = True
+        
+        # Claims come in document order, so each span is searched from the end of the
+        # previous match, falling back to its first occurrence
+        occurrences = None
+        if ahocorasick is not None and len(claim2doc) > 1:
+            # One pass over the document for all spans instead of one scan per span
+            occurrences = self._find_occurrences(doc, set(claim2doc.values()))
+        
+        search_from = 0
+        for claim, sent in claim2doc.items():
+            if occurrences is not None:
+                starts = occurrences.get(sent, [])
+                later = bisect.bisect_left(starts, search_from)
+                st = starts[later] if later < len(starts) else (starts[0] if starts else -1)
+            else:
+                st = doc.find(sent, search_from)
+                if st == -1:
+                    st = doc.find(sent)
+            if st != -1:
+                end = st + len(sent)
+                search_from = end
+                claim2doc_detail[claim] = {"text": sent, "start": st, "end": end}
+            else:
+                flag = False
+        
+        cur_pos = -1
+        for v in claim2doc_detail.values():
+            start, end = v["start"], v["end"]
+            adjusted = True
+            if start < cur_pos + 1 and end > cur_pos:
+                start = cur_pos + 1
+            elif start < cur_pos + 1 and end <= cur_pos:
+                start = end
+            elif start > cur_pos + 1:
+                start = cur_pos + 1
+            else:
+                adjusted = False
+            
+            if adjusted:
+                flag = False
+                # Unadjusted spans already hold doc[start:end], so only these are re-sliced
+                v["start"] = start
+                v["text"] = doc[start:end]
+            cur_pos = end
+        
+        return claim2doc_detail, flag
+
+    @staticmethod
+    def _find_occurrences(doc: str, spans: set) -> dict[str, list[int]]:
+        """Start indices of every occurrence of each span in doc, found in one pass with Aho-Corasick
+        
+        Returns:
+            dict: {span: ascending start indices} for the spans that occur in doc
+        """
+        occurrences = {}
+        automaton = ahocorasick.Automaton()
+        for span in spans:
+            if span:
+                automaton.add_word(span, span)
+            else:
+                occurrences[span] = [0]
+        if len(automaton) == 0:
+            return occurrences
+        
+        automaton.make_automaton()
+        # Matches come in order of end index, so each span's starts are ascending
+        for end, span in automaton.iter(doc):
+            occurrences.setdefault(span, []).append(end - len(span) + 1)
+        return occurrences
+
     def restore_claims(self, doc: str, claims: list, num_retries: int = 3, prompt: str = None) -> dict[str, dict]:
         """Use LLM to map claims back to the document
         
@@ -110,37 +414,8 @@ class Decompose:
         Returns:
             dict: a dictionary of claims and their corresponding text spans and start/end indices.
         """
-        def restore(claim2doc):
-            claim2doc_detail = {}
-            flag = True
-            
-            for claim, sent in claim2doc.items():
-                st = doc.find(sent)
-                if st != -1:
-                    claim2doc_detail[claim] = {"text": sent, "start": st, "end": st + len(sent)}
-                else:
-                    flag = False
-            
-            cur_pos = -1
-            texts = []
-            for k, v in claim2doc_detail.items():
-                if v["start"] < cur_pos + 1 and v["end"] > cur_pos:
-                    v["start"] = cur_pos + 1
-                    flag = False
-                elif v["start"] < cur_pos + 1 and v["end"] <= cur_pos:
-                    v["start"] = v["end"]  
-                    flag = False
-                elif v["start"] > cur_pos + 1:
-                    v["start"] = cur_pos + 1
-                    flag = False
-                
-                v["text"] = doc[v["start"] : v["end"]]
-                texts.append(v["text"])
-                claim2doc_detail[k] = v
-                cur_pos = v["end"]
-            
-            return claim2doc_detail, flag
-        
+        # The response is keyed by claim, so repeated claims collapse into one entry anyway
+        claims = list(dict.fromkeys(claims))
         if prompt is None:
             user_input = self.prompt.restore_prompt.format(doc=doc, claims=claims).strip()
         else:
@@ -150,24 +425,25 @@ class Decompose:
         tmp_restore = {}
         
         for i in range(num_retries):
+            response = ""
             try:
                 response = self.llm_client._call(
                     messages=messages,
                     num_retries=1,
                     seed=42 + i,
+                    # The response copies each claim's source span out of the document
+                    max_output_tokens=2000 + len(doc) // 2,
                 )
                 
                 # Clean and parse JSON
                 cleaned_response = self._clean_json_response(response)
                 
-                try:
-                    claim2doc = json.loads(cleaned_response)
-                except json.JSONDecodeError:
-                    logger.warning(f"JSON decode failed for restore_claims, trying eval")
-                    claim2doc = eval(cleaned_response)
+                claim2doc = loads_json(cleaned_response)
                 
-                assert len(claim2doc) == len(claims)
-                claim2doc_detail, flag = restore(claim2doc)
+                # Explicit check rather than assert, which python -O would strip
+                if len(claim2doc) != len(claims):
+                    raise ValueError(f"Claim count mismatch: {len(claim2doc)} spans for {len(claims)} claims")
+                claim2doc_detail, flag = self.restore_spans(doc, claim2doc)
                 
                 if flag:
                     return claim2doc_detail
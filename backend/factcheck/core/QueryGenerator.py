@@ -1,4 +1,7 @@
+import asyncio
+from typing import Hashable, Iterable
 from factcheck.utils.logger import CustomLogger
+from factcheck.utils.utils import loads_json
 
 logger = CustomLogger(__name__).getlog()
 
@@ -30,35 +33,153 @@ class QueryGenerator:
 
         while (attempts < generating_time) and (len(generated_questions) < len(claims)):
             try:
-                # Create a single prompt with all claims
-                if prompt is None:
-                    user_input = self._create_batch_prompt(claims)
-                else:
-                    user_input = prompt.format(claims=claims)
-                
                 # Use single call instead of multi_call
-                messages = self.llm_client.construct_message_list([user_input])[0]
-                response = self.llm_client.call([messages])
-                
-                # Parse the response
-                parsed_response = eval(response)
+                messages = self._query_messages(claims, prompt)
+                response = self.llm_client.call([messages], max_output_tokens=self._query_output_tokens(len(claims)))
+                self._collect_questions(claims, response, generated_questions)
                 
-                # Extract questions for each claim
-                for claim in claims:
-                    if claim in parsed_response and claim not in generated_questions:
-                        generated_questions[claim] = parsed_response[claim]
+            except Exception as e:
+                logger.info(f"Warning: LLM response parse fail, retry {attempts}. Error: {e}")
+            
+            attempts += 1
+
+        return self._claim_query_dict(claims, generated_questions)
+
+    async def agenerate_query(self, claims: list[str], generating_time: int = 3, prompt: str = None) -> dict[str, list[str]]:
+        """Async generate_query, so it can be gathered with other pipeline steps
+
+        Args:
+            claims ([str]): a list of claims to generate questions for.
+            generating_time (int, optional): maximum attempts for GPT to generate questions. Defaults to 3.
+
+        Returns:
+            dict: a dictionary of claims and their corresponding generated questions.
+        """
+        generated_questions = {}
+        attempts = 0
+
+        while (attempts < generating_time) and (len(generated_questions) < len(claims)):
+            try:
+                messages = self._query_messages(claims, prompt)
+                # The sync client in a worker thread: check_text runs this under a fresh
+                # asyncio.run per call, and the SDK's async gRPC channel stays bound to
+                # the first (closed) loop on a shared client
+                response = await asyncio.to_thread(
+                    self.llm_client.call, [messages], max_output_tokens=self._query_output_tokens(len(claims))
+                )
+                self._collect_questions(claims, response, generated_questions)
                 
             except Exception as e:
                 logger.info(f"Warning: LLM response parse fail, retry {attempts}. Error: {e}")
             
             attempts += 1
 
+        return self._claim_query_dict(claims, generated_questions)
+
+    def generate_query_bulk(
+        self,
+        doc_claims: Iterable[tuple[Hashable, str]],
+        claims_per_request: int = 16,
+        generating_time: int = 3,
+    ) -> dict[Hashable, dict[str, list[str]]]:
+        """Generate questions for claims of many documents, several documents' claims per LLM call
+
+        Args:
+            doc_claims (iterable): (doc_id, claim) pairs
+            claims_per_request (int, optional): claims marshalled into one request. Defaults to 16.
+            generating_time (int, optional): attempts for claims missing from a response. Defaults to 3.
+
+        Returns:
+            dict: {doc_id: {claim: [questions]}}
+        """
+        doc_claims = list(doc_claims)
+        generated_questions = {}
+
+        for start in range(0, len(doc_claims), max(1, claims_per_request)):
+            chunk = doc_claims[start : start + claims_per_request]
+            try:
+                messages = self.llm_client.construct_message_list([self._create_bulk_prompt(chunk)])[0]
+                parsed_response = loads_json(
+                    self.llm_client.call([messages], max_output_tokens=self._query_output_tokens(len(chunk)))
+                )
+                for doc_id, claim in chunk:
+                    questions = parsed_response.get(f"{doc_id}::{claim}")
+                    if isinstance(questions, list):
+                        generated_questions[(doc_id, claim)] = questions
+            except Exception as e:
+                logger.info(f"Warning: bulk query generation failed for {len(chunk)} claims. Error: {e}")
+
+            # Retry only the claims the response missed, as one regular batch
+            missing = list(dict.fromkeys(claim for doc_id, claim in chunk if (doc_id, claim) not in generated_questions))
+            if missing:
+                retried = self.generate_query(missing, generating_time=generating_time)
+                for doc_id, claim in chunk:
+                    if (doc_id, claim) not in generated_questions:
+                        generated_questions[(doc_id, claim)] = retried[claim][1:]
+
+        claim_query_dict = {}
+        for doc_id, claim in doc_claims:
+            questions = generated_questions.get((doc_id, claim), [])
+            claim_query_dict.setdefault(doc_id, {})[claim] = [claim] + questions[:(self.max_query_per_claim - 1)]
+        return claim_query_dict
+
+    def _create_bulk_prompt(self, doc_claims: list[tuple[Hashable, str]]) -> str:
+        """Create a prompt for generating questions for claims of several documents at once"""
+        claims_formatted = "\n".join([f"{i+1}. {doc_id}::{claim}" for i, (doc_id, claim) in enumerate(doc_claims)])
+        
+        bulk_prompt = f"""Task: Create the minimum number of questions needed to verify the correctness of each given claim.
+
+    Instructions:
+    1. Generate only essential questions to verify each claim
+    2. Questions should be specific and directly related to the claim
+    3. Each claim is prefixed with its document id as "<id>::<claim>"
+    4. Output in JSON format where each key is the full "<id>::<claim>" text exactly as given and the value is a list of questions
+
+    Claims:
+    {claims_formatted}
+
+    Output format:
+    {{
+    "<id>::claim text 1": ["question"],
+    "<id>::claim text 2": ["question"],
+    ...
+    }}
+
+    Output:
+    """
+        return bulk_prompt
+
+    @staticmethod
+    def _query_output_tokens(num_claims: int) -> int:
+        """Response length cap for generating questions for num_claims claims."""
+        return 800 + 100 * num_claims
+
+    def _query_messages(self, claims: list[str], prompt: str = None):
+        """Build the request messages asking for questions for all claims at once."""
+        # Create a single prompt with all claims
+        if prompt is None:
+            user_input = self._create_batch_prompt(claims)
+        else:
+            user_input = prompt.format(claims=claims)
+        return self.llm_client.construct_message_list([user_input])[0]
+
+    @staticmethod
+    def _collect_questions(claims: list[str], response: str, generated_questions: dict) -> None:
+        """Add the questions in response for claims that don't have any yet."""
+        # Parse the response
+        parsed_response = loads_json(response)
+        
+        # Extract questions for each claim
+        for claim in claims:
+            if claim in parsed_response and claim not in generated_questions:
+                generated_questions[claim] = parsed_response[claim]
+
+    def _claim_query_dict(self, claims: list[str], generated_questions: dict) -> dict[str, list[str]]:
         # Ensure that each claim has at least one question which is the claim itself
-        claim_query_dict = {
+        return {
             claim: [claim] + generated_questions.get(claim, [])[:(self.max_query_per_claim - 1)]
             for claim in claims
         }
-        return claim_query_dict
 
     def _create_batch_prompt(self, claims: list[str]) -> str:
         """Create a prompt for generating questions for multiple claims at once"""
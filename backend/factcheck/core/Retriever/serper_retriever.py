@@ -1,15 +1,34 @@
+import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import re
 import bs4
 from factcheck.utils.logger import CustomLogger
-from factcheck.utils.web_util import crawl_web
+from factcheck.utils.web_util import acrawl_web
 
 
 logger = CustomLogger(__name__).getlog()
 
+_NEWLINES_RE = re.compile(r"\n+")
+
+# Shared session so concurrent Serper batches reuse kept-alive TLS connections.
+# Each search POST is billed (up to 100 queries per batch), so it is only retried
+# when the connection could not be made; urllib3's default allowed_methods keeps
+# POST out of the status and read-error retries.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.2, status_forcelist=(500, 502, 503, 504)),
+    ),
+)
+
 
 class SerperEvidenceRetriever:
     def __init__(
@@ -40,7 +59,27 @@ class SerperEvidenceRetriever:
         evidence_list = self._retrieve_evidence_4_all_claim(
             query_list=query_list, top_k=top_k, snippet_extend_flag=snippet_extend_flag
         )
+        return self._group_by_claim(claim_queries_dict, evidence_list)
+
+    async def aretrieve_evidence(self, claim_queries_dict, top_k: int = 3, snippet_extend_flag: bool = True):
+        """Async variant of retrieve_evidence, for callers already running an event loop
+
+        Args:
+            claim_queries_dict (dict): a dictionary of claims and their corresponding queries.
+            top_k (int, optional): the number of top relevant results to retrieve. Defaults to 3.
+            snippet_extend_flag (bool, optional): whether to extend the snippet. Defaults to True.
+
+        Returns:
+            dict: a dictionary of claims and their corresponding evidences.
+        """
+        logger.info("Collecting evidences ...")
+        query_list = [y for x in claim_queries_dict.items() for y in x[1]]
+        evidence_list = await self._aretrieve_evidence_4_all_claim(
+            query_list=query_list, top_k=top_k, snippet_extend_flag=snippet_extend_flag
+        )
+        return self._group_by_claim(claim_queries_dict, evidence_list)
 
+    def _group_by_claim(self, claim_queries_dict, evidence_list):
         i = 0
         claim_evidence_dict = {}
         for claim, queries in claim_queries_dict.items():
@@ -68,15 +107,26 @@ class SerperEvidenceRetriever:
         Returns:
             list[list[]]: a list of [a list of evidences for each given query].
         """
+        return asyncio.run(
+            self._aretrieve_evidence_4_all_claim(query_list, top_k=top_k, snippet_extend_flag=snippet_extend_flag)
+        )
 
+    async def _aretrieve_evidence_4_all_claim(
+        self, query_list: list[str], top_k: int = 3, snippet_extend_flag: bool = True
+    ) -> list[list[str]]:
         # init the evidence list with None
         evidences = [[] for _ in query_list]
 
-        # get the response from serper
+        # get the response from serper, sending the batches of 100 queries concurrently
+        batch_query_lists = [query_list[i : i + 100] for i in range(0, len(query_list), 100)]
+        if not batch_query_lists:
+            return evidences
+        batch_responses = await asyncio.gather(
+            *(asyncio.to_thread(self._request_serper_api, batch) for batch in batch_query_lists)
+        )
+
         serper_responses = []
-        for i in range(0, len(query_list), 100):
-            batch_query_list = query_list[i : i + 100]
-            batch_response = self._request_serper_api(batch_query_list)
+        for batch_response in batch_responses:
             if batch_response is None:
                 logger.error("Serper API request error!")
                 return evidences
@@ -111,7 +161,7 @@ class SerperEvidenceRetriever:
 
                 if (len(_snippet_to_check) == 0) or (not snippet_extend_flag):
                     evidences[i] += [
-                        {"text": re.sub(r"\n+", "\n", _result["snippet"]), "url": _result["link"]} for _result in topk_results
+                        {"text": _NEWLINES_RE.sub("\n", _result["snippet"]), "url": _result["link"]} for _result in topk_results
                     ]
 
                 url_to_date.update({_result.get("link"): _result.get("date") for _result in topk_results})
@@ -124,7 +174,7 @@ class SerperEvidenceRetriever:
             return evidences
 
         # crawl web for queries without answer box
-        responses = crawl_web(query_url_dict)
+        responses = await acrawl_web(query_url_dict)
 
         flag_to_check = [_item[0] for _item in responses]
         response_to_check = [_item[1] for _item in responses]
@@ -158,30 +208,22 @@ class SerperEvidenceRetriever:
             else:
                 return snippet
 
-        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-            _extended_snippet = list(
-                executor.map(
-                    lambda _r, _s, _f: bs4_parse_text(_r, _s, _f),
-                    response_to_check,
-                    _snippet_to_check,
-                    flag_to_check,
-                )
-            )
+        def parse_all():
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                return list(executor.map(bs4_parse_text, response_to_check, _snippet_to_check, flag_to_check))
 
-        # merge the snippets by query
-        query_snippet_url_dict = {}
+        _extended_snippet = await asyncio.to_thread(parse_all)
+
+        # map each query to its first position once instead of scanning query_list per query
+        query_index_dict = {}
+        for _index, _query in enumerate(query_list):
+            query_index_dict.setdefault(_query, _index)
+
+        # extend the evidence list for each query in a single pass over the snippets
         for _query, _url, _snippet in zip(query_to_check, url_to_check, _extended_snippet):
-            _snippet_url_list = query_snippet_url_dict.get(_query, [])
-            _snippet_url_list.append((_snippet, _url))
-            query_snippet_url_dict[_query] = _snippet_url_list
-
-        # extend the evidence list for each query
-        for _query in query_snippet_url_dict.keys():
-            _query_index = query_list.index(_query)
-            _snippet_url_list = query_snippet_url_dict[_query]
-            evidences[_query_index] += [
-                {"text": re.sub(r"\n+", "\n", snippet), "url": _url} for snippet, _url in _snippet_url_list
-            ]
+            evidences[query_index_dict[_query]].append(
+                {"text": _NEWLINES_RE.sub("\n", _snippet), "url": _url}
+            )
 
         return evidences
 
@@ -204,7 +246,7 @@ class SerperEvidenceRetriever:
         questions_data = [{"q": question, "autocorrect": False} for question in questions]
         payload = json.dumps(questions_data)
         response = None
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = _SESSION.post(url, headers=headers, data=payload, timeout=30)
 
         if response.status_code == 200:
             return response
@@ -2,4 +2,6 @@ from .Decompose import Decompose
 from .CheckWorthy import Checkworthy
 from .QueryGenerator import QueryGenerator
 from .Retriever import retriever_mapper
-from .ClaimVerify import ClaimVerify
\ No newline at end of file
+from .ClaimVerify import ClaimVerify
+from .semantic_cache import SemanticClaimCache
+from .verdict_cache import VerdictCache
@@ -0,0 +1,180 @@
+import threading
+import time
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+import google.generativeai as genai
+import numpy as np
+
+from factcheck.utils.logger import CustomLogger
+
+logger = CustomLogger(__name__).getlog()
+
+DEFAULT_EMBEDDING_MODEL = "models/gemini-embedding-001"
+
+
+def embed_claims(claims: List[str], embedding_model: str = DEFAULT_EMBEDDING_MODEL) -> np.ndarray:
+    """Embed claims in one request and L2-normalize them
+
+    Args:
+        claims (list[str]): claims to embed
+        embedding_model (str, optional): Gemini embedding model
+
+    Returns:
+        np.ndarray: (len(claims), dim) float32 matrix of unit vectors
+    """
+    response = genai.embed_content(
+        model=embedding_model,
+        content=claims,
+        task_type="semantic_similarity",
+    )
+    embeddings = np.asarray(response["embedding"], dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def cluster_claims(embeddings: np.ndarray, threshold: float = 0.9) -> List[Tuple[int, List[int]]]:
+    """Greedily group near-duplicate claims by cosine similarity
+
+    Each unassigned claim, in order, seeds a cluster with every unassigned claim at
+    least `threshold` similar to it. The representative is the member with the
+    highest mean similarity to the rest of its cluster.
+
+    Args:
+        embeddings (np.ndarray): (n, dim) L2-normalized embeddings
+        threshold (float, optional): minimum cosine similarity to the seed. Defaults to 0.9.
+
+    Returns:
+        list[tuple[int, list[int]]]: (representative index, member indices) per cluster
+    """
+    similarities = embeddings @ embeddings.T
+    assigned = np.zeros(len(embeddings), dtype=bool)
+    clusters = []
+    for seed in range(len(embeddings)):
+        if assigned[seed]:
+            continue
+        members = np.flatnonzero(~assigned & (similarities[seed] >= threshold))
+        members = np.union1d(members, [seed])
+        assigned[members] = True
+        representative = members[similarities[np.ix_(members, members)].mean(axis=1).argmax()]
+        clusters.append((int(representative), members.tolist()))
+    return clusters
+
+
+class SemanticClaimCache:
+    """Claim-level cache of evidences and verifications, looked up by embedding similarity.
+
+    Paraphrases of an already verified claim (e.g. "Paris is France's capital" and
+    "The capital of France is Paris") reuse the cached evidences and verdicts, which
+    skips evidence retrieval and verification for that claim.
+    """
+
+    def __init__(
+        self,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+        threshold: float = 0.92,
+        ttl: float = 24 * 3600,
+        max_entries: int = 5000,
+    ):
+        """Initialize the SemanticClaimCache class
+
+        Args:
+            embedding_model (str, optional): Gemini embedding model. Uses the API key configured for the pipeline.
+            threshold (float, optional): minimum cosine similarity for a cache hit. Defaults to 0.92.
+            ttl (float, optional): seconds an entry stays valid. Defaults to one day.
+            max_entries (int, optional): maximum number of cached claims. Defaults to 5000.
+        """
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # Row i of the matrix is the L2-normalized embedding of entries[i]
+        self._matrix = None
+        self._entries = []  # (timestamp, evidences, verifications)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def embed(self, claims: List[str]) -> np.ndarray:
+        """Embed claims in one request and L2-normalize them
+
+        Args:
+            claims (list[str]): claims to embed
+
+        Returns:
+            np.ndarray: (len(claims), dim) float32 matrix of unit vectors
+        """
+        return embed_claims(claims, self.embedding_model)
+
+    def lookup(self, claims: List[str]) -> Tuple[Optional[np.ndarray], Dict[str, tuple]]:
+        """Find cached results for claims
+
+        Args:
+            claims (list[str]): claims to look up
+
+        Returns:
+            tuple: (embeddings of the claims or None if embedding failed,
+                    {claim: (evidences, verifications)} for the cache hits)
+        """
+        if not claims:
+            return None, {}
+
+        try:
+            embeddings = self.embed(claims)
+        except Exception as e:
+            logger.error(f"Claim embedding failed, skipping semantic cache: {e}")
+            return None, {}
+
+        hits = {}
+        with self._lock:
+            if self._matrix is not None and len(self._entries) > 0:
+                similarities = embeddings @ self._matrix.T
+                best = similarities.argmax(axis=1)
+                now = time.monotonic()
+                for claim, row, idx in zip(claims, similarities, best):
+                    timestamp, evidences, verifications = self._entries[idx]
+                    if row[idx] >= self.threshold and now - timestamp < self.ttl:
+                        hits[claim] = (
+                            evidences,
+                            [replace(v, claim=claim) for v in verifications],
+                        )
+
+            self.stats["hits"] += len(hits)
+            self.stats["misses"] += len(claims) - len(hits)
+
+        logger.info(f"Semantic cache: {len(hits)} hits, {len(claims) - len(hits)} misses (total {self.stats})")
+        return embeddings, hits
+
+    def add(
+        self,
+        embeddings: np.ndarray,
+        evidences_list: List[list],
+        verifications_list: List[list],
+    ) -> None:
+        """Cache verified claims
+
+        Args:
+            embeddings (np.ndarray): (n, dim) normalized embeddings returned by lookup
+            evidences_list (list[list]): retrieved evidences per claim
+            verifications_list (list[list]): Evidence verification objects per claim
+        """
+        if embeddings is None or len(embeddings) == 0:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            # Drop expired entries, then the oldest ones beyond max_entries
+            keep = [i for i, entry in enumerate(self._entries) if now - entry[0] < self.ttl]
+            entries = [self._entries[i] for i in keep]
+            matrix = self._matrix[keep] if self._matrix is not None else embeddings[:0]
+
+            entries += [(now, ev, vf) for ev, vf in zip(evidences_list, verifications_list)]
+            matrix = np.concatenate([matrix, embeddings], axis=0)
+
+            overflow = len(entries) - self.max_entries
+            if overflow > 0:
+                entries = entries[overflow:]
+                matrix = matrix[overflow:]
+
+            self._entries = entries
+            self._matrix = matrix
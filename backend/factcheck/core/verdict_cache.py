@@ -0,0 +1,110 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from factcheck.utils.logger import CustomLogger
+
+logger = CustomLogger(__name__).getlog()
+
+
+class VerdictCache:
+    """Persistent cache of per-(claim, evidence) verification verdicts, backed by SQLite.
+
+    Entries are keyed by SHA-256 of the claim, the evidence text, the prompt version and
+    the model name, so changing the verification prompt or model never serves stale verdicts.
+    """
+
+    def __init__(self, path: str, prompt_version: str, model_id: str, ttl: float = 7 * 24 * 3600):
+        """Initialize the VerdictCache class
+
+        Args:
+            path (str): SQLite database file (":memory:" for a process-local cache)
+            prompt_version (str): identifier of the verification prompt, e.g. a hash of its text
+            model_id (str): name of the verification model
+            ttl (float, optional): seconds a verdict stays valid. Defaults to one week.
+        """
+        self.prompt_version = prompt_version
+        self.model_id = model_id
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, reasoning TEXT, relationship TEXT, created REAL)"
+            )
+
+    def _key(self, claim: str, evidence_text: str) -> str:
+        payload = "\x1f".join((claim, evidence_text, self.prompt_version, self.model_id))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, claim: str, evidence_texts: List[str]) -> Dict[str, Tuple[str, str]]:
+        """Look up cached verdicts of a claim's evidences
+
+        Args:
+            claim (str): the claim
+            evidence_texts (list[str]): evidence texts to look up
+
+        Returns:
+            dict: {evidence_text: (reasoning, relationship)} for the cache hits
+        """
+        if not evidence_texts:
+            return {}
+
+        keys = {self._key(claim, text): text for text in evidence_texts}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, reasoning, relationship, created FROM verdicts WHERE key IN ({placeholders})",
+                list(keys),
+            ).fetchall()
+
+            now = time.time()
+            hits = {
+                keys[key]: (reasoning, relationship)
+                for key, reasoning, relationship, created in rows
+                if now - created < self.ttl
+            }
+            self.stats["hits"] += len(hits)
+            self.stats["misses"] += len(set(evidence_texts)) - len(hits)
+        return hits
+
+    def put_many(self, claim: str, verdicts: List[Tuple[str, str, str]]) -> None:
+        """Store verdicts of a claim's evidences
+
+        Args:
+            claim (str): the claim
+            verdicts (list[tuple]): (evidence_text, reasoning, relationship) triples
+        """
+        if not verdicts:
+            return
+
+        now = time.time()
+        rows = [
+            (self._key(claim, text), reasoning, relationship, now)
+            for text, reasoning, relationship in verdicts
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO verdicts (key, reasoning, relationship, created) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def hit_rate(self) -> float:
+        """Fraction of evidence lookups served from the cache."""
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def prompt_fingerprint(prompt_text: Optional[str]) -> str:
+    """Short stable identifier of a prompt template, used as VerdictCache.prompt_version."""
+    return hashlib.sha256((prompt_text or "").encode("utf-8")).hexdigest()[:16]
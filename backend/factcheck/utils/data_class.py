@@ -1,6 +1,4 @@
-from collections import Counter
-from typing import Dict, List, Any, Optional
-from enum import Enum
+from typing import List, Optional
 from dataclasses import dataclass
 
 
@@ -10,6 +8,9 @@ class TokenUsage:
     prompt_tokens: int = 0
     completion_tokens: Optional[int] = 0
 
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
 
 @dataclass
 class PipelineUsage:
@@ -19,15 +20,22 @@ class PipelineUsage:
     evidence_crawler: TokenUsage = None
     claimverify: TokenUsage = None
 
+    def to_dict(self) -> dict:
+        return {name: (usage.to_dict() if usage is not None else None) for name, usage in self.__dict__.items()}
 
-@dataclass
+
+@dataclass(slots=True)
 class Evidence:
+    # Slotted: one instance per (claim, evidence) pair, so there can be thousands per document
     claim: str = None
     text: str = None 
     url: str = None
     reasoning: str = None
     relationship: str = None
 
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
     def attribute_check(self) -> bool:
         for field in self.__dataclass_fields__.values():
             if getattr(self, field.name) is None:
@@ -65,6 +73,12 @@ class ClaimDetail:
     evidences: List[dict] = None
     factuality: any = None
 
+    def to_dict(self) -> dict:
+        d = dict(self.__dict__)
+        if self.evidences is not None:
+            d["evidences"] = [e.to_dict() if isinstance(e, Evidence) else e for e in self.evidences]
+        return d
+
     def attribute_check(self) -> bool:
         for field in self.__dataclass_fields__.values():
             if getattr(self, field.name) is None:
@@ -99,6 +113,9 @@ class FCSummary:
     num_controversial_claims: int = None
     factuality: float = None
 
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
     def attribute_check(self) -> bool:
         for field in self.__dataclass_fields__.values():
             if getattr(self, field.name) is None:
@@ -115,6 +132,15 @@ class FactCheckOutput:
     claim_detail: List[ClaimDetail] = None
     summary: FCSummary = None
 
+    def to_dict(self) -> dict:
+        """Convert to plain dicts/lists without the recursive deep copy done by dataclasses.asdict."""
+        return {
+            **self.__dict__,
+            "usage": self.usage.to_dict() if self.usage is not None else None,
+            "claim_detail": [c.to_dict() for c in self.claim_detail] if self.claim_detail is not None else None,
+            "summary": self.summary.to_dict() if self.summary is not None else None,
+        }
+
     def attribute_check(self) -> bool:
         for field in self.__dataclass_fields__.values():
             if getattr(self, field.name) is None:
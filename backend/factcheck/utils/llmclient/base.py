@@ -1,11 +1,45 @@
 import time
 import asyncio
+import contextlib
+import contextvars
+import threading
 from abc import abstractmethod
-from functools import partial
 from collections import deque
+from typing import Dict, Optional
 
 from ..data_class import TokenUsage
 
+# Token usage of the pipeline run in progress, keyed by id(client). Clients are
+# shared by concurrent runs, so per-run counts follow the caller's context
+# instead of living on the client.
+_RUN_USAGE: contextvars.ContextVar[Optional[Dict[int, TokenUsage]]] = contextvars.ContextVar(
+    "llm_run_usage", default=None
+)
+_USAGE_LOCK = threading.Lock()
+
+
+@contextlib.contextmanager
+def track_run_usage():
+    """Collect the token usage of every LLM call made in this context.
+
+    Worker threads only report into the run if they were started with a copy of
+    the caller's context (asyncio.to_thread, or contextvars.copy_context().run).
+
+    Yields:
+        Dict mapping id(client) to that client's TokenUsage for this run
+    """
+    run_usage = {}
+    token = _RUN_USAGE.set(run_usage)
+    try:
+        yield run_usage
+    finally:
+        _RUN_USAGE.reset(token)
+
+
+def current_run_usage() -> Optional[Dict[int, TokenUsage]]:
+    """The usage dict of the enclosing track_run_usage block, or None."""
+    return _RUN_USAGE.get()
+
 
 class BaseClient:
     def __init__(
@@ -14,11 +48,14 @@ class BaseClient:
         api_config: dict,
         max_requests_per_minute: int,
         request_window: int,
+        max_tokens_per_minute: int = None,
     ) -> None:
         self.model = model
         self.api_config = api_config
         self.max_requests_per_minute = max_requests_per_minute
         self.request_window = request_window
+        # Optional prompt-token budget per window, measured with get_request_length
+        self.max_tokens_per_minute = max_tokens_per_minute
         self.traffic_queue = deque()
         self.total_traffic = 0
         self.usage = TokenUsage(model=model)
@@ -37,8 +74,22 @@ class BaseClient:
         return self.usage
 
     def reset_usage(self):
-        self.usage.prompt_tokens = 0
-        self.usage.completion_tokens = 0
+        with _USAGE_LOCK:
+            self.usage.prompt_tokens = 0
+            self.usage.completion_tokens = 0
+
+    def _add_usage(self, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        """Add tokens to the client's running totals and to the current run, if tracked."""
+        run_usage = _RUN_USAGE.get()
+        with _USAGE_LOCK:
+            self.usage.prompt_tokens += prompt_tokens
+            self.usage.completion_tokens += completion_tokens
+            if run_usage is not None:
+                usage = run_usage.get(id(self))
+                if usage is None:
+                    usage = run_usage[id(self)] = TokenUsage(model=self.model)
+                usage.prompt_tokens += prompt_tokens
+                usage.completion_tokens += completion_tokens
 
     @abstractmethod
     def construct_message_list(self, prompt_list: list[str]) -> list[str]:
@@ -58,7 +109,7 @@ class BaseClient:
         r = ""
         for _ in range(num_retries):
             try:
-                r = self._call(messages[0], seed=seed)
+                r = self._call(messages[0], **{**kwargs, "seed": seed})
                 break
             except Exception as e:
                 print(f"Error LLM Client call: {e} Retrying...")
@@ -73,15 +124,20 @@ class BaseClient:
 
     async def _async_call(self, messages: list, **kwargs):
         """Calls ChatGPT asynchronously, tracks traffic, and enforces rate limits."""
-        while len(self.traffic_queue) >= self.max_requests_per_minute:
+        request_length = self.get_request_length(messages)
+        while len(self.traffic_queue) >= self.max_requests_per_minute or (
+            self.max_tokens_per_minute
+            and self.traffic_queue
+            and self.total_traffic + request_length > self.max_tokens_per_minute
+        ):
             await asyncio.sleep(1)
             self._expire_old_traffic()
 
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(None, partial(self._call, messages, **kwargs))
+        # to_thread copies the context, so the call's usage is counted for this run
+        response = await asyncio.to_thread(self._call, messages, **kwargs)
 
-        self.total_traffic += self.get_request_length(messages)
-        self.traffic_queue.append((time.time(), self.get_request_length(messages)))
+        self.total_traffic += request_length
+        self.traffic_queue.append((time.monotonic(), request_length))
 
         return response
 
@@ -94,6 +150,6 @@ class BaseClient:
 
     def _expire_old_traffic(self):
         """Expires traffic older than the request window."""
-        current_time = time.time()
+        current_time = time.monotonic()
         while self.traffic_queue and self.traffic_queue[0][0] + self.request_window < current_time:
             self.total_traffic -= self.traffic_queue.popleft()[1]
@@ -1,8 +1,56 @@
+import datetime
+import hashlib
+import threading
 import time
 import json
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import google.generativeai as genai
+from google.api_core.exceptions import ResourceExhausted
 from .base import BaseClient
+from ..logger import CustomLogger
+from ..sliding_window import acquire as acquire_rate_limit
+
+logger = CustomLogger(__name__).getlog()
+
+# Sent as the model's system instruction so every request starts with the same
+# prefix, which lets Gemini's implicit prompt caching reuse it across calls
+DEFAULT_SYSTEM_INSTRUCTION = "You are a helpful assistant designed to output JSON."
+
+# Process-wide LRU of response texts, shared by every GeminiClient that enables it:
+# sha256 key -> (timestamp, text)
+_RESPONSE_CACHE = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+# Explicit context caches of static prompt prefixes, shared across clients:
+# (api key, model, system instruction, prefix) -> (expires_at, cached model or None)
+_CONTEXT_CACHES = {}
+_CONTEXT_CACHES_LOCK = threading.Lock()
+# Per-key locks held while a context cache is being created, outside _CONTEXT_CACHES_LOCK
+_CONTEXT_CACHE_CREATE_LOCKS = {}
+# Recreate a cache this many seconds before the server drops it
+CONTEXT_CACHE_REFRESH_MARGIN = 30
+
+# Key last passed to genai.configure. Reconfiguring discards the SDK's cached
+# transport clients, so repeated calls with the same key are skipped
+_CONFIGURED_KEY = None
+_CONFIGURE_LOCK = threading.Lock()
+
+# (prefix, suffix) wrapped around non-user message content in the combined prompt
+_ROLE_FORMAT = {
+    "system": ("System Instructions: ", "\n"),
+    "assistant": ("Assistant: ", "\n"),
+}
+
+
+def configure_genai(api_key: str) -> None:
+    """Point google.generativeai at api_key, keeping its open connections when the key is unchanged."""
+    global _CONFIGURED_KEY
+    with _CONFIGURE_LOCK:
+        if api_key != _CONFIGURED_KEY:
+            genai.configure(api_key=api_key)
+            _CONFIGURED_KEY = api_key
 
 
 class GeminiClient(BaseClient):
@@ -19,6 +67,12 @@ class GeminiClient(BaseClient):
         api_config: dict = None,
         max_requests_per_minute: int = 8,
         request_window: int = 60,
+        system_instruction: str = DEFAULT_SYSTEM_INSTRUCTION,
+        response_cache_ttl: float = 0,
+        temperature: float = 0.0,
+        top_p: float = 1.0,
+        context_cache_ttl: float = 0,
+        cached_prefixes: Iterable[str] = (),
     ):
         """
         Initialize the Gemini client.
@@ -27,8 +81,19 @@ class GeminiClient(BaseClient):
             model: Gemini model name (default: "gemini-2.5-flash")
                    Options: "gemini-2.5-flash", "gemini-2.5-pro", "gemini-2.5-flash-8b"
             api_config: Configuration dict with GEMINI_API_KEY
-            max_requests_per_minute: Rate limit (default: 60 for free tier)
+            max_requests_per_minute: Per-key rate limit, shared by all clients using the key
             request_window: Time window in seconds for rate limiting
+            system_instruction: Fixed system prompt pinned on the model; matching
+                                system messages are not repeated in the prompt body
+            response_cache_ttl: Seconds a response is reused for an identical request
+                                (same model, config, prompt and seed); 0 disables the cache
+            temperature: Sampling temperature (default 0.0, deterministic and cacheable);
+                         raise it for callers that want diverse retries
+            top_p: Nucleus sampling mass (default 1.0)
+            context_cache_ttl: Seconds a server-side context cache of a static prompt
+                               prefix lives; 0 disables explicit context caching
+            cached_prefixes: Static prompt prefixes (instructions and few-shot examples)
+                             to cache; prompts starting with one only send the rest
         """
         super().__init__(model, api_config, max_requests_per_minute, request_window)
         
@@ -37,20 +102,27 @@ class GeminiClient(BaseClient):
             raise ValueError("GEMINI_API_KEY not found in api_config. Get one from https://aistudio.google.com/")
         
         # Configure Gemini API
-        genai.configure(api_key=self.api_config["GEMINI_API_KEY"])
+        configure_genai(self.api_config["GEMINI_API_KEY"])
         
         # Initialize the model with JSON mode
         generation_config = {
-            "temperature": 0.7,
-            "top_p": 0.95,
+            "temperature": temperature,
+            "top_p": top_p,
             "top_k": 40,
             "max_output_tokens": 16000,
             "response_mime_type": "application/json", 
         }
         
+        self.system_instruction = system_instruction
+        self.generation_config = generation_config
+        self.response_cache_ttl = response_cache_ttl
+        self.context_cache_ttl = context_cache_ttl
+        # Callers strip their formatted prompts, so match stripped prefixes
+        self.cached_prefixes = tuple(p.lstrip() for p in cached_prefixes if p.strip())
         self.client = genai.GenerativeModel(
             model_name=self.model,
             generation_config=generation_config,
+            system_instruction=system_instruction,
         )
     def _call(self, messages, **kwargs) -> str:
         """
@@ -58,7 +130,8 @@ class GeminiClient(BaseClient):
         
         Args:
             messages: A list of message dicts with 'role' and 'content'
-            **kwargs: Additional arguments (seed is accepted but not used by Gemini)
+            **kwargs: Additional arguments (seed is accepted but not used by Gemini);
+                      max_output_tokens caps the response length of this call
         
         Returns:
             JSON string response from Gemini
@@ -76,32 +149,203 @@ class GeminiClient(BaseClient):
             messages = messages[0]
         
         prompt = self._convert_messages_to_prompt(messages)
+        overrides = self._generation_overrides(kwargs.get("max_output_tokens"))
+        cache_key = self._response_cache_key(prompt, seed, overrides)
+        cached = self._response_cache_get(cache_key)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.client.generate_content(prompt)
-            
-            # Extract text from response
-            if response.candidates:
-                r = response.candidates[0].content.parts[0].text
-            else:
-                raise ValueError("No response candidates returned")
-            
-            if hasattr(response, "usage_metadata") and response.usage_metadata:
-                self._log_usage(usage_dict=response.usage_metadata)
-            else:
-                print("Warning: Gemini API usage metadata not available.")
-            
-            return r
-            
+            response = self._generate_with_backoff(prompt, generation_config=overrides)
+            text = self._extract_text(response)
         except Exception as e:
             print(f"Error calling Gemini API: {str(e)}")
             raise
+        self._response_cache_put(cache_key, text)
+        return text
+
+    def _model_for_prompt(self, prompt: str) -> Tuple[Any, str]:
+        """
+        Pick the model to send a prompt to.
+        
+        If the prompt starts with one of the cached prefixes, returns a model bound
+        to that prefix's context cache and the remainder of the prompt; otherwise
+        the plain model and the unchanged prompt.
+        """
+        if self.context_cache_ttl <= 0:
+            return self.client, prompt
+        for prefix in self.cached_prefixes:
+            if prompt.startswith(prefix):
+                cached_model = self._context_cached_model(prefix)
+                if cached_model is not None:
+                    return cached_model, prompt[len(prefix):]
+                break
+        return self.client, prompt
+
+    def _context_cached_model(self, prefix: str):
+        """Model reading from the context cache of prefix, created on first use."""
+        key = (self.api_config.get("GEMINI_API_KEY"), self.model, self.system_instruction, prefix)
+        with _CONTEXT_CACHES_LOCK:
+            entry = _CONTEXT_CACHES.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            create_lock = _CONTEXT_CACHE_CREATE_LOCKS.setdefault(key, threading.Lock())
+        
+        # Creating a cache is a network round trip, so it happens outside the shared
+        # lock; the per-key lock keeps it to one creation per prefix. A cache being
+        # refreshed is still valid for CONTEXT_CACHE_REFRESH_MARGIN, so other callers
+        # keep using it instead of waiting.
+        if not create_lock.acquire(blocking=entry is None):
+            return entry[1]
+        try:
+            with _CONTEXT_CACHES_LOCK:
+                current = _CONTEXT_CACHES.get(key)
+                if current is not None and current[0] > time.monotonic():
+                    return current[1]
+            try:
+                cache = genai.caching.CachedContent.create(
+                    model=self.model,
+                    system_instruction=self.system_instruction,
+                    contents=[prefix],
+                    ttl=datetime.timedelta(seconds=self.context_cache_ttl),
+                )
+                cached_model = genai.GenerativeModel.from_cached_content(
+                    cached_content=cache,
+                    generation_config=self.generation_config,
+                )
+                expires_at = time.monotonic() + max(0, self.context_cache_ttl - CONTEXT_CACHE_REFRESH_MARGIN)
+            except Exception as e:
+                # E.g. the prefix is below the model's minimum cacheable size;
+                # don't retry, implicit caching still applies to the plain model
+                logger.warning(f"Gemini context cache unavailable, sending full prompts: {str(e)}")
+                cached_model, expires_at = None, float("inf")
+            with _CONTEXT_CACHES_LOCK:
+                _CONTEXT_CACHES[key] = (expires_at, cached_model)
+            return cached_model
+        finally:
+            create_lock.release()
+
+    def _generation_overrides(self, max_output_tokens: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Per-call generation config merged over the model's, or None to use it unchanged."""
+        if max_output_tokens is None:
+            return None
+        return {"max_output_tokens": min(int(max_output_tokens), self.generation_config["max_output_tokens"])}
+
+    def _response_cache_key(self, prompt: str, seed, overrides: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Hash of everything that determines the response, or None if caching is off."""
+        if self.response_cache_ttl <= 0:
+            return None
+        payload = "\x1f".join((
+            self.model,
+            self.system_instruction or "",
+            json.dumps({**self.generation_config, **(overrides or {})}, sort_keys=True),
+            str(seed),
+            prompt,
+        ))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _response_cache_get(self, key: Optional[str]) -> Optional[str]:
+        if key is None:
+            return None
+        with _RESPONSE_CACHE_LOCK:
+            entry = _RESPONSE_CACHE.get(key)
+            if entry is None:
+                return None
+            timestamp, text = entry
+            if time.monotonic() - timestamp > self.response_cache_ttl:
+                del _RESPONSE_CACHE[key]
+                return None
+            _RESPONSE_CACHE.move_to_end(key)
+            return text
+
+    def _response_cache_put(self, key: Optional[str], text: str) -> None:
+        if key is None:
+            return
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE[key] = (time.monotonic(), text)
+            _RESPONSE_CACHE.move_to_end(key)
+            while len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX_ENTRIES:
+                _RESPONSE_CACHE.popitem(last=False)
+
+    def _extract_text(self, response) -> str:
+        """Return the text of the first candidate and record token usage."""
+        if response.candidates:
+            r = response.candidates[0].content.parts[0].text
+        else:
+            raise ValueError("No response candidates returned")
+        
+        if hasattr(response, "usage_metadata") and response.usage_metadata:
+            self._log_usage(usage_dict=response.usage_metadata)
+        else:
+            print("Warning: Gemini API usage metadata not available.")
+        
+        return r
+
+    def _stream(self, messages: List[Dict[str, str]]) -> Iterator[str]:
+        """
+        Call Gemini API with streaming enabled and yield text chunks as they arrive.
+        
+        Args:
+            messages: A list of message dicts with 'role' and 'content'
+        
+        Yields:
+            Consecutive pieces of the JSON response text
+        """
+        if len(messages) > 0 and isinstance(messages[0], list):
+            messages = messages[0]
+        
+        prompt = self._convert_messages_to_prompt(messages)
+        response = self._generate_with_backoff(prompt, stream=True)
+        for chunk in response:
+            if chunk.candidates and chunk.candidates[0].content.parts:
+                yield chunk.text
+        
+        # Usage metadata is complete once the stream has been consumed
+        if hasattr(response, "usage_metadata") and response.usage_metadata:
+            self._log_usage(usage_dict=response.usage_metadata)
+
+    def _generate_with_backoff(
+        self,
+        prompt: str,
+        max_retries: int = 3,
+        base_delay: float = 2.0,
+        stream: bool = False,
+        generation_config: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Send a request through the per-key shared rate limiter, backing off
+        exponentially when Gemini still answers 429 (quota exhausted).
+        
+        Args:
+            prompt: Prompt text
+            max_retries: Retries after a 429 before giving up
+            base_delay: Delay in seconds before the first retry, doubled each time
+            stream: Return a streaming response instead of waiting for the full text
+            generation_config: Per-call overrides of the model's generation config
+        
+        Returns:
+            Gemini response
+        """
+        api_key = self.api_config.get("GEMINI_API_KEY")
+        model, prompt = self._model_for_prompt(prompt)
+        for attempt in range(max_retries + 1):
+            acquire_rate_limit(api_key, self.max_requests_per_minute, self.request_window)
+            try:
+                return model.generate_content(prompt, stream=stream, generation_config=generation_config)
+            except ResourceExhausted:
+                if attempt == max_retries:
+                    raise
+                delay = base_delay * (2 ** attempt)
+                print(f"Gemini rate limit hit, retrying in {delay:.0f}s...")
+                time.sleep(delay)
 
     def _convert_messages_to_prompt(self, messages: List[Dict[str, str]]) -> str:
         """
         Convert OpenAI-style messages to a single Gemini prompt.
         
         Gemini uses a simpler prompt format, so we combine system and user messages.
+        The pinned system instruction is skipped so the prompt body starts with the
+        static part of the task template.
         
         Args:
             messages: List of message dicts with 'role' and 'content'
@@ -115,12 +359,14 @@ class GeminiClient(BaseClient):
             role = message.get("role", "")
             content = message.get("content", "")
             
-            if role == "system":
-                prompt_parts.append(f"System Instructions: {content}\n")
-            elif role == "user":
-                prompt_parts.append(f"{content}")
-            elif role == "assistant":
-                prompt_parts.append(f"Assistant: {content}\n")
+            if role == "system" and content == self.system_instruction:
+                # Already sent as the model's system instruction
+                continue
+            if role == "user":
+                prompt_parts.append(content)
+            elif role in _ROLE_FORMAT:
+                prefix, suffix = _ROLE_FORMAT[role]
+                prompt_parts.append(prefix + content + suffix)
         
         return "\n".join(prompt_parts)
 
@@ -133,10 +379,10 @@ class GeminiClient(BaseClient):
         """
         try:
             # Gemini uses different field names
-            if hasattr(usage_dict, "prompt_token_count"):
-                self.usage.prompt_tokens += usage_dict.prompt_token_count
-            if hasattr(usage_dict, "candidates_token_count"):
-                self.usage.completion_tokens += usage_dict.candidates_token_count
+            self._add_usage(
+                prompt_tokens=getattr(usage_dict, "prompt_token_count", 0) or 0,
+                completion_tokens=getattr(usage_dict, "candidates_token_count", 0) or 0,
+            )
         except Exception as e:
             print(f"Warning: Could not log usage - {str(e)}")
 
@@ -144,13 +390,19 @@ class GeminiClient(BaseClient):
         """
         Get the length of the request for rate limiting purposes.
         
+        Estimated locally at ~4 characters per token, since count_tokens would
+        itself be an API call; exact counts are recorded from usage metadata.
+        
         Args:
             messages: List of message dicts
         
         Returns:
-            Request length (currently returns 1 for simplicity)
+            Approximate prompt tokens, including the system instruction
         """
-        return 1
+        if len(messages) > 0 and isinstance(messages[0], list):
+            messages = messages[0]
+        prompt = self._convert_messages_to_prompt(messages)
+        return (len(prompt) + len(self.system_instruction or "")) // 4 + 1
 
     def construct_message_list(
         self,
@@ -1,6 +1,5 @@
 import os
 import logging
-from flask import g
 from logging.handlers import TimedRotatingFileHandler
 
 
@@ -1,17 +1,67 @@
 
 import google.generativeai as genai
+import asyncio
+import mimetypes
 import os
-from typing import Optional, Union
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+from .llmclient.gemini import configure_genai
 from .logger import CustomLogger
 
 logger = CustomLogger(__name__).getlog()
 
+# Gemini accepts inline request payloads up to 20MB; larger files go through the File API
+INLINE_DATA_LIMIT = 20 * 1024 * 1024
+
+
+@lru_cache(maxsize=None)
+def _get_model(gemini_key: str, model_name: str = "gemini-2.5-flash") -> genai.GenerativeModel:
+    """Return a cached GenerativeModel per API key, since a model keeps the client it first used."""
+    return genai.GenerativeModel(model_name=model_name)
+
+
+def _inline_part(input_path: str) -> Optional[dict]:
+    """Raw-bytes request part for a file under the inline size limit, else None."""
+    mime_type = mimetypes.guess_type(input_path)[0]
+    if mime_type and os.path.getsize(input_path) < INLINE_DATA_LIMIT:
+        with open(input_path, "rb") as f:
+            return {"mime_type": mime_type, "data": f.read()}
+    return None
+
+
+def _upload(input_path: str):
+    """Upload a file through the File API, passing the guessed MIME type when there is one."""
+    mime_type = mimetypes.guess_type(input_path)[0]
+    if mime_type:
+        return genai.upload_file(path=input_path, mime_type=mime_type)
+    return genai.upload_file(path=input_path)
+
+
+def _wait_until_processed(uploaded_file, initial_delay: float = 0.25, max_delay: float = 4.0):
+    """Poll an uploaded file until Gemini has finished processing it
+    
+    Starts with short waits, since small files are usually ready almost at once,
+    and doubles the delay up to max_delay for long audio/video.
+    
+    Returns:
+        The file in its final state
+    """
+    delay = initial_delay
+    while uploaded_file.state.name == "PROCESSING":
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+        uploaded_file = genai.get_file(uploaded_file.name)
+    return uploaded_file
+
 
 def voice2text(input_path: str, gemini_key: str) -> str:
     """
     Convert audio/speech to text using Gemini's audio understanding.
     
-    Gemini can directly process audio files for transcription.
+    Gemini can directly process audio files for transcription. Clips under the
+    inline size limit are sent as raw bytes, skipping the upload, processing
+    poll and delete round trips.
     Supports: MP3, WAV, FLAC, AAC, OGG, OPUS
     
     Args:
@@ -23,22 +73,24 @@ def voice2text(input_path: str, gemini_key: str) -> str:
     """
     try:
 
-        genai.configure(api_key=gemini_key)
+        configure_genai(gemini_key)
+
+        model = _get_model(gemini_key, "gemini-2.5-flash")
+        
+        prompt = "Generate a complete and accurate transcript of the speech in this audio file. Only return the transcript text without any additional commentary."
+        
+        audio_part = _inline_part(input_path)
+        if audio_part is not None:
+            response = model.generate_content([prompt, audio_part])
+            return response.text
 
         logger.info(f"Uploading audio file: {input_path}")
-        audio_file = genai.upload_file(path=input_path)
+        audio_file = _upload(input_path)
 
-        import time
-        while audio_file.state.name == "PROCESSING":
-            time.sleep(1)
-            audio_file = genai.get_file(audio_file.name)
+        audio_file = _wait_until_processed(audio_file)
         
         if audio_file.state.name == "FAILED":
             raise ValueError(f"Audio file processing failed: {audio_file.state.name}")
-
-        model = genai.GenerativeModel(model_name="gemini-2.5-flash")
-        
-        prompt = "Generate a complete and accurate transcript of the speech in this audio file. Only return the transcript text without any additional commentary."
         
         response = model.generate_content([prompt, audio_file])
 
@@ -55,7 +107,8 @@ def image2text(input_path: str, gemini_key: str) -> str:
     """
     Generate description of an image using Gemini's vision capabilities.
     
-    Gemini can directly process images without base64 encoding.
+    Images under the inline size limit are sent as raw bytes in the request
+    itself, skipping the File API upload and delete round trips.
     Supports: PNG, JPEG, WEBP, HEIC, HEIF
     
     Args:
@@ -67,15 +120,20 @@ def image2text(input_path: str, gemini_key: str) -> str:
     """
     try:
 
-        genai.configure(api_key=gemini_key)
+        configure_genai(gemini_key)
 
-        logger.info(f"Uploading image file: {input_path}")
-        image_file = genai.upload_file(path=input_path)
-
-        model = genai.GenerativeModel(model_name="gemini-2.5-flash")
+        model = _get_model(gemini_key, "gemini-2.5-flash")
         
         prompt = "Please return the text mentioned in the image . If you find no text just return your answer as (No Text) ."
         
+        image_part = _inline_part(input_path)
+        if image_part is not None:
+            response = model.generate_content([prompt, image_part])
+            return response.text
+
+        logger.info(f"Uploading image file: {input_path}")
+        image_file = _upload(input_path)
+
         response = model.generate_content([prompt, image_file])
 
         genai.delete_file(image_file.name)
@@ -104,21 +162,18 @@ def video2text(input_path: str, gemini_key: str) -> str:
     """
     try:
 
-        genai.configure(api_key=gemini_key)
+        configure_genai(gemini_key)
 
         logger.info(f"Uploading video file: {input_path}")
-        video_file = genai.upload_file(path=input_path)
+        video_file = _upload(input_path)
 
-        import time
         logger.info("Processing video... this may take a moment")
-        while video_file.state.name == "PROCESSING":
-            time.sleep(2)
-            video_file = genai.get_file(video_file.name)
+        video_file = _wait_until_processed(video_file)
         
         if video_file.state.name == "FAILED":
             raise ValueError(f"Video file processing failed: {video_file.state.name}")
 
-        model = genai.GenerativeModel(model_name="gemini-2.5-flash")
+        model = _get_model(gemini_key, "gemini-2.5-flash")
         
         prompt = """Generate a comprehensive description of this video that covers:
         1. The main content and subject matter
@@ -203,3 +258,29 @@ def modal_normalization(
     except Exception as e:
         logger.error(f"Error in modal_normalization: {str(e)}")
         raise
+
+
+async def modal_normalization_many(
+    items: List[Tuple[str, Union[str, object]]],
+    gemini_key: Optional[str] = None,
+    max_concurrency: int = 4,
+) -> List[str]:
+    """
+    Normalize several inputs concurrently, so their uploads, processing waits and
+    Gemini requests overlap instead of running one file after another.
+    
+    Args:
+        items: (modal, input_data) pairs, as accepted by modal_normalization
+        gemini_key: Gemini API key (required for speech, image, video)
+        max_concurrency: Max inputs processed at the same time
+        
+    Returns:
+        Text representations in the order of items
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def normalize(modal, input_data):
+        async with semaphore:
+            return await asyncio.to_thread(modal_normalization, modal, input_data, gemini_key)
+
+    return await asyncio.gather(*(normalize(modal, input_data) for modal, input_data in items))
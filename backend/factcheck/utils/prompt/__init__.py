@@ -1,12 +1,26 @@
-from .gemini_prompt import GeminiPrompt
+import functools
+import importlib
 
+# Prompt sets are imported on first use, so only the selected provider is loaded
 prompt_map = {
-    "gemini_prompt": GeminiPrompt,
+    "gemini_prompt": "factcheck.utils.prompt.gemini_prompt:GeminiPrompt",
 }
 
 
+@functools.lru_cache(maxsize=None)
+def _load_prompt_class(prompt_name: str):
+    module_name, attr = prompt_map[prompt_name].split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
 def prompt_mapper(prompt_name: str):
     if prompt_name in prompt_map:
-        return prompt_map[prompt_name]()
+        return _load_prompt_class(prompt_name)()
     else:
-        raise NotImplementedError(f"Prompt {prompt_name} not implemented.")
\ No newline at end of file
+        raise NotImplementedError(f"Prompt {prompt_name} not implemented.")
+
+
+def __getattr__(name):
+    if name == "GeminiPrompt":
+        return _load_prompt_class("gemini_prompt")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
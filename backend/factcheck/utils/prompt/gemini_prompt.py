@@ -2,7 +2,64 @@
 Optimized prompts for Gemini models.
 """
 
-decompose_prompt = """
+import re
+import string
+
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def _compact(template: str) -> str:
+    """Drop indentation and repeated blank lines; they cost input tokens but not meaning."""
+    lines = "\n".join(line.strip() for line in template.split("\n"))
+    return _BLANK_LINES_RE.sub("\n\n", lines)
+
+
+class PromptTemplate(str):
+    """A prompt template whose placeholders are parsed once, at import time.
+
+    Behaves as the original string (hashing, fingerprinting, concatenation),
+    but format() only drops the values into a pre-split list of fragments
+    instead of re-scanning the whole template on every call. Templates with
+    conversions or format specs fall back to str.format.
+    """
+
+    def __new__(cls, template: str):
+        self = super().__new__(cls, template)
+        # Literal runs merged into single fragments, None where a field goes;
+        # _slots holds (index in _parts, field name) for each placeholder
+        parts, slots = [""], []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                parts, slots = None, None
+                break
+            # Literal text comes back with "{{" / "}}" already unescaped, split at
+            # each escape, so join it onto the preceding fragment
+            parts[-1] += literal
+            if field is not None:
+                slots.append((len(parts), field))
+                parts.extend((None, ""))
+        self._parts = parts
+        self._slots = tuple(slots) if slots is not None else None
+        return self
+
+    def format(self, *args, **kwargs) -> str:
+        if args or self._parts is None:
+            return str.format(self, *args, **kwargs)
+        parts = self._parts.copy()
+        for index, field in self._slots:
+            parts[index] = str(kwargs[field])
+        return "".join(parts)
+
+    __call__ = format
+
+    @property
+    def static_prefix(self) -> str:
+        """Rendered text before the first placeholder, identical for every call."""
+        if not self._slots:
+            return ""
+        return self._parts[0]
+
+decompose_prompt = PromptTemplate(_compact("""
 Task: Decompose the given text into atomic, self-contained claims.
 
 Instructions:
@@ -36,9 +93,47 @@ Output:
 Now decompose this text:
 Text: {doc}
 Output:
-"""
+"""))
+
+decompose_prompt_batched = PromptTemplate(_compact("""
+Task: Decompose each of the numbered texts into atomic, self-contained claims.
+
+Instructions:
+1. Each claim should be concise (less than 15 words) and self-contained
+2. Avoid vague references like 'he', 'she', 'it', 'this' - use complete names
+3. Generate at least one claim for each sentence in a text
+4. Never mix claims from different texts
+5. Output must be valid JSON with one key per text number, each holding an object with a single key "claims" containing a list of strings
+
+Example:
+Texts:
+[1] Mary is a five-year old girl, she likes playing piano and she doesn't like cookies.
+[2] Apple Inc. was founded by Steve Jobs in 1976. The company is headquartered in Cupertino.
+Output:
+{{
+  "1": {{
+    "claims": [
+      "Mary is a five-year old girl.",
+      "Mary likes playing piano.",
+      "Mary doesn't like cookies."
+    ]
+  }},
+  "2": {{
+    "claims": [
+      "Apple Inc. was founded by Steve Jobs.",
+      "Apple Inc. was founded in 1976.",
+      "Apple Inc. is headquartered in Cupertino."
+    ]
+  }}
+}}
+
+Now decompose these texts:
+Texts:
+{docs}
+Output:
+"""))
 
-restore_prompt = """
+restore_prompt = PromptTemplate(_compact("""
 Task: Map each claim back to its corresponding text span in the original document.
 
 Instructions:
@@ -62,9 +157,9 @@ Now map these claims:
 Text: {doc}
 Claims: {claims}
 Output:
-"""
+"""))
 
-checkworthy_prompt = """
+checkworthy_prompt = PromptTemplate(_compact("""
 Task: Evaluate each statement to determine if it presents objectively verifiable factual information.
 
 Evaluation Criteria:
@@ -94,9 +189,9 @@ Now evaluate these statements:
 {texts}
 
 Output:
-"""
+"""))
 
-qgen_prompt = """
+qgen_prompt = PromptTemplate(_compact("""
 Task: Create the minimum number of questions needed to verify the correctness of the given claim.
 
 Instructions:
@@ -148,9 +243,9 @@ Output:
 Now generate questions for this claim:
 Claim: {claim}
 Output:
-"""
+"""))
 
-verify_prompt = """
+verify_prompt = PromptTemplate(_compact("""
 Task: Evaluate multiple pieces of evidence against a single claim and determine the relationship for each evidence.
 
 Instructions:
@@ -163,6 +258,7 @@ Instructions:
 Output Format: JSON with keys "evidence_1", "evidence_2", etc., each containing:
 - "reasoning": Explain your thought process for this specific evidence
 - "relationship": One of "SUPPORTS", "REFUTES", or "IRRELEVANT"
+Output only the JSON object: no comments, trailing commas or markdown fences.
 
 Example 1:
 
@@ -209,46 +305,126 @@ Output:
   }}
 }}
 
-Example 3:
+Now analyze this claim against all provided evidences:
+
+Claim: {claim}
+
+Evidences:
+{evidence}
+
+Output:
+"""))
+
+multi_verify_prompt = PromptTemplate(_compact("""
+Task: Evaluate the numbered evidences of each claim below against that claim and determine the relationship for each evidence.
+
+Instructions:
+1. Handle every claim independently: judge each claim only against its own evidences
+2. For each evidence, determine if it SUPPORTS, REFUTES, or is IRRELEVANT to its claim
+3. Consider the relevance and reliability of each piece of evidence
+4. Provide clear reasoning for each verdict
 
-Claim: The Moon landing occurred in 1969.
+Output Format: JSON with keys "claim_1", "claim_2", etc. (one per claim, in order). Each maps to an object with keys "evidence_1", "evidence_2", etc., each containing:
+- "reasoning": Explain your thought process for this specific evidence
+- "relationship": One of "SUPPORTS", "REFUTES", or "IRRELEVANT"
+Output only the JSON object: no comments, trailing commas or markdown fences.
+
+Example:
 
+[Claim 1]: MBZUAI is located in Abu Dhabi, United Arab Emirates.
 Evidences:
-[1] The Apollo 11 mission successfully landed on the Moon on July 20, 1969. Neil Armstrong became the first human to walk on the lunar surface.
-[2] Apple Inc. is an American multinational technology company headquartered in Cupertino, California.
-[3] NASA's Apollo program consisted of multiple missions between 1961 and 1972, with Apollo 11 achieving the first crewed Moon landing in July 1969.
+[Evidence 1]: MBZUAI is a graduate-level, research-based academic institution located in Masdar City, Abu Dhabi.
+[Evidence 2]: The University of Cambridge is a public collegiate research university in Cambridge, United Kingdom.
+
+[Claim 2]: Copper reacts with ferrous sulfate (FeSO4).
+Evidences:
+[Evidence 1]: When copper metal is dipped in ferrous sulphate solution, no reaction is observed as copper is less reactive than iron.
 
 Output:
 {{
-  "evidence_1": {{
-    "reasoning": "The evidence confirms the Moon landing occurred in 1969 during the Apollo 11 mission, directly supporting the claim.",
-    "relationship": "SUPPORTS"
+  "claim_1": {{
+    "evidence_1": {{
+      "reasoning": "The evidence states MBZUAI is in Masdar City, Abu Dhabi, which supports the claim about it being in Abu Dhabi, UAE.",
+      "relationship": "SUPPORTS"
+    }},
+    "evidence_2": {{
+      "reasoning": "The evidence is about the University of Cambridge in the UK, which has no relevance to MBZUAI's location.",
+      "relationship": "IRRELEVANT"
+    }}
   }},
-  "evidence_2": {{
-    "reasoning": "The evidence is about Apple Inc., which has no connection to the Moon landing or the year 1969 in this context.",
-    "relationship": "IRRELEVANT"
-  }},
-  "evidence_3": {{
-    "reasoning": "The evidence confirms that Apollo 11 achieved the first Moon landing in July 1969, which directly supports the claim.",
-    "relationship": "SUPPORTS"
+  "claim_2": {{
+    "evidence_1": {{
+      "reasoning": "The evidence confirms that no reaction occurs between copper and ferrous sulphate, which refutes the claim.",
+      "relationship": "REFUTES"
+    }}
   }}
 }}
 
-Now analyze this claim against all provided evidences:
+Now analyze these claims against their evidences:
 
-Claim: {claim}
+{claims}
 
-Evidences:
-{evidence}
+Output:
+"""))
+
+fused_extract_prompt = PromptTemplate(_compact("""
+Task: In a single pass over the given text, decompose it into atomic claims, map each claim back to its source span, judge whether it is checkworthy, and write the search questions needed to verify it.
 
+Instructions:
+1. Each claim should be concise (less than 15 words) and self-contained; avoid vague references like 'he', 'she', 'it', 'this' - use complete names
+2. Generate at least one claim for each sentence in the text, in the order they appear
+3. "origin": the minimal continuous span of the original text containing the claim, copied exactly; consecutive spans should concatenate to the full text
+4. "checkworthy": "Yes" or "No" followed by a short rationale in parentheses. A claim is checkworthy if it states objectively verifiable facts (even incorrect ones) with clear references; opinions are not checkworthy
+5. "questions": the minimum number of specific questions needed to verify the claim (empty list if not checkworthy)
+6. Output must be valid JSON with a single key "claims" containing a list of objects with keys "claim", "origin", "checkworthy" and "questions"
+
+Example:
+Text: Mary is a five-year old girl, she likes playing piano and she thinks cookies are overrated.
 Output:
-"""
+{{
+  "claims": [
+    {{
+      "claim": "Mary is a five-year old girl.",
+      "origin": "Mary is a five-year old girl,",
+      "checkworthy": "Yes (Contains verifiable factual information about Mary's age.)",
+      "questions": ["How old is Mary?"]
+    }},
+    {{
+      "claim": "Mary likes playing piano.",
+      "origin": " she likes playing piano",
+      "checkworthy": "Yes (States a verifiable fact about Mary's hobbies.)",
+      "questions": ["Does Mary like playing piano?"]
+    }},
+    {{
+      "claim": "Mary thinks cookies are overrated.",
+      "origin": " and she thinks cookies are overrated.",
+      "checkworthy": "No (This is a subjective opinion, not a factual claim.)",
+      "questions": []
+    }}
+  ]
+}}
+
+Now process this text:
+Text: {doc}
+Output:
+"""))
 
 
 class GeminiPrompt:
     """Gemini-optimized prompts for fact-checking."""
     decompose_prompt = decompose_prompt
+    decompose_prompt_batched = decompose_prompt_batched
     restore_prompt = restore_prompt
     checkworthy_prompt = checkworthy_prompt
     qgen_prompt = qgen_prompt
     verify_prompt = verify_prompt
+    multi_verify_prompt = multi_verify_prompt
+    fused_extract_prompt = fused_extract_prompt
+
+    def static_prefixes(self) -> list:
+        """Static instruction/few-shot prefix of every template, e.g. for context caching."""
+        return [
+            value.static_prefix
+            for value in vars(type(self)).values()
+            if isinstance(value, PromptTemplate) and value.static_prefix.strip()
+        ]
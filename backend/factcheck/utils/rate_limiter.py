@@ -1,13 +1,39 @@
 
+import asyncio
+import contextvars
+import datetime
+import functools
+import hashlib
+import logging
 import time
 import threading
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, List, Any, Optional
-from dataclasses import dataclass
+from typing import Awaitable, Callable, Hashable, Iterator, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from factcheck.utils.logger import CustomLogger
 
 logger = CustomLogger(__name__).getlog()
 
+# Seconds between checks of the Pacific date for the daily quota reset
+DATE_CHECK_INTERVAL = 60
+
+
+def _item_key(item: Any) -> Hashable:
+    """Default identity of a task item for deduplication: the item, or its repr if unhashable."""
+    try:
+        hash(item)
+        return item
+    except TypeError:
+        return repr(item)
+
+
+@functools.lru_cache(maxsize=1)
+def _pacific_tz():
+    """US/Pacific tzinfo, built once (pytz parses the zone's DST rules on lookup)."""
+    import pytz
+    return pytz.timezone('US/Pacific')
+
 
 @dataclass
 class APIKeyStats:
@@ -17,8 +43,10 @@ class APIKeyStats:
     successful_requests: int = 0
     failed_requests: int = 0
     rate_limit_hits: int = 0
-    last_request_time: float = 0
-    tokens: float = 0
+    # (monotonic time, prompt tokens) of the requests sent in the current window
+    window: deque = field(default_factory=deque)
+    # Sum of the prompt tokens in window, only used when a TPM limit is set
+    window_cost: float = 0
 
 
 class MultiKeyRateLimitedExecutor:
@@ -30,11 +58,17 @@ class MultiKeyRateLimitedExecutor:
         max_requests_per_day: int = 250, 
         max_workers: int = 5, 
         request_window: int = 60,
-        burst_size: Optional[int] = None,
+        max_tokens_per_minute: Optional[int] = None,
+        result_cache_size: int = 0,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+        canonicalize: Callable[[Any], Hashable] = _item_key,
+        key_selection: str = "least_loaded",
     ):
 
         if not api_keys:
             raise ValueError("At least one API key must be provided")
+        if key_selection not in ("least_loaded", "round_robin"):
+            raise ValueError(f"Unknown key_selection: {key_selection}")
         
         self.api_keys = api_keys
         self.num_keys = len(api_keys)
@@ -42,154 +76,274 @@ class MultiKeyRateLimitedExecutor:
         self.max_requests_per_day = max_requests_per_day
         self.max_workers = max_workers
         self.request_window = request_window
-        self.burst_size = burst_size or max_requests_per_minute
         
-        # Token bucket per API key
-        self.refill_rate = max_requests_per_minute / request_window
+        # Sliding window per API key: at most max_requests_per_minute requests
+        # (and max_tokens_per_minute prompt tokens, if set) per request_window
+        self.max_tokens_per_minute = max_tokens_per_minute
+        
+        # Memoized results of earlier identical (func, item) calls; hits skip the
+        # rate limiter entirely. Disabled when result_cache_size is 0
+        self.result_cache_size = result_cache_size
+        # Results rejected by cache_if (e.g. error fallbacks) are not memoized
+        self.cache_if = cache_if
+        self._result_cache = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        self.cache_hits = 0
+        
+        # map/map_async run items with equal canonical keys once and share the result
+        self.canonicalize = canonicalize
         
         # Initialize stats for each key
         self.key_stats = {
-            key: APIKeyStats(
-                key_id=f"key_{i}",
-                tokens=float(self.burst_size),
-                last_request_time=time.time()
-            )
+            key: APIKeyStats(key_id=f"key_{i}")
             for i, key in enumerate(api_keys)
         }
         
 
         self.daily_usage = {key: 0 for key in api_keys}
+        # Bit i set once api_keys[i] has used up its daily quota
+        self._exhausted = 0
+        self._key_bits = {key: 1 << i for i, key in enumerate(api_keys)}
         self.last_reset_date = self._get_current_date()
+        self._next_date_check = time.monotonic() + DATE_CHECK_INTERVAL
         
         # Thread synchronization
         self.lock = threading.Lock()
         self.key_available = threading.Condition(self.lock)
         
-        # Round-robin index for key selection
+        # "least_loaded" picks the available key with the lowest daily usage (then
+        # the emptiest window); "round_robin" the next available key in order
+        self.key_selection = key_selection
+        # Round-robin index for key selection (also the least-loaded tie-break)
         self.current_key_index = 0
         
         # Global statistics
         self.total_requests = 0
         self.total_wait_time = 0.0
         self.start_time = time.time()
+        
+        # Worker threads, started on first use and reused by every map call
+        self._pool = None
+        self._pool_lock = threading.Lock()
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ratelim")
+            return self._pool
+    
+    def close(self):
+        """Shut down the worker threads (a later map call starts new ones)."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
     def _get_current_date(self) -> str:
         """Get current date in Pacific Time (for daily quota reset)."""
-        import datetime
-        import pytz
-        
-        # Get current time in Pacific timezone
-        pacific = pytz.timezone('US/Pacific')
-        now = datetime.datetime.now(pacific)
-        return now.strftime('%Y-%m-%d')
+        return datetime.datetime.now(_pacific_tz()).strftime('%Y-%m-%d')
     
     def _reset_daily_quotas_if_needed(self):
         """Reset daily quotas at midnight Pacific Time (called with lock held)."""
+        # Formatting the Pacific date is comparatively slow, so only check it
+        # every DATE_CHECK_INTERVAL seconds (monotonic, immune to clock changes)
+        now = time.monotonic()
+        if now < self._next_date_check:
+            return
+        self._next_date_check = now + DATE_CHECK_INTERVAL
         current_date = self._get_current_date()
         
         if current_date != self.last_reset_date:
             logger.info(f"Daily quota reset: {self.last_reset_date} → {current_date}")
             self.daily_usage = {key: 0 for key in self.api_keys}
+            self._exhausted = 0
             self.last_reset_date = current_date
+            # Every key is eligible again, including for threads parked on exhausted quotas
+            self.key_available.notify_all()
+    
+    def _expire_window(self, stats: APIKeyStats, now: float):
+        """Drop requests older than the window from a key's history (called with lock held)."""
+        window = stats.window
+        horizon = now - self.request_window
+        while window and window[0][0] <= horizon:
+            stats.window_cost -= window.popleft()[1]
     
-    def _refill_tokens(self, key: str):
-        """Refill tokens for a specific API key (called with lock held)."""
-        stats = self.key_stats[key]
-        current_time = time.time()
-        elapsed = current_time - stats.last_request_time
-        
-        # Add tokens based on elapsed time
-        tokens_to_add = elapsed * self.refill_rate
-        stats.tokens = min(self.burst_size, stats.tokens + tokens_to_add)
-        stats.last_request_time = current_time
+    def _has_capacity(self, stats: APIKeyStats, cost: float) -> bool:
+        """Whether a request of cost prompt tokens fits in the key's window."""
+        if len(stats.window) >= self.max_requests_per_minute:
+            return False
+        return not self.max_tokens_per_minute or stats.window_cost + cost <= self.max_tokens_per_minute
     
-    def _find_available_key(self) -> Optional[str]:
+    def _find_available_key(self, cost: float, now: float) -> Optional[str]:
         """
         Find an API key with available quota (called with lock held).
-        Uses round-robin to distribute load evenly.
+        Picks by key_selection; ties go round-robin.
+        
+        Args:
+            cost: Estimated prompt tokens of the request (checked against the TPM budget)
+            now: Current time.monotonic()
         
         Returns:
             API key string or None if all keys exhausted
         """
         self._reset_daily_quotas_if_needed()
         
+        least_loaded = self.key_selection == "least_loaded"
+        best_idx, best_load = None, None
+        
         # Try all keys starting from current index
         for offset in range(self.num_keys):
             idx = (self.current_key_index + offset) % self.num_keys
             key = self.api_keys[idx]
             
             # Check daily quota
-            if self.daily_usage[key] >= self.max_requests_per_day:
-                logger.debug(f"{self.key_stats[key].key_id} daily quota exhausted")
+            if self._exhausted & (1 << idx):
                 continue
             
-            # Refill tokens
-            self._refill_tokens(key)
+            stats = self.key_stats[key]
+            self._expire_window(stats, now)
+            if not self._has_capacity(stats, cost):
+                continue
+            if not least_loaded:
+                best_idx = idx
+                break
+            # Spread the daily quota evenly, so no key runs dry while others have room
+            load = (self.daily_usage[key], len(stats.window))
+            if best_load is None or load < best_load:
+                best_idx, best_load = idx, load
+        
+        if best_idx is None:
+            return None
+        self.current_key_index = (best_idx + 1) % self.num_keys
+        return self.api_keys[best_idx]
+    
+    def _seconds_until_capacity(self, stats: APIKeyStats, cost: float, now: float) -> float:
+        """How long until enough of a key's window expires to admit a request (lock held)."""
+        wait_until = now
+        window = stats.window
+        overflow = len(window) - self.max_requests_per_minute
+        if overflow >= 0:
+            wait_until = max(wait_until, window[overflow][0] + self.request_window)
+        if self.max_tokens_per_minute:
+            excess = stats.window_cost + cost - self.max_tokens_per_minute
+            for timestamp, request_cost in window:
+                if excess <= 0:
+                    break
+                excess -= request_cost
+                wait_until = max(wait_until, timestamp + self.request_window)
+        return wait_until - now
+    
+    def _try_acquire(self, cost: float, wait_start: float) -> Tuple[Optional[str], float]:
+        """
+        Take a request slot from any available API key without blocking
+        (called with lock held).
+        
+        Args:
+            cost: Estimated prompt tokens of the request
+            wait_start: time.time() when the caller started waiting
+        
+        Returns:
+            (api_key, 0) on success, or (None, seconds until a key may have room;
+            inf if every key is out of daily quota)
+        """
+        now = time.monotonic()
+        key = self._find_available_key(cost, now)
+        
+        if key is not None:
+            # Record the request in the key's window
+            stats = self.key_stats[key]
+            stats.window.append((now, cost))
+            stats.window_cost += cost
+            stats.total_requests += 1
+            self.daily_usage[key] += 1
+            if self.daily_usage[key] >= self.max_requests_per_day:
+                self._exhausted |= self._key_bits[key]
+                logger.debug("%s daily quota exhausted", stats.key_id)
+            self.total_requests += 1
+            
+            wait_time = time.time() - wait_start
+            self.total_wait_time += wait_time
+            
+            if wait_time > 0.1:
+                logger.debug(
+                    "%s acquired after %.2fs wait (window: %d/%d, daily: %d/%d)",
+                    stats.key_id, wait_time, len(stats.window), self.max_requests_per_minute,
+                    self.daily_usage[key], self.max_requests_per_day,
+                )
             
-            # Check if tokens available
-            if self.key_stats[key].tokens >= 1.0:
-                self.current_key_index = (idx + 1) % self.num_keys
-                return key
+            return key, 0.0
         
-        return None
+        min_wait = min(
+            (
+                self._seconds_until_capacity(self.key_stats[key], cost, now)
+                for key in self.api_keys
+                if not self._exhausted & self._key_bits[key]
+            ),
+            default=float('inf'),
+        )
+        return None, min_wait
     
-    def _acquire_token(self) -> tuple[str, float]:
+    def _clamp_cost(self, cost: float) -> float:
+        if self.max_tokens_per_minute:
+            # A single oversized request must still fit in an empty window
+            return min(cost, self.max_tokens_per_minute)
+        return cost
+    
+    def _acquire_token(self, cost: float = 0) -> tuple[str, float]:
         """
-        Acquire a token from any available API key.
-        Blocks if no keys have tokens available.
+        Acquire a request slot from any available API key.
+        Blocks if every key's window is full.
+        
+        Args:
+            cost: Estimated prompt tokens of the request
         
         Returns:
             Tuple of (api_key, wait_time)
         """
         wait_start = time.time()
+        cost = self._clamp_cost(cost)
         
         with self.key_available:
             while True:
-                # Try to find available key
-                key = self._find_available_key()
-                
+                key, min_wait = self._try_acquire(cost, wait_start)
                 if key is not None:
-                    # Token available - consume it
-                    stats = self.key_stats[key]
-                    stats.tokens -= 1.0
-                    stats.total_requests += 1
-                    self.daily_usage[key] += 1
-                    self.total_requests += 1
-                    
-                    wait_time = time.time() - wait_start
-                    self.total_wait_time += wait_time
-                    
-                    if wait_time > 0.1:
-                        logger.debug(
-                            f"{stats.key_id} acquired after {wait_time:.2f}s wait "
-                            f"(tokens: {stats.tokens:.1f}, daily: {self.daily_usage[key]}/{self.max_requests_per_day})"
-                        )
-                    
-                    return key, wait_time
-                
-                min_wait = float('inf')
-                for key in self.api_keys:
-                    if self.daily_usage[key] < self.max_requests_per_day:
-                        stats = self.key_stats[key]
-                        tokens_needed = 1.0 - stats.tokens
-                        wait_time = max(0, tokens_needed / self.refill_rate)
-                        min_wait = min(min_wait, wait_time)
+                    return key, time.time() - wait_start
                 
+                # A finished request frees no window slot, only time does, so
+                # waiters sleep until the earliest expiry rather than being
+                # woken per completion; the daily reset is the one notify_all
                 if min_wait == float('inf'):
                   
                     self.key_available.wait(timeout=300)
                     continue
                 self.key_available.wait(timeout=min(min_wait + 0.1, 1.0))
     
-    def _release_token_notification(self):
-        """Notify waiting threads that time has passed."""
-        with self.key_available:
-            self.key_available.notify_all()
+    async def _acquire_token_async(self, cost: float = 0) -> tuple[str, float]:
+        """
+        Awaitable _acquire_token: sleeps on the event loop while every key's
+        window is full instead of blocking a thread.
+        """
+        wait_start = time.time()
+        cost = self._clamp_cost(cost)
+        
+        while True:
+            with self.lock:
+                key, min_wait = self._try_acquire(cost, wait_start)
+            if key is not None:
+                return key, time.time() - wait_start
+            await asyncio.sleep(300 if min_wait == float('inf') else min(min_wait + 0.1, 1.0))
     
     def map(
         self, 
         func: Callable[[Any, str], Any],
-        items: List[Any]
+        items: List[Any],
+        cost_fn: Optional[Callable[[Any], float]] = None,
     ) -> List[Any]:
         """
         Execute function on all items with multi-key rate limiting.
@@ -197,90 +351,283 @@ class MultiKeyRateLimitedExecutor:
         Args:
             func: Function to execute. Must accept (item, api_key) as parameters
             items: List of items to process
+            cost_fn: Estimates the prompt tokens of an item; used with max_tokens_per_minute
+                     to delay requests before they would exceed the TPM quota
             
         Returns:
             List of results in same order as items
         """
-        if not items:
-            return []
+        unique, positions = self._dedupe(items)
+        if len(unique) == len(items):
+            return list(self.imap(func, items, cost_fn=cost_fn))
+        results = list(self.imap(func, unique, cost_fn=cost_fn))
+        return [results[pos] for pos in positions]
+
+    def _dedupe(self, items: List[Any]) -> Tuple[List[Any], List[int]]:
+        """
+        Split items into the first item of each canonical key and, per item, the
+        position of its representative in that list.
+        """
+        first_pos = {}
+        unique = []
+        positions = []
+        for item in items:
+            key = self.canonicalize(item)
+            pos = first_pos.get(key)
+            if pos is None:
+                pos = first_pos[key] = len(unique)
+                unique.append(item)
+            positions.append(pos)
+        if len(unique) < len(items):
+            logger.debug("Deduplicated %d items to %d tasks", len(items), len(unique))
+        return unique, positions
+
+    def imap(
+        self,
+        func: Callable[[Any, str], Any],
+        items: List[Any],
+        cost_fn: Optional[Callable[[Any], float]] = None,
+    ) -> Iterator[Any]:
+        """
+        Like map, but yield results in input order as soon as each one and all
+        before it have finished, so downstream work can start on the first
+        results while later items are still running.
         
+        Args:
+            func: Function to execute. Must accept (item, api_key) as parameters
+            items: List of items to process
+            cost_fn: Estimates the prompt tokens of an item (see map)
+            
+        Yields:
+            Results in the order of items; failed items yield None
+        """
+        pending = {}
+        next_index = 0
+        for index, result in self.imap_unordered(func, items, cost_fn=cost_fn):
+            pending[index] = result
+            while next_index in pending:
+                yield pending.pop(next_index)
+                next_index += 1
+        # Items whose future itself failed never reported; keep positions aligned
+        for index in range(next_index, len(items)):
+            yield pending.pop(index, None)
+
+    def map_batched(
+        self,
+        func: Callable[[List[Any], str], List[Any]],
+        items: List[Any],
+        batch_size: int = 8,
+        cost_fn: Optional[Callable[[List[Any]], float]] = None,
+    ) -> List[Any]:
+        """
+        Like map, but hand items to func in chunks of batch_size, one request
+        (and one rate-limit token) per chunk instead of per item.
+
+        Args:
+            func: Function to execute. Must accept (chunk, api_key) and return one
+                  result per item of the chunk, in order
+            items: List of items to process
+            batch_size: Items per chunk
+            cost_fn: Estimates the prompt tokens of a whole chunk (see map)
+
+        Returns:
+            List of per-item results in same order as items; every item of a
+            failed chunk gets None
+        """
+        batch_size = max(1, batch_size)
+        chunks = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
         results = [None] * len(items)
-        completed_count = 0
-        lock = threading.Lock()
+        for index, chunk_results in self.imap_unordered(func, chunks, cost_fn=cost_fn):
+            if chunk_results is None:
+                continue
+            start = index * batch_size
+            results[start : start + len(chunk_results)] = chunk_results
+        return results
+
+    def imap_unordered(
+        self, 
+        func: Callable[[Any, str], Any],
+        items: List[Any],
+        cost_fn: Optional[Callable[[Any], float]] = None,
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Like map, but yield (index, result) pairs as soon as each item finishes,
+        so callers can consume results without waiting for the slowest task.
+        Failed items yield None as their result.
         
-        # Track per-key statistics
-        key_request_counts = {key: 0 for key in self.api_keys}
+        Args:
+            func: Function to execute. Must accept (item, api_key) as parameters
+            items: List of items to process
+            cost_fn: Estimates the prompt tokens of an item (see map)
+            
+        Yields:
+            (index in items, result) in completion order
+        """
+        if not items:
+            return
         
         def _wrapped_func(index, item):
-            """Wrapper that enforces rate limiting and provides API key."""
-            nonlocal completed_count
+            """Wrapper that enforces rate limiting and provides API key.
+            
+            Returns (index, result, api_key); api_key is None for a cache hit.
+            """
+            cache_key = self._result_cache_key(func, item)
+            cached = self._result_cache_get(cache_key)
+            if cached is not None:
+                return index, cached, None
             
             # Acquire token (blocks if needed)
-            api_key, wait_time = self._acquire_token()
+            cost = cost_fn(item) if cost_fn is not None else 0
+            api_key, wait_time = self._acquire_token(cost)
             
             try:
-                # Track which key is being used
-                with lock:
-                    key_request_counts[api_key] += 1
-                
                 # Execute the actual function with API key
                 logger.debug(
-                    f"Processing item {index + 1}/{len(items)} "
-                    f"with {self.key_stats[api_key].key_id}..."
+                    "Processing item %d/%d with %s...", index + 1, len(items), self.key_stats[api_key].key_id
                 )
                 result = func(item, api_key)
                 
                 # Update stats
                 self.key_stats[api_key].successful_requests += 1
-                
-                with lock:
-                    completed_count += 1
-                    elapsed = time.time() - self.start_time
-                    rate = completed_count / elapsed if elapsed > 0 else 0
-                    
-                    # Show key distribution every 10 requests
-                    if completed_count % 10 == 0:
-                        key_dist = ", ".join([
-                            f"{self.key_stats[k].key_id}:{key_request_counts[k]}"
-                            for k in self.api_keys
-                        ])
-                        logger.info(
-                            f"{completed_count}/{len(items)} "
-                            f"({rate:.1f} req/s) | Keys: {key_dist}"
-                        )
-                
-                return index, result
+                self._result_cache_put(cache_key, result)
+                return index, result, api_key
                 
             except Exception as e:
                 self.key_stats[api_key].failed_requests += 1
                 logger.error(f"Task {index + 1} failed with {self.key_stats[api_key].key_id}: {e}")
-                return index, None
-            finally:
-                # Notify other threads
-                self._release_token_notification()
+                return index, None, api_key
 
         self.start_time = time.time()
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(_wrapped_func, i, item)
-                for i, item in enumerate(items)
-            ]
-            
-            # Collect results
+        executor = self._get_pool()
+        # Each task runs in a copy of the caller's context, so LLM token usage is
+        # attributed to the caller's pipeline run (see llmclient.base.track_run_usage)
+        futures = [
+            executor.submit(contextvars.copy_context().run, _wrapped_func, i, item)
+            for i, item in enumerate(items)
+        ]
+        
+        # Hand results out as they complete; progress is counted here, on the
+        # consuming thread, so the workers share no counters
+        try:
+            completed_count = 0
+            key_request_counts = {key: 0 for key in self.api_keys}
             for future in as_completed(futures):
                 try:
-                    index, result = future.result()
-                    results[index] = result
+                    index, result, api_key = future.result()
                 except Exception as e:
                     logger.error(f"Future failed: {e}")
+                    continue
+            
+                if api_key is not None:
+                    key_request_counts[api_key] += 1
+                completed_count += 1
+                # Show key distribution every 10 requests
+                if completed_count % 10 == 0 and logger.isEnabledFor(logging.INFO):
+                    elapsed = time.time() - self.start_time
+                    rate = completed_count / elapsed if elapsed > 0 else 0
+                    key_dist = ", ".join([
+                        f"{self.key_stats[k].key_id}:{key_request_counts[k]}"
+                        for k in self.api_keys
+                    ])
+                    logger.info(
+                        f"{completed_count}/{len(items)} "
+                        f"({rate:.1f} req/s) | Keys: {key_dist}"
+                    )
+                yield index, result
+        finally:
+            # If the consumer stops early, don't leave queued tasks on the shared pool
+            for future in futures:
+                future.cancel()
+
+        self._log_summary(len(items))
 
+    async def map_async(
+        self,
+        func: Callable[[Any, str], Awaitable[Any]],
+        items: List[Any],
+        cost_fn: Optional[Callable[[Any], float]] = None,
+    ) -> List[Any]:
+        """
+        Coroutine counterpart of map: runs func as coroutines on the current event
+        loop, at most max_workers at a time, with the same per-key limits.
+        
+        Args:
+            func: Coroutine function accepting (item, api_key)
+            items: List of items to process
+            cost_fn: Estimates the prompt tokens of an item (see map)
+            
+        Returns:
+            List of results in same order as items; failed items get None
+        """
+        if not items:
+            return []
+        unique, positions = self._dedupe(items)
+        if len(unique) < len(items):
+            results = await self.map_async(func, unique, cost_fn=cost_fn)
+            return [results[pos] for pos in positions]
+        
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def _wrapped_func(index, item):
+            cache_key = self._result_cache_key(func, item)
+            cached = self._result_cache_get(cache_key)
+            if cached is not None:
+                return cached
+            async with semaphore:
+                cost = cost_fn(item) if cost_fn is not None else 0
+                api_key, _ = await self._acquire_token_async(cost)
+                try:
+                    result = await func(item, api_key)
+                    self.key_stats[api_key].successful_requests += 1
+                    self._result_cache_put(cache_key, result)
+                    return result
+                except Exception as e:
+                    self.key_stats[api_key].failed_requests += 1
+                    logger.error(f"Task {index + 1} failed with {self.key_stats[api_key].key_id}: {e}")
+                    return None
+        
+        self.start_time = time.time()
+        results = await asyncio.gather(*(_wrapped_func(i, item) for i, item in enumerate(items)))
+        self._log_summary(len(items))
+        return results
+
+    def _result_cache_key(self, func: Callable, item: Any) -> Optional[bytes]:
+        """Digest identifying a (func, item) call, or None if memoization is off."""
+        if self.result_cache_size <= 0:
+            return None
+        payload = f"{getattr(func, '__qualname__', func)}::{item!r}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _result_cache_get(self, key: Optional[bytes]) -> Any:
+        if key is None:
+            return None
+        with self._result_cache_lock:
+            result = self._result_cache.get(key)
+            if result is not None:
+                self._result_cache.move_to_end(key)
+                self.cache_hits += 1
+            return result
+    
+    def _result_cache_put(self, key: Optional[bytes], result: Any):
+        if key is None or result is None:
+            return
+        if self.cache_if is not None and not self.cache_if(result):
+            return
+        with self._result_cache_lock:
+            self._result_cache[key] = result
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > self.result_cache_size:
+                self._result_cache.popitem(last=False)
+    
+    def _log_summary(self, num_items: int):
+        """Log throughput and per-key counts after a map run."""
         total_time = time.time() - self.start_time
         avg_wait = self.total_wait_time / self.total_requests if self.total_requests > 0 else 0
-        actual_rate = len(items) / total_time if total_time > 0 else 0
+        actual_rate = num_items / total_time if total_time > 0 else 0
         
         logger.info(
-            f"   - Total items: {len(items)}\n"
+            f"   - Total items: {num_items}\n"
             f"   - Total time: {total_time:.2f}s\n"
             f"   - Throughput: {actual_rate:.2f} req/s ({actual_rate * 60:.1f} req/min)\n"
             f"   - Avg wait: {avg_wait:.2f}s per request\n"
@@ -294,8 +641,6 @@ class MultiKeyRateLimitedExecutor:
                 f"{stats.failed_requests} failed, "
                 f"daily: {self.daily_usage[key]}/{self.max_requests_per_day}"
             )
-        
-        return results
     
     def get_stats(self) -> dict:
         """Get comprehensive statistics."""
@@ -304,98 +649,15 @@ class MultiKeyRateLimitedExecutor:
                 "total_requests": self.total_requests,
                 "total_wait_time": self.total_wait_time,
                 "num_keys": self.num_keys,
+                "cache_hits": self.cache_hits,
                 "key_stats": {
                     stats.key_id: {
                         "total_requests": stats.total_requests,
                         "successful": stats.successful_requests,
                         "failed": stats.failed_requests,
                         "daily_usage": self.daily_usage[key],
-                        "current_tokens": stats.tokens,
+                        "window_requests": len(stats.window),
                     }
                     for key, stats in self.key_stats.items()
                 },
             }
-
-class RateLimitedExecutor:
-    """
-    Single-key rate limiter (legacy version).
-    For new code, use MultiKeyRateLimitedExecutor instead.
-    """
-    
-    def __init__(
-        self,
-        max_requests_per_minute: int = 10,
-        max_workers: int = 4,
-        request_window: int = 60,
-        burst_size: Optional[int] = None,
-    ):
-        
-        self.max_requests_per_minute = max_requests_per_minute
-        self.max_workers = max_workers
-        self.request_window = request_window
-        self.burst_size = burst_size or max_requests_per_minute
-        
-        self.tokens = float(self.burst_size)
-        self.max_tokens = float(self.burst_size)
-        self.refill_rate = max_requests_per_minute / request_window
-        self.last_refill_time = time.time()
-        
-        self.lock = threading.Lock()
-        self.token_available = threading.Condition(self.lock)
-        
-        self.total_requests = 0
-        self.total_wait_time = 0.0
-    
-    def _refill_tokens(self):
-        """Refill tokens based on elapsed time."""
-        current_time = time.time()
-        elapsed = current_time - self.last_refill_time
-        tokens_to_add = elapsed * self.refill_rate
-        self.tokens = min(self.max_tokens, self.tokens + tokens_to_add)
-        self.last_refill_time = current_time
-    
-    def _acquire_token(self) -> float:
-        """Acquire a token (blocks if needed)."""
-        wait_start = time.time()
-        
-        with self.token_available:
-            while True:
-                self._refill_tokens()
-                
-                if self.tokens >= 1.0:
-                    self.tokens -= 1.0
-                    self.total_requests += 1
-                    wait_time = time.time() - wait_start
-                    self.total_wait_time += wait_time
-                    return wait_time
-                
-                tokens_needed = 1.0 - self.tokens
-                wait_time = tokens_needed / self.refill_rate
-                self.token_available.wait(timeout=min(wait_time + 0.1, 1.0))
-    
-    def map(self, func: Callable, items: List[Any]) -> List[Any]:
-        """Execute function on items with rate limiting."""
-        if not items:
-            return []
-        
-        results = [None] * len(items)
-        
-        def _wrapped_func(index, item):
-            self._acquire_token()
-            try:
-                result = func(item)
-                return index, result
-            except Exception as e:
-                logger.error(f"Task {index + 1} failed: {e}")
-                return index, None
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [executor.submit(_wrapped_func, i, item) for i, item in enumerate(items)]
-            for future in as_completed(futures):
-                try:
-                    index, result = future.result()
-                    results[index] = result
-                except Exception as e:
-                    logger.error(f"Future failed: {e}")
-        
-        return results
\ No newline at end of file
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from factcheck.utils.logger import CustomLogger
+
+logger = CustomLogger(__name__).getlog()
+
+
+class SlidingWindowLimiter:
+    """
+    Thread-safe per-key limiter admitting at most max_requests_per_minute sends in
+    any rolling window. Callers reserve a send slot under the lock and sleep
+    outside it, so waiters are served in arrival order without busy polling.
+
+    Gemini enforces RPM over a rolling minute, so unlike a token bucket (which
+    allows a full burst plus the refill in the same minute) this never sends more
+    than the quota within any window.
+    """
+
+    def __init__(self, max_requests_per_minute: int, window: float = 60.0):
+        self.max_requests = max(1, int(max_requests_per_minute))
+        self.window = window
+        # Reserved send times, non-decreasing
+        self.slots = deque()
+        self.lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve the earliest send slot under the lock and return how long to wait for it."""
+        with self.lock:
+            now = time.monotonic()
+            while self.slots and self.slots[0] <= now - self.window:
+                self.slots.popleft()
+            slot = now
+            if len(self.slots) >= self.max_requests:
+                # The send max_requests back must have left the window first
+                slot = max(now, self.slots[-self.max_requests] + self.window)
+            self.slots.append(slot)
+            return slot - now
+
+    def acquire(self) -> float:
+        """Take one send slot, blocking until it is due. Returns the time waited."""
+        wait_time = self._reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return wait_time
+
+
+_limiters: Dict[str, SlidingWindowLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(api_key: str, max_requests_per_minute: int = 10, window: float = 60.0) -> SlidingWindowLimiter:
+    """
+    Return the process-wide limiter for an API key, creating it on first use.
+
+    Every client using the same key shares one limiter, so the per-key quota is
+    enforced across all pipeline steps rather than per module.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(api_key)
+        if limiter is None:
+            limiter = SlidingWindowLimiter(max_requests_per_minute, window)
+            _limiters[api_key] = limiter
+        return limiter
+
+
+def acquire(api_key: str, max_requests_per_minute: int = 10, window: float = 60.0) -> float:
+    """Block until a request may be sent with api_key. Returns the time waited."""
+    wait_time = get_limiter(api_key, max_requests_per_minute, window).acquire()
+    if wait_time > 0.1:
+        logger.debug(f"Rate limit: waited {wait_time:.2f}s for key ...{str(api_key)[-4:]}")
+    return wait_time
@@ -1,6 +1,36 @@
+import json
+import re
+
 import yaml
 
+try:
+    # libyaml-backed loader, much faster than the pure-Python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+
 
 def load_yaml(filepath):
     with open(filepath, "r") as file:
-        return yaml.safe_load(file)
\ No newline at end of file
+        return yaml.load(file, Loader=SafeLoader)
+
+
+def loads_json(text):
+    """Parse LLM JSON output with orjson (if installed), retrying once with trailing
+    commas removed.
+
+    Raises json.JSONDecodeError (orjson.JSONDecodeError subclasses it) if the text
+    is still not valid JSON.
+    """
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        return _json_loads(_TRAILING_COMMA_RE.sub(r'\1', text))
@@ -1,9 +1,7 @@
 import requests
-import backoff
-import time
 import bs4
 import asyncio
-from httpx import AsyncHTTPTransport
+from httpx import AsyncHTTPTransport, Limits
 from httpx._client import AsyncClient
 
 
@@ -33,37 +31,70 @@ def is_tag_visible(element: bs4.element) -> bool:
     return True
 
 
-transport = AsyncHTTPTransport(retries=3)
+try:
+    import h2  # noqa: F401
 
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
-async def httpx_get(url: str, headers: dict):
+
+async def httpx_get(client: AsyncClient, url: str, headers: dict):
     try:
-        async with AsyncClient(transport=transport) as client:
-            response = await client.get(url, headers=headers, timeout=3)
-            response = response if response.status_code == 200 else None
-            if not response:
-                return False, None
-            else:
-                return True, response
+        response = await client.get(url, headers=headers, timeout=3)
+        response = response if response.status_code == 200 else None
+        if not response:
+            return False, None
+        else:
+            return True, response
     except Exception as e:  # noqa: F841
         return False, None
 
 
-async def httpx_bind_key(url: str, headers: dict, key: str = ""):
-    flag, response = await httpx_get(url, headers)
+async def httpx_bind_key(client: AsyncClient, url: str, headers: dict, key: str = ""):
+    flag, response = await httpx_get(client, url, headers)
     return flag, response, url, key
 
 
+# Upper bound on page fetches in flight during one crawl
+CRAWL_CONCURRENCY = 32
+
+
+async def acrawl_web(query_url_dict: dict, max_concurrency: int = CRAWL_CONCURRENCY):
+    """Fetch every result page for the given queries concurrently.
+
+    Each distinct URL is fetched once even if several queries returned it.
+
+    Args:
+        query_url_dict: Mapping of query to the list of URLs to fetch for it.
+        max_concurrency: Maximum number of requests in flight at once.
+    Returns:
+        A list of (flag, response, url, query) tuples, one per (query, url) pair.
+    """
+    pairs = [(query, url) for query, urls in query_url_dict.items() for url in urls]
+    unique_urls = list(dict.fromkeys(url for _, url in pairs))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(client: AsyncClient, url: str):
+        async with semaphore:
+            return await httpx_get(client, url, headers)
+
+    # One client per crawl: requests to the same host share a connection pool
+    # (multiplexed over HTTP/2 when the h2 package is installed)
+    transport = AsyncHTTPTransport(
+        retries=3,
+        http2=HTTP2_AVAILABLE,
+        limits=Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency // 2),
+    )
+    async with AsyncClient(transport=transport) as client:
+        fetched = await asyncio.gather(*(fetch(client, url) for url in unique_urls))
+
+    by_url = dict(zip(unique_urls, fetched))
+    return [(*by_url[url], url, query) for query, url in pairs]
+
+
 def crawl_web(query_url_dict: dict):
-    tasks = list()
-    for query, urls in query_url_dict.items():
-        for url in urls:
-            task = httpx_bind_key(url=url, headers=headers, key=query)
-            tasks.append(task)
-    asyncio.set_event_loop(asyncio.SelectorEventLoop())
-    loop = asyncio.get_event_loop()
-    responses = loop.run_until_complete(asyncio.gather(*tasks))
-    return responses
+    return asyncio.run(acrawl_web(query_url_dict))
 
 
 # @backoff.on_exception(backoff.expo, (requests.exceptions.RequestException, requests.exceptions.Timeout), max_tries=1,max_time=3)
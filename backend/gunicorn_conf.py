@@ -0,0 +1,16 @@
+# gunicorn_conf.py
+# Multi-process deployment: gunicorn -c gunicorn_conf.py main:app
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+
+# Each worker is a separate interpreter with its own copy of the detection models
+# and result caches, so the default is sized for memory rather than 2 x cores + 1.
+# Raise WEB_CONCURRENCY on hosts with RAM/VRAM to spare.
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Video analyses and fact-checks with many claims can run for minutes
+timeout = int(os.getenv("WORKER_TIMEOUT", "600"))
+graceful_timeout = 30
+keepalive = 5
@@ -1,29 +1,68 @@
 # main.py
+import atexit
 import os
-import shutil
 import tempfile
 import traceback
 import asyncio
+import contextlib
+import functools
 import logging
-from typing import Optional, Dict, Any
+import logging.handlers
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
 from pathlib import Path
 import importlib
+import json
+import queue
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
+from starlette.concurrency import iterate_in_threadpool
 
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # Logging setup
 DEBUG_MODE = os.getenv("DEBUG", "0") in ("1", "true", "True")
-logging.basicConfig(level=logging.DEBUG if DEBUG_MODE else logging.INFO,
-                    format="%(asctime)s %(levelname)s %(message)s")
+# Handlers write to stderr from a listener thread; request handlers only enqueue records
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+_log_queue_handler = logging.handlers.QueueHandler(_log_queue)
+# The queue handler only merges args/tracebacks into the message; the listener's handler adds the rest
+_log_queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.DEBUG if DEBUG_MODE else logging.INFO, handlers=[_log_queue_handler])
 logger = logging.getLogger("multimodal-backend")
 
-app = FastAPI(title="Multimodal Analysis Backend (Hackathon)", version="1.0")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed: the nested
+    fact-check/video results are encoded several times faster and written
+    straight to UTF-8 bytes. numpy scalars and arrays are serialized natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+# Endpoints returning plain dicts (e.g. /api/health) are rendered with orjson too
+app = FastAPI(title="Multimodal Analysis Backend (Hackathon)", version="1.0",
+              default_response_class=FastJSONResponse)
 
 # CORS setup
 app.add_middleware(
@@ -38,8 +77,43 @@ FRONTEND_PATH = Path("frontend/build")
 if FRONTEND_PATH.exists():
     app.mount("/", StaticFiles(directory=str(FRONTEND_PATH), html=True), name="frontend")
 
+
+# Load the local detection models at startup instead of on the first request
+WARM_UP_MODELS = os.getenv("WARM_UP_MODELS", "1") in ("1", "true", "True")
+
+# Admission control: requests beyond these limits get 429 instead of queueing,
+# so a burst cannot exhaust the Gemini quota or load more video work than fits in memory
+MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "16"))
+MAX_CONCURRENT_VIDEOS = int(os.getenv("MAX_CONCURRENT_VIDEOS", "2"))
+analysis_slots = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+video_slots = asyncio.Semaphore(MAX_CONCURRENT_VIDEOS)
+in_flight = {"analyses": 0, "videos": 0}
+
+
+@contextlib.asynccontextmanager
+async def admit(slots: asyncio.Semaphore, counter: str, retry_after: int = 1):
+    """Hold one of the given slots for the request, or reject it with 429 if none is free."""
+    if slots.locked():
+        raise HTTPException(
+            status_code=429,
+            detail="Server is busy, retry shortly.",
+            headers={"Retry-After": str(retry_after)},
+        )
+    async with slots:
+        in_flight[counter] += 1
+        try:
+            yield
+        finally:
+            in_flight[counter] -= 1
+
+
 # ThreadPool for blocking CPU-bound ops
 executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4)
+# Separate pool for work that mostly waits on Gemini/Serper or disk (fact-checks,
+# summaries, upload copies): at least the admission limit, so every admitted
+# request can make progress instead of queueing behind cpu_count model workers
+IO_WORKERS = int(os.getenv("IO_WORKERS", str(max((os.cpu_count() or 4) * 5, MAX_CONCURRENT_ANALYSES))))
+io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io")
 
 
 # -----------------------
@@ -81,15 +155,95 @@ logger.info(f"Available modules: {AVAILABLE_MODULES}")
 # Utility Helpers
 # -----------------------
 
-def save_uploadfile_to_temp(upload_file: UploadFile) -> str:
-    """Save UploadFile to a temporary file and return path."""
+# Copy uploads in 4 MB reads/writes instead of copyfileobj's 64 KB default
+UPLOAD_COPY_CHUNK = 4 * 1024 * 1024
+# Uploads larger than these are rejected with 413 before (or while) being copied
+MAX_IMAGE_BYTES = int(os.getenv("MAX_IMAGE_MB", "20")) * 1024 * 1024
+MAX_VIDEO_BYTES = int(os.getenv("MAX_VIDEO_MB", "200")) * 1024 * 1024
+# Uploads still in UploadFile's in-memory spool (under 1 MB, e.g. most images) are
+# written to tmpfs where available, so the path-based model code never touches disk
+SMALL_UPLOAD_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+# Copy buffers are recycled across uploads instead of allocating a fresh chunk per read
+_COPY_BUFFER_POOL: "queue.Queue[bytearray]" = queue.Queue(maxsize=8)
+
+
+def upload_too_large(upload_file: UploadFile, max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"{upload_file.filename or 'Upload'} exceeds the {max_bytes // (1024 * 1024)} MB limit.",
+    )
+
+
+def _disk_backed_fileno(fileobj) -> Optional[int]:
+    """Return the OS file descriptor behind an upload if it has spilled to disk.
+
+    Small uploads stay in the SpooledTemporaryFile's memory buffer; calling
+    fileno() on those would force a rollover, so they return None and take the
+    plain read/write path.
+    """
+    if not hasattr(os, "sendfile") or getattr(fileobj, "_rolled", True) is False:
+        return None
+    try:
+        return fileobj.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _sendfile_upload(upload_file: UploadFile, src_fd: int, dst_fd: int, max_bytes: Optional[int]) -> None:
+    """Copy a disk-backed upload kernel-to-kernel with os.sendfile."""
+    offset = upload_file.file.tell()
+    remaining = os.fstat(src_fd).st_size - offset
+    if max_bytes is not None and remaining > max_bytes:
+        raise upload_too_large(upload_file, max_bytes)
+    while remaining > 0:
+        sent = os.sendfile(dst_fd, src_fd, offset, min(remaining, UPLOAD_COPY_CHUNK))
+        if sent == 0:
+            break
+        offset += sent
+        remaining -= sent
+
+
+def _copy_upload_buffered(upload_file: UploadFile, dst, max_bytes: Optional[int]) -> None:
+    """Copy an upload through a pooled buffer with readinto(), no per-chunk allocations."""
+    try:
+        buf = _COPY_BUFFER_POOL.get_nowait()
+    except queue.Empty:
+        buf = bytearray(UPLOAD_COPY_CHUNK)
+    try:
+        with memoryview(buf) as view:
+            written = 0
+            while n := upload_file.file.readinto(buf):
+                written += n
+                if max_bytes is not None and written > max_bytes:
+                    raise upload_too_large(upload_file, max_bytes)
+                dst.write(view[:n])
+    finally:
+        try:
+            _COPY_BUFFER_POOL.put_nowait(buf)
+        except queue.Full:
+            pass
+
+
+def save_uploadfile_to_temp(upload_file: UploadFile, max_bytes: Optional[int] = None) -> str:
+    """Save UploadFile to a temporary file and return path.
+
+    Raises HTTPException(413) as soon as more than max_bytes have been read.
+    """
     suffix = Path(upload_file.filename).suffix if upload_file.filename else ""
-    fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+    in_memory = getattr(upload_file.file, "_rolled", True) is False
+    fd, tmp_path = tempfile.mkstemp(suffix=suffix, dir=SMALL_UPLOAD_TMPDIR if in_memory else None)
     os.close(fd)
     try:
         with open(tmp_path, "wb") as f:
-            shutil.copyfileobj(upload_file.file, f)
+            src_fd = _disk_backed_fileno(upload_file.file)
+            if src_fd is not None:
+                _sendfile_upload(upload_file, src_fd, f.fileno(), max_bytes)
+            else:
+                _copy_upload_buffered(upload_file, f, max_bytes)
         logger.debug(f"Saved upload to {tmp_path}")
+    except HTTPException:
+        os.remove(tmp_path)
+        raise
     except Exception:
         logger.exception("Error while saving uploaded file")
         # If failed, remove file if created
@@ -107,8 +261,14 @@ def save_uploadfile_to_temp(upload_file: UploadFile) -> str:
 
 
 async def run_in_thread(func, *args, **kwargs):
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(executor, lambda: func(*args, **kwargs))
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+
+async def run_io(func, *args, **kwargs):
+    """Like run_in_thread, on the I/O-bound pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, functools.partial(func, *args, **kwargs))
 
 
 def module_missing_details():
@@ -141,7 +301,8 @@ def run_factcheck_sync(input_text: Optional[str] = None, image_path: Optional[st
                        video_path: Optional[str] = None, text_file: Optional[str] = None) -> Dict[str, Any]:
     if fact_module is None:
         raise RuntimeError("fact_verify.py not available")
-    app_fc = fact_module.FactCheckApp()
+    # Shared instance: building clients per request is slow and loses the result cache
+    app_fc = fact_module.shared_app()
     results = app_fc.process_input(
         input_text=input_text,
         text_file=text_file,
@@ -152,6 +313,23 @@ def run_factcheck_sync(input_text: Optional[str] = None, image_path: Optional[st
     return results
 
 
+def load_rgb_image(image_path: str):
+    """Decode an image once, so both image classifiers can share it."""
+    from PIL import Image
+    with Image.open(image_path) as image:
+        return image.convert("RGB")
+
+
+async def image_input_for_classifiers(image_path: str):
+    """The decoded image when both classifiers will run, else the path."""
+    if AVAILABLE_MODULES["AI_Image"] and AVAILABLE_MODULES["Manipulated"]:
+        try:
+            return await run_in_thread(load_rgb_image, image_path)
+        except Exception:
+            logger.exception("Could not decode image, classifiers will read the file")
+    return image_path
+
+
 def classify_image_sync(image_path: str) -> Dict[str, Any]:
     if ai_image_module is None:
         raise RuntimeError("AI_Image.py not available")
@@ -164,14 +342,109 @@ def detect_manipulated_sync(image_path: str) -> Dict[str, Any]:
     return manipulated_module.detect_deepfake(image_path)
 
 
+_video_detector = None
+_video_detector_lock = threading.Lock()
+
+
+def get_video_detector():
+    """Load the video/audio deepfake models once and share them across requests."""
+    global _video_detector
+    if _video_detector is None:
+        with _video_detector_lock:
+            if _video_detector is None:
+                _video_detector = deep_video_module.CompleteDeepfakeDetector()
+    return _video_detector
+
+
 def analyze_video_sync(video_path: str) -> Dict[str, Any]:
     if deep_video_module is None:
         raise RuntimeError("Deep_video.py not available")
-    detector = deep_video_module.CompleteDeepfakeDetector()
+    detector = get_video_detector()
     results = detector.analyze_video(video_path, cleanup=True)
     return results
 
 
+# -----------------------
+# Analysis pipelines
+# -----------------------
+
+class AnalysisStep(NamedTuple):
+    key: str                    # results[key] receives the output (or {"error": ...})
+    func: Callable[..., Any]
+    runner: Callable[..., Any]  # run_in_thread (model inference) or run_io (network)
+    args: Tuple[Optional[str], ...]  # names looked up in the request context; None passes None
+    module: str                 # AVAILABLE_MODULES flag the step depends on
+    missing_error: Optional[str] = None  # reported under key when the module is unavailable
+
+
+class AnalysisPipeline(NamedTuple):
+    steps: Tuple[AnalysisStep, ...]
+    # 500 response error when none of the steps can run (None: return what we have)
+    empty_error: Optional[str]
+    empty_hint: Optional[str] = None
+
+
+_BIAS_STEP = AnalysisStep("bias", analyze_bias_text_sync, run_in_thread, ("text",), "biasness")
+_FACTCHECK_STEP = AnalysisStep("factcheck", run_factcheck_sync, run_io, ("text", "image_path"), "fact_verify")
+_AI_IMAGE_STEP = AnalysisStep("ai_image", classify_image_sync, run_in_thread, ("image_input",), "AI_Image")
+_MANIPULATED_STEP = AnalysisStep("manipulated", detect_manipulated_sync, run_in_thread, ("image_input",), "Manipulated")
+
+_VIDEO_PIPELINE = AnalysisPipeline(
+    # Deepfake analysis (local models) and the factcheck (Gemini transcription + pipeline)
+    # are independent, so they run concurrently
+    steps=(
+        AnalysisStep("video", analyze_video_sync, run_in_thread, ("video_path",), "Deep_video",
+                     missing_error="Deep_video module not available."),
+        AnalysisStep("factcheck", run_factcheck_sync, run_io, (None, None, "video_path"), "fact_verify"),
+    ),
+    empty_error=None,
+)
+
+# Keyed by (has_text, has_image, has_video); any request with a video runs the video pipeline
+PIPELINES: Dict[Tuple[bool, bool, bool], AnalysisPipeline] = {
+    (True, True, False): AnalysisPipeline(
+        steps=(_BIAS_STEP, _FACTCHECK_STEP, _AI_IMAGE_STEP, _MANIPULATED_STEP),
+        empty_error="No analysis modules are available on the server.",
+        empty_hint="Set up the missing python modules or run with DEBUG=1 to inspect import failures.",
+    ),
+    (True, False, False): AnalysisPipeline(
+        steps=(_BIAS_STEP, _FACTCHECK_STEP),
+        empty_error="No text analysis modules available.",
+    ),
+    (False, True, False): AnalysisPipeline(
+        steps=(_FACTCHECK_STEP, _AI_IMAGE_STEP, _MANIPULATED_STEP),
+        empty_error="No image analysis modules available.",
+    ),
+    **{(has_text, has_image, True): _VIDEO_PIPELINE
+       for has_text in (True, False) for has_image in (True, False)},
+}
+
+
+def warm_up_models() -> None:
+    """Load models and clients ahead of the first request that needs them."""
+    loaders = []
+    if bias_module is not None:
+        loaders.append(("bias classifier", bias_module._get_bias_pipeline))
+    if deep_video_module is not None:
+        loaders.append(("video detector", get_video_detector))
+    if ai_image_module is not None:
+        loaders.append(("AI image classifier", ai_image_module._get_model))
+    if manipulated_module is not None:
+        loaders.append(("manipulation classifier", manipulated_module._get_model))
+    if fact_module is not None:
+        loaders.append(("fact-check app", fact_module.shared_app))
+    if genai_available:
+        loaders.append(("summary model", get_summary_model))
+    for name, load in loaders:
+        started = time.perf_counter()
+        try:
+            load()
+        except Exception:
+            logger.exception(f"Warm-up of {name} failed")
+        else:
+            logger.info(f"Warmed up {name} in {time.perf_counter() - started:.1f}s")
+
+
 # -----------------------
 # Gemini configuration (optional)
 # -----------------------
@@ -188,12 +461,26 @@ else:
     genai_available = False
 
 
+_summary_model = None
+_summary_model_lock = threading.Lock()
+
+
+def get_summary_model():
+    """Create the Gemini summary model once and reuse it across requests."""
+    global _summary_model
+    if _summary_model is None:
+        with _summary_model_lock:
+            if _summary_model is None:
+                _summary_model = genai.GenerativeModel("gemini-2.5-flash")
+    return _summary_model
+
+
 def generate_summary(analysis_results: Dict[str, Any]) -> str:
     if not genai_available:
         return "Gemini API key not configured or gemini client not available. Summary not available."
 
     try:
-        model = genai.GenerativeModel("gemini-2.5-flash")
+        model = get_summary_model()
         prompt = (
             "You are an AI summarizer for a misinformation detection system. "
             "Given the following analysis results (including bias, deepfake, AI-generated content, etc.), "
@@ -218,6 +505,7 @@ async def analyze(
     text: Optional[str] = Form(None),
     image: Optional[UploadFile] = File(None),
     video: Optional[UploadFile] = File(None),
+    stream: bool = Form(False),
 ):
     """
     Main analysis endpoint.
@@ -225,157 +513,162 @@ async def analyze(
       - text: optional
       - image: optional
       - video: optional
+      - stream: optional; when true the response is newline-delimited JSON with one
+        {"stage": key, "result": ...} line per analysis as it finishes, then the
+        summary and a final {"stage": "done"} line
     At least one input must be provided.
+    Returns 429 with Retry-After when the server is at its concurrency limit,
+    and 413 for uploads over MAX_IMAGE_MB / MAX_VIDEO_MB.
+    """
+    if not text and image is None and video is None:
+        raise HTTPException(status_code=400, detail="At least one of text, image, or video must be provided.")
+    # Reject by declared size before any copying (the copy also enforces the limits)
+    for upload, max_bytes in ((image, MAX_IMAGE_BYTES), (video, MAX_VIDEO_BYTES)):
+        if upload is not None and upload.size is not None and upload.size > max_bytes:
+            raise upload_too_large(upload, max_bytes)
+
+    async with contextlib.AsyncExitStack() as stack:
+        await stack.enter_async_context(admit(analysis_slots, "analyses"))
+        if video is not None:
+            await stack.enter_async_context(admit(video_slots, "videos", retry_after=5))
+        return await run_analysis(text, image, video, stack, stream)
+
+
+def _remove_temp_files(paths) -> None:
+    for p in paths:
+        try:
+            os.remove(p)
+        except Exception:
+            pass
+
+
+async def _run_step(step: AnalysisStep, context: Dict[str, Any]) -> Tuple[str, Any]:
+    """Run one analysis step, returning (result key, output or {"error": ...})."""
+    try:
+        return step.key, await step.runner(step.func, *(context[name] if name else None for name in step.args))
+    except Exception as e:
+        return step.key, {"error": str(e)}
+
+
+async def _summarize(results: Dict[str, Any]) -> str:
+    # Try generate summary if genai available
+    try:
+        if genai_available:
+            return await run_io(generate_summary, results)
+        return "No summary (gemini not configured)."
+    except Exception:
+        logger.exception("Summary generation failed")
+        return "Summary generation failed."
+
+
+async def _stream_analysis(tasks, results: Dict[str, Any], missing_modules, stack: contextlib.AsyncExitStack):
+    """Yield NDJSON lines as analysis steps complete."""
+    try:
+        for key, val in results.items():
+            if key != "text":
+                yield _ndjson_line({"stage": key, "result": val})
+        for next_done in asyncio.as_completed(tasks):
+            key, val = await next_done
+            results[key] = val
+            yield _ndjson_line({"stage": key, "result": val})
+        results["summary"] = await _summarize(results)
+        yield _ndjson_line({"stage": "summary", "result": results["summary"]})
+        yield _ndjson_line({"stage": "done", "missing_modules": missing_modules})
+    except Exception as e:
+        logger.exception("Unhandled exception during streamed /api/analyze")
+        yield _ndjson_line({"stage": "error", "error": str(e) if DEBUG_MODE else "Internal server error"})
+    finally:
+        await _finish_stream(tasks, stack)
+
+
+async def _finish_stream(tasks, stack: contextlib.AsyncExitStack) -> None:
+    # Called from the body's finally and again as the response's background task:
+    # Starlette skips the background task when a client disconnects mid-body
+    # (ASGI 2.4+), and the finally never runs for a body that is never started.
+    # Closing the stack twice is harmless.
+    for task in tasks:
+        task.cancel()
+    await stack.aclose()
+
+
+async def run_analysis(
+    text: Optional[str],
+    image: Optional[UploadFile],
+    video: Optional[UploadFile],
+    stack: contextlib.AsyncExitStack,
+    stream: bool = False,
+):
+    """Body of /api/analyze, run once the request has been admitted.
+
+    Temp files are released through stack; a streamed response takes over the
+    whole stack (admission slots included) and closes it once the body is sent.
     """
 
     # Provide debug info about missing modules (but do not instantly abort if some are missing)
     missing_details = module_missing_details()
     logger.debug(f"Missing module details: {list(missing_details.keys())}")
 
-    if not text and image is None and video is None:
-        raise HTTPException(status_code=400, detail="At least one of text, image, or video must be provided.")
-
     tmp_files = []
+    # Unlinking a large video can block on slow storage; leave it to the I/O pool
+    # rather than holding up the response
+    stack.callback(io_executor.submit, _remove_temp_files, tmp_files)
     image_path = None
     video_path = None
 
     try:
+        # Uploads can be large (videos); copy them off the event loop
         if image:
-            image_path = save_uploadfile_to_temp(image)
+            image_path = await run_io(save_uploadfile_to_temp, image, MAX_IMAGE_BYTES)
             tmp_files.append(image_path)
         if video:
-            video_path = save_uploadfile_to_temp(video)
+            video_path = await run_io(save_uploadfile_to_temp, video, MAX_VIDEO_BYTES)
             tmp_files.append(video_path)
 
         results: Dict[str, Any] = {}
         results["text"] = text
 
-        # Build tasks conditionally depending on which modules are available
-        tasks = []
-        # Keep track of which keys we expect back
-        expected = {}
-
-        # Case: text + image
-        if text and image_path:
-            if AVAILABLE_MODULES["biasness"]:
-                tasks.append(run_in_thread(analyze_bias_text_sync, text))
-                expected["bias"] = True
-            if AVAILABLE_MODULES["fact_verify"]:
-                tasks.append(run_in_thread(run_factcheck_sync, text, image_path))
-                expected["factcheck"] = True
-            if AVAILABLE_MODULES["AI_Image"]:
-                tasks.append(run_in_thread(classify_image_sync, image_path))
-                expected["ai_image"] = True
-            if AVAILABLE_MODULES["Manipulated"]:
-                tasks.append(run_in_thread(detect_manipulated_sync, image_path))
-                expected["manipulated"] = True
-
-            if not tasks:
-                # nothing available to run
-                return JSONResponse(status_code=500, content={
-                    "error": "No analysis modules are available on the server.",
-                    "missing_modules": list(missing_details.keys()),
-                    "hint": "Set up the missing python modules or run with DEBUG=1 to inspect import failures."
-                })
-
-            gathered = await asyncio.gather(*tasks, return_exceptions=True)
-            # assign in the same order as expected keys
-            idx = 0
-            if expected.get("bias"):
-                val = gathered[idx]; idx += 1
-                results["bias"] = val if not isinstance(val, Exception) else {"error": str(val)}
-            if expected.get("factcheck"):
-                val = gathered[idx]; idx += 1
-                results["factcheck"] = val if not isinstance(val, Exception) else {"error": str(val)}
-            if expected.get("ai_image"):
-                val = gathered[idx]; idx += 1
-                results["ai_image"] = val if not isinstance(val, Exception) else {"error": str(val)}
-            if expected.get("manipulated"):
-                val = gathered[idx]; idx += 1
-                results["manipulated"] = val if not isinstance(val, Exception) else {"error": str(val)}
-
-        # Case: text only
-        elif text and not image_path and not video_path:
-            if AVAILABLE_MODULES["biasness"]:
-                tasks.append(run_in_thread(analyze_bias_text_sync, text))
-                expected["bias"] = True
-            if AVAILABLE_MODULES["fact_verify"]:
-                tasks.append(run_in_thread(run_factcheck_sync, text, None))
-                expected["factcheck"] = True
-
-            if not tasks:
-                return JSONResponse(status_code=500, content={
-                    "error": "No text analysis modules available.",
-                    "missing_modules": list(missing_details.keys())
-                })
-
-            gathered = await asyncio.gather(*tasks, return_exceptions=True)
-            idx = 0
-            if expected.get("bias"):
-                val = gathered[idx]; idx += 1
-                results["bias"] = val if not isinstance(val, Exception) else {"error": str(val)}
-            if expected.get("factcheck"):
-                val = gathered[idx]; idx += 1
-                results["factcheck"] = val if not isinstance(val, Exception) else {"error": str(val)}
-
-        # Case: image only
-        elif image_path and not text and not video_path:
-            if AVAILABLE_MODULES["fact_verify"]:
-                tasks.append(run_in_thread(run_factcheck_sync, None, image_path))
-                expected["factcheck"] = True
-            if AVAILABLE_MODULES["AI_Image"]:
-                tasks.append(run_in_thread(classify_image_sync, image_path))
-                expected["ai_image"] = True
-            if AVAILABLE_MODULES["Manipulated"]:
-                tasks.append(run_in_thread(detect_manipulated_sync, image_path))
-                expected["manipulated"] = True
-
-            if not tasks:
-                return JSONResponse(status_code=500, content={
-                    "error": "No image analysis modules available.",
-                    "missing_modules": list(missing_details.keys())
-                })
-
-            gathered = await asyncio.gather(*tasks, return_exceptions=True)
-            idx = 0
-            if expected.get("factcheck"):
-                val = gathered[idx]; idx += 1
-                results["factcheck"] = val if not isinstance(val, Exception) else {"error": str(val)}
-            if expected.get("ai_image"):
-                val = gathered[idx]; idx += 1
-                results["ai_image"] = val if not isinstance(val, Exception) else {"error": str(val)}
-            if expected.get("manipulated"):
-                val = gathered[idx]; idx += 1
-                results["manipulated"] = val if not isinstance(val, Exception) else {"error": str(val)}
-
-        # Case: video present
-        elif video_path:
-            if AVAILABLE_MODULES["Deep_video"]:
-                video_res = await run_in_thread(analyze_video_sync, video_path)
-                results["video"] = video_res
-            else:
-                results["video"] = {"error": "Deep_video module not available."}
-
-            # try factcheck against video if available
-            if AVAILABLE_MODULES["fact_verify"]:
-                try:
-                    fact_res = await run_in_thread(run_factcheck_sync, None, None, video_path)
-                    results["factcheck"] = fact_res
-                except Exception as e:
-                    results["factcheck"] = {"error": str(e)}
-        else:
+        pipeline = PIPELINES.get((bool(text), image_path is not None, video_path is not None))
+        if pipeline is None:
             raise HTTPException(status_code=400, detail="Unsupported combination of inputs.")
 
-        # Try generate summary if genai available
-        try:
-            results["summary"] = generate_summary(results) if genai_available else "No summary (gemini not configured)."
-        except Exception:
-            logger.exception("Summary generation failed")
-            results["summary"] = "Summary generation failed."
-        print(results)
+        steps = []
+        for step in pipeline.steps:
+            if AVAILABLE_MODULES[step.module]:
+                steps.append(step)
+            elif step.missing_error:
+                results[step.key] = {"error": step.missing_error}
+
+        if not steps and pipeline.empty_error:
+            content = {"error": pipeline.empty_error, "missing_modules": list(missing_details.keys())}
+            if pipeline.empty_hint:
+                content["hint"] = pipeline.empty_hint
+            return JSONResponse(status_code=500, content=content)
+
+        context = {"text": text, "image_path": image_path, "video_path": video_path}
+        if any("image_input" in step.args for step in steps):
+            context["image_input"] = await image_input_for_classifiers(image_path)
+
+        if stream:
+            tasks = [asyncio.ensure_future(_run_step(step, context)) for step in steps]
+            # The response now owns the admission slots and temp files
+            response_stack = stack.pop_all()
+            return StreamingResponse(
+                _stream_analysis(tasks, results, list(missing_details.keys()), response_stack),
+                media_type="application/x-ndjson",
+                background=BackgroundTask(_finish_stream, tasks, response_stack),
+            )
+
+        results.update(await asyncio.gather(*(_run_step(step, context) for step in steps)))
+        results["summary"] = await _summarize(results)
+        # Formatted only when debug logging is on: the repr of the full results
+        # (every evidence text) is large
+        logger.debug("Analysis results: %s", results)
         logger.info("Analysis completed, returning results.")
-        return JSONResponse(status_code=200, content={"status": "ok", "results": results, "missing_modules": list(missing_details.keys())})
+        return FastJSONResponse(status_code=200, content={"status": "ok", "results": results, "missing_modules": list(missing_details.keys())})
 
+    except HTTPException:
+        # Client errors (413, 400) keep their status instead of becoming a 500
+        raise
     except Exception as e:
         logger.exception("Unhandled exception during /api/analyze")
         tb = traceback.format_exc()
@@ -384,23 +677,61 @@ async def analyze(
             return JSONResponse(status_code=500, content={"error": str(e), "traceback": tb, "missing_modules": list(missing_details.keys())})
         else:
             return JSONResponse(status_code=500, content={"error": "Internal server error", "missing_modules": list(missing_details.keys())})
-    finally:
-        for p in tmp_files:
+
+
+@app.post("/api/factcheck/stream")
+async def factcheck_stream(text: str = Form(...), force_refresh: bool = Form(False)):
+    """
+    Fact-check text, streaming newline-delimited JSON events: extracted claims,
+    evidence counts and verification progress as they happen, then the result.
+    """
+    if fact_module is None:
+        raise HTTPException(status_code=503, detail="fact_verify module not available.")
+    # Admit before the response starts (so a 429 can still be sent), and hold
+    # the slot until the stream ends or the client goes away
+    async with contextlib.AsyncExitStack() as stack:
+        await stack.enter_async_context(admit(analysis_slots, "analyses"))
+        response_stack = stack.pop_all()
+
+        async def body():
             try:
-                os.remove(p)
-            except Exception:
-                pass
+                app_fc = await run_io(fact_module.shared_app)
+                events = app_fc.process_input_stream(input_text=text, force_refresh=force_refresh)
+                async for event in iterate_in_threadpool(events):
+                    yield _ndjson_line(event)
+            finally:
+                await response_stack.aclose()
+
+        # Closed by the body's finally and by the background task, as in _finish_stream
+        return StreamingResponse(
+            body(),
+            media_type="application/x-ndjson",
+            background=BackgroundTask(response_stack.aclose),
+        )
+
+
+def _ndjson_line(event: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(event, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) + b"\n"
+    return (json.dumps(event, default=str) + "\n").encode("utf-8")
 
 
 @app.get("/api/health")
 async def health():
     missing = list(module_missing_details().keys())
-    return {"status": "ok", "missing_modules": missing, "has_frontend": FRONTEND_PATH.exists()}
+    return {
+        "status": "ok",
+        "missing_modules": missing,
+        "has_frontend": FRONTEND_PATH.exists(),
+        "in_flight": dict(in_flight),
+        "limits": {"analyses": MAX_CONCURRENT_ANALYSES, "videos": MAX_CONCURRENT_VIDEOS},
+    }
 
 
 @app.get("/api/download/")
 async def download_test(filepath: str):
-    if not os.path.exists(filepath):
+    # stat off the event loop; a slow or network filesystem would otherwise stall it
+    if not await run_io(os.path.isfile, filepath):
         raise HTTPException(status_code=404, detail="File not found")
     return FileResponse(filepath)
 
@@ -410,3 +741,13 @@ async def startup_event():
     logger.info("=== Multimodal FastAPI backend starting ===")
     logger.info("Ensure required modules and keys are configured properly.")
     logger.debug(f"Module availability: {AVAILABLE_MODULES}")
+    if WARM_UP_MODELS:
+        # In the background, so the server accepts requests while the weights load
+        asyncio.get_running_loop().run_in_executor(executor, warm_up_models)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # "auto" picks uvloop and httptools when installed (uvicorn[standard]), else asyncio/h11
+    uvicorn.run(app, host=os.getenv("HOST", "0.0.0.0"), port=int(os.getenv("PORT", "8000")), loop="auto", http="auto")
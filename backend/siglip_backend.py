@@ -0,0 +1,128 @@
+import os
+from types import SimpleNamespace
+
+import torch
+from transformers import SiglipForImageClassification
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+
+# Route FP32 matmuls through TF32 tensor cores and let cuDNN pick the fastest kernels
+torch.set_float32_matmul_precision("high")
+torch.backends.cudnn.benchmark = True
+
+# "torch" (default) keeps eager PyTorch; "onnx" exports once and runs through ONNX Runtime,
+# which picks the TensorRT (FP16) or CUDA execution provider when available.
+SIGLIP_BACKEND = os.getenv("SIGLIP_BACKEND", "torch").lower()
+ONNX_MODEL_DIR = os.getenv("SIGLIP_ONNX_DIR", "onnx_models")
+# With the ONNX backend, SIGLIP_QUANTIZE=1 runs an int8 dynamically quantized copy on the CPU provider
+SIGLIP_QUANTIZE = os.getenv("SIGLIP_QUANTIZE", "0") in ("1", "true", "True")
+ONNX_INTRA_OP_THREADS = int(os.getenv("SIGLIP_ONNX_THREADS", str(os.cpu_count() or 1)))
+
+PREFERRED_PROVIDERS = [
+    ("TensorrtExecutionProvider", {"trt_fp16_enable": True, "trt_engine_cache_enable": True,
+                                   "trt_engine_cache_path": ONNX_MODEL_DIR}),
+    "CUDAExecutionProvider",
+    "CPUExecutionProvider",
+]
+
+
+class OnnxSiglip:
+    """
+    ONNX Runtime session exposing the subset of the SiglipForImageClassification
+    interface used in this backend: `model(pixel_values=...)` returning `.logits`,
+    plus `config`, `to()` and `eval()`.
+    """
+
+    def __init__(self, onnx_path, config, providers=None):
+        self.config = config
+        if providers is None:
+            available = set(ort.get_available_providers())
+            providers = [
+                p for p in PREFERRED_PROVIDERS
+                if (p[0] if isinstance(p, tuple) else p) in available
+            ]
+        sess_options = ort.SessionOptions()
+        sess_options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+        self.session = ort.InferenceSession(onnx_path, sess_options=sess_options, providers=providers)
+
+    def __call__(self, pixel_values, **kwargs):
+        logits = self.session.run(
+            ["logits"], {"pixel_values": pixel_values.detach().cpu().numpy()}
+        )[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def to(self, *args, **kwargs):
+        # Device placement is handled by the execution provider
+        return self
+
+    def eval(self):
+        return self
+
+
+def export_onnx(model, onnx_path):
+    """
+    Export a SigLIP classifier to ONNX with a dynamic batch dimension.
+
+    Args:
+        model: SiglipForImageClassification instance
+        onnx_path (str): Destination file
+    """
+    image_size = model.config.vision_config.image_size
+    dummy = torch.zeros(1, 3, image_size, image_size)
+
+    os.makedirs(os.path.dirname(onnx_path) or ".", exist_ok=True)
+    model.eval()
+    torch.onnx.export(
+        model,
+        (dummy,),
+        onnx_path,
+        input_names=["pixel_values"],
+        output_names=["logits"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+        opset_version=17,
+    )
+
+
+def quantize_onnx(onnx_path, quantized_path):
+    """
+    Write an int8 copy of an exported model using ONNX Runtime dynamic quantization.
+
+    Args:
+        onnx_path (str): FP32 ONNX model
+        quantized_path (str): Destination file
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QInt8)
+
+
+def load_siglip(model_name):
+    """
+    Load a SigLIP image classifier using the configured backend.
+
+    Args:
+        model_name (str): HuggingFace model id
+
+    Returns:
+        SiglipForImageClassification or OnnxSiglip
+    """
+    model = SiglipForImageClassification.from_pretrained(model_name)
+    if SIGLIP_BACKEND != "onnx" or ort is None:
+        return model
+
+    onnx_path = os.path.join(ONNX_MODEL_DIR, model_name.replace("/", "__") + ".onnx")
+    if not os.path.exists(onnx_path):
+        export_onnx(model, onnx_path)
+
+    if SIGLIP_QUANTIZE:
+        quantized_path = onnx_path[:-len(".onnx")] + ".int8.onnx"
+        if not os.path.exists(quantized_path):
+            quantize_onnx(onnx_path, quantized_path)
+        # Integer kernels (VNNI/AMX) are only used by the CPU execution provider
+        return OnnxSiglip(quantized_path, model.config, providers=["CPUExecutionProvider"])
+
+    return OnnxSiglip(onnx_path, model.config)